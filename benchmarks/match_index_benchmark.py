@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark FileManager.is_song_downloaded with and without the substring index.
+
+Usage:
+    python benchmarks/match_index_benchmark.py
+    python benchmarks/match_index_benchmark.py --tracks 10000 --files 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spotify_sync.core.track import Track
+from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.match_index import SongMatchIndex
+
+WORDS = [
+    'love', 'night', 'heart', 'fire', 'dream', 'summer', 'blue', 'light', 'gold', 'river',
+    'city', 'shadow', 'dance', 'rain', 'star', 'wild', 'home', 'ocean', 'echo', 'storm'
+]
+
+
+def make_title(rng: random.Random, number: int) -> str:
+    """Create a realistic-looking unique song title."""
+    return f"{' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))} {number}"
+
+
+def build_data(track_count: int, file_count: int, seed: int = 1):
+    """
+    Create a playlist and a download folder listing.
+    Half of the tracks are downloaded under a filename that only matches by title,
+    so every lookup of those tracks, and of all missing tracks, reaches the substring stage.
+
+    Returns:
+        Tuple of (tracks, filenames)
+    """
+    rng = random.Random(seed)
+    tracks = []
+    for number in range(track_count):
+        artists = [f"artist {rng.randint(0, 2000)}"]
+        tracks.append(Track(make_title(rng, number), artists, f"id{number}", f"https://open.spotify.com/track/id{number}"))
+
+    filenames = []
+    for track in tracks[:track_count // 2]:
+        filenames.append(f"various artists - {track.title_key} (remastered)")
+    for number in range(track_count, track_count + file_count - len(filenames)):
+        filenames.append(f"someone {number} - {make_title(rng, number).lower()}")
+    return tracks, filenames
+
+
+def run(tracks, downloaded_set) -> float:
+    """Time matching every track against a download set."""
+    start = time.perf_counter()
+    matched = sum(1 for track in tracks if FileManager.is_song_downloaded(track, downloaded_set))
+    elapsed = time.perf_counter() - start
+    print(f"  matched {matched}/{len(tracks)} in {elapsed:.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark downloaded-song matching")
+    parser.add_argument("--tracks", type=int, default=10000, help="Number of playlist tracks")
+    parser.add_argument("--files", type=int, default=10000, help="Number of downloaded files")
+    args = parser.parse_args()
+
+    tracks, filenames = build_data(args.tracks, args.files)
+    print(f"{args.tracks} tracks x {args.files} files")
+
+    print("Linear scan (plain set):")
+    linear = run(tracks, set(filenames))
+
+    print("Indexed (SongMatchIndex, including index build):")
+    indexed = run(tracks, SongMatchIndex(filenames))
+
+    print(f"Speedup: {linear / indexed:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
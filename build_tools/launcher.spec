@@ -34,6 +34,8 @@ hidden_imports = [
     'spotify_sync.commands.watch',
     'spotify_sync.commands.update_csv',
     'spotify_sync.commands.update_playlists_txt',
+    'spotify_sync.commands.dedupe',
+    'spotify_sync.commands.retag',
     'spotify_sync.utils',
     'spotify_sync.utils.utils',
     'spotify_sync.utils.error_handler',
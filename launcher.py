@@ -28,6 +28,7 @@ logging.getLogger().setLevel(logging.CRITICAL)
 
 import os
 import subprocess
+import multiprocessing
 import importlib
 import importlib.util
 import shlex
@@ -52,6 +53,8 @@ def show_help():
     print("  watch (w)    - Background watcher: Monitor for new songs continuously")
     print("  discover (d) - Auto-discover Spotify playlists and update playlists.txt")
     print("  refresh (r)  - Quick refresh: Update CSV files with current downloads")
+    print("  dedupe       - Store each song once and hardlink it into playlist folders")
+    print("  retag        - Re-apply Spotify metadata to downloaded songs (no downloads)")
     print("  setup        - Run the setup wizard again (re-configure)")
     print("  help         - Show this help message")
     print("  exit         - Exit the program")
@@ -63,6 +66,8 @@ def show_help():
     print("  --cleanup-removed        - Prompt to clean up songs removed from playlists")
     print("  --auto-delete-removed    - Auto-delete files for removed songs")
     print("  --keep-removed           - Keep files for removed songs")
+    print("  --async                  - Fetch all playlists concurrently (sync and watch)")
+    print("  --stream                 - Start downloading before a large playlist is fully fetched")
     print()
     print("📝 EXAMPLES:")
     print("  sync                                    - Sync all playlists")
@@ -275,7 +280,9 @@ def run_command(cmd):
         'd': 'spotify_sync.commands.update_playlists_txt',
         'update': 'spotify_sync.commands.update_playlists_txt',  # Backward compatibility
         'refresh': 'spotify_sync.commands.update_csv',
-        'r': 'spotify_sync.commands.update_csv'
+        'r': 'spotify_sync.commands.update_csv',
+        'dedupe': 'spotify_sync.commands.dedupe',
+        'retag': 'spotify_sync.commands.retag'
     }
     
     module_name = command_map.get(command)
@@ -358,4 +365,6 @@ def main():
         run_command(cmd)
 
 if __name__ == "__main__":
+    # Needed by the in-process downloader's worker processes in the frozen executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -8,6 +8,9 @@ Usage:
     python check.py --download-folder "/path/to/folder"
     python check.py --manual-verify --dont-filter-results
     python check.py --manual-link
+    python check.py --async
+    python check.py --stream
+    python check.py --no-plan
 """
 
 import warnings
@@ -15,12 +18,24 @@ warnings.simplefilter('ignore')
 warnings.filterwarnings('ignore')
 
 import os
+import math
 import argparse
 import sys
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from spotify_sync.core.spotify_api import SpotifyClient
+from spotify_sync.core.async_spotify_api import AsyncSpotifyClient
+from spotify_sync.core.rate_limiter import spotify_rate_limiter
+from spotify_sync.core.retry_policy import download_retry_policy
 from spotify_sync.core.file_manager import FileManager
 from spotify_sync.core.downloader import SpotdlDownloader
 from spotify_sync.core.csv_manager import CSVManager
+from spotify_sync.core.track import Track, TrackStatus, TrackStatusTable
+from spotify_sync.core.track_store import TrackStore
+from spotify_sync.core.download_plan import DownloadPlan
+from spotify_sync.core.download_pool import DownloadPool
+from spotify_sync.core.resolution_cache import ResolutionCache
+from spotify_sync.core.download_queue import DownloadQueue
+from spotify_sync.core.download_pipeline import DownloadPipeline, pipeline_metrics
 from spotify_sync.core.cleanup_manager import CleanupManager
 from spotify_sync.utils.utils import PlaylistReader, UserInput
 from spotify_sync.core.logger import Logger
@@ -28,6 +43,481 @@ from spotify_sync.utils.error_handler import ErrorHandler, ValidationError, Spot
 from spotify_sync.core.settings_manager import settings, Config
 
 
+def download_track(
+    track: Track,
+    playlist_download_folder: str,
+    stats: dict,
+    statuses: TrackStatusTable,
+    manual_verify: bool = False,
+    manual_link: bool = False,
+    dont_filter: bool = False,
+    store: Optional[TrackStore] = None,
+    work_folder: Optional[str] = None,
+    quiet: bool = False
+) -> bool:
+    """
+    Download a single missing track and record the outcome.
+    
+    Args:
+        track: Track to download
+        playlist_download_folder: Folder to download into
+        stats: Playlist stats dict, updated in place
+        statuses: Per-track status table, updated in place
+        manual_verify: Show YouTube URL and ask for confirmation
+        manual_link: Manually provide YouTube links
+        dont_filter: Disable spotdl result filtering
+        store: Shared track store; tracks already in it are linked instead of downloaded
+        work_folder: Private folder of a download pool worker to download into
+        quiet: Suppress spotdl's console output (downloads running in parallel)
+        
+    Returns:
+        True if the track was downloaded
+    """
+    if store and store.link_track(track, playlist_download_folder):
+        Logger.success(f"Linked from track store: {track.name}")
+        stats['downloaded'] += 1
+        return True
+    
+    artist_str = track.artist_string
+    Logger.info(f"Downloading: {track.name} - {artist_str}")
+    
+    cache = ResolutionCache.get_instance()
+    
+    if manual_link:
+        # Manual YouTube link mode (links given or confirmed before are reused)
+        resolution = cache.get(track.id) if cache else None
+        if resolution and resolution.youtube_url and resolution.confidence >= ResolutionCache.CONFIDENCE_MANUAL:
+            youtube_url = resolution.youtube_url
+            Logger.info(f"Using saved YouTube link: {youtube_url}")
+        else:
+            Logger.info(f"Need YouTube link for: {track.name} - {artist_str}")
+            youtube_url = UserInput.get_youtube_url()
+        if not youtube_url:
+            Logger.warning(f"Skipped: {track.name}")
+            statuses.set(track, TrackStatus.MANUALLY_SKIPPED)
+            stats['skipped'] += 1
+        elif SpotdlDownloader.download_from_youtube(
+            youtube_url, playlist_download_folder, track, store=store, work_folder=work_folder
+        ):
+            if cache:
+                cache.record(track.id, youtube_url, ResolutionCache.CONFIDENCE_MANUAL)
+            Logger.success(f"Downloaded: {track.name}")
+            stats['downloaded'] += 1
+            return True
+        else:
+            if cache:
+                cache.invalidate(track.id)
+            Logger.error(f"Failed to download: {track.name}")
+            statuses.set(track, TrackStatus.UNABLE_TO_FIND)
+            stats['failed'] += 1
+        return False
+    
+    if manual_verify:
+        # Manual verification mode
+        yt_url = SpotdlDownloader.get_youtube_url(track, dont_filter=dont_filter)
+        if yt_url:
+            Logger.info(f"YouTube match: {yt_url}")
+        
+        if not UserInput.confirm_download(track.name):
+            Logger.warning(f"Skipped: {track.name}")
+            statuses.set(track, TrackStatus.MANUALLY_SKIPPED)
+            stats['skipped'] += 1
+            return False
+        
+        # Download exactly the confirmed video
+        if yt_url and cache:
+            cache.record(track.id, yt_url, ResolutionCache.CONFIDENCE_MANUAL)
+        elif cache:
+            # The user asked for the download: search again even if an earlier search found nothing
+            cache.invalidate(track.id)
+    
+    # Automatic mode (or confirmed manual verification)
+    if SpotdlDownloader.download_from_spotify(
+        track, playlist_download_folder, dont_filter=dont_filter, store=store, work_folder=work_folder, quiet=quiet
+    ):
+        Logger.success(f"Downloaded: {track.name}")
+        stats['downloaded'] += 1
+        return True
+    
+    Logger.error(f"Failed to download: {track.name}")
+    statuses.set(track, TrackStatus.UNABLE_TO_FIND)
+    stats['failed'] += 1
+    return False
+
+
+def download_track_batch(
+    tracks: List[Track],
+    playlist_download_folder: str,
+    stats: dict,
+    statuses: TrackStatusTable,
+    dont_filter: bool = False,
+    store: Optional[TrackStore] = None,
+    work_folder: Optional[str] = None,
+    quiet: bool = False
+) -> List[bool]:
+    """
+    Download several missing tracks with a single spotdl run and record the outcomes.
+    Tracks the batch run did not produce are retried one at a time.
+    
+    Args:
+        tracks: Tracks to download
+        playlist_download_folder: Folder to download into
+        stats: Playlist stats dict, updated in place
+        statuses: Per-track status table, updated in place
+        dont_filter: Disable spotdl result filtering
+        store: Shared track store; tracks already in it are linked instead of downloaded
+        work_folder: Private folder of a download pool worker to download into
+        quiet: Suppress spotdl's console output (downloads running in parallel)
+        
+    Returns:
+        For each track, True if it was downloaded
+    """
+    downloaded = {}
+    remaining = []
+    for track in tracks:
+        if store and store.link_track(track, playlist_download_folder):
+            Logger.success(f"Linked from track store: {track.name}")
+            stats['downloaded'] += 1
+            downloaded[track.key] = True
+        else:
+            remaining.append(track)
+    
+    if len(remaining) > 1:
+        Logger.info(f"Downloading {len(remaining)} songs in one spotdl run")
+        results = SpotdlDownloader.download_batch_from_spotify(
+            remaining, playlist_download_folder, dont_filter=dont_filter, store=store, work_folder=work_folder, quiet=quiet
+        )
+        for track in remaining:
+            if results[track.key]:
+                Logger.success(f"Downloaded: {track.name}")
+                stats['downloaded'] += 1
+                downloaded[track.key] = True
+        remaining = [track for track in remaining if not results[track.key]]
+        if remaining:
+            Logger.info(f"Retrying {len(remaining)} songs one at a time")
+    
+    for track in remaining:
+        downloaded[track.key] = download_track(
+            track,
+            playlist_download_folder,
+            stats,
+            statuses,
+            dont_filter=dont_filter,
+            store=store,
+            work_folder=work_folder,
+            quiet=quiet
+        )
+    
+    return [downloaded[track.key] for track in tracks]
+
+
+def download_tracks(
+    jobs: List[Tuple[Track, str]],
+    download_folder: str,
+    stats: dict,
+    statuses: TrackStatusTable,
+    manual_verify: bool = False,
+    manual_link: bool = False,
+    dont_filter: bool = False,
+    store: Optional[TrackStore] = None
+) -> Iterator[Tuple[Track, str, bool]]:
+    """
+    Download tracks, several at a time when advanced.parallel_downloads is enabled.
+    Consecutive tracks for the same folder are downloaded in batches of up to
+    advanced.spotdl_batch_size per spotdl run. Progress and stats are reported
+    in job order as the downloads finish. With advanced.download_pipeline
+    enabled, songs go through the staged download pipeline instead and are
+    reported as they finish. Manual modes prompt for every track and always
+    download one at a time. Jobs are recorded in the persistent download queue
+    first, so an interrupted run can be resumed.
+    
+    Args:
+        jobs: List of (track, playlist_download_folder) to download
+        download_folder: Base folder for downloads
+        stats: Stats dict with downloaded/skipped/failed counts, updated in place
+        statuses: Per-track status table, updated in place
+        manual_verify: Show YouTube URL and ask for confirmation
+        manual_link: Manually provide YouTube links
+        dont_filter: Disable spotdl result filtering
+        store: Shared track store; tracks already in it are linked instead of downloaded
+        
+    Yields:
+        Tuple of (track, playlist_download_folder, downloaded) for each job, in job
+        order (in the order they finish when the pipeline is used)
+    """
+    manual = manual_verify or manual_link
+    workers = 1 if manual else DownloadPool.get_worker_count()
+    
+    # Group jobs for the same folder into spotdl batches, small enough that every worker gets one
+    batch_size = 1 if manual else max(1, settings.get('advanced', 'spotdl_batch_size') or 1)
+    batch_size = min(batch_size, max(1, math.ceil(len(jobs) / workers)))
+    batches: List[List[Tuple[Track, str]]] = []
+    for job in jobs:
+        if batches and len(batches[-1]) < batch_size and batches[-1][-1][1] == job[1]:
+            batches[-1].append(job)
+        else:
+            batches.append([job])
+    
+    queue = DownloadQueue.get_instance()
+    job_ids = {}
+    if queue:
+        for track, playlist_download_folder in jobs:
+            job_ids[(track.key, playlist_download_folder)] = queue.enqueue(track, playlist_download_folder)
+    
+    if not manual and DownloadPipeline.is_enabled():
+        with DownloadPipeline(download_folder, store=store, dont_filter=dont_filter) as pipeline:
+            def start(track: Track, folder: str) -> None:
+                queue.start([job_ids[(track.key, folder)]], pipeline.work_folder)
+            
+            for idx, result in enumerate(pipeline.run(jobs, on_download=start if queue else None), 1):
+                if result.linked:
+                    Logger.success(f"Linked from track store: {result.track.name}")
+                elif result.downloaded:
+                    Logger.success(f"Downloaded: {result.track.name}")
+                else:
+                    Logger.error(f"Failed to download: {result.track.name} ({result.error})")
+                    statuses.set(result.track, TrackStatus.UNABLE_TO_FIND)
+                stats['downloaded' if result.downloaded else 'failed'] += 1
+                if queue:
+                    queue.finish(job_ids[(result.track.key, result.folder)], result.downloaded, result.error)
+                Logger.progress(idx, len(jobs), "downloading", show_eta=True)
+                yield result.track, result.folder, result.downloaded
+        return
+    
+    def run(batch: List[Tuple[Track, str]], work_folder: Optional[str]) -> Tuple[List[bool], dict]:
+        playlist_download_folder = batch[0][1]
+        batch_stats = {'downloaded': 0, 'skipped': 0, 'failed': 0}
+        if queue:
+            queue.start([job_ids[(track.key, folder)] for track, folder in batch], work_folder)
+        if len(batch) > 1:
+            results = download_track_batch(
+                [track for track, _ in batch],
+                playlist_download_folder,
+                batch_stats,
+                statuses,
+                dont_filter=dont_filter,
+                store=store,
+                work_folder=work_folder,
+                quiet=workers > 1
+            )
+        else:
+            results = [download_track(
+                batch[0][0],
+                playlist_download_folder,
+                batch_stats,
+                statuses,
+                manual_verify=manual_verify,
+                manual_link=manual_link,
+                dont_filter=dont_filter,
+                store=store,
+                work_folder=work_folder,
+                quiet=workers > 1
+            )]
+        if queue:
+            for (track, folder), downloaded in zip(batch, results):
+                queue.finish(job_ids[(track.key, folder)], downloaded, statuses.get(track))
+        return results, batch_stats
+    
+    idx = 0
+    with DownloadPool(download_folder, workers) as pool:
+        for batch, (results, batch_stats) in pool.map(run, batches):
+            for key, count in batch_stats.items():
+                stats[key] += count
+            for (track, playlist_download_folder), downloaded in zip(batch, results):
+                idx += 1
+                Logger.progress(idx, len(jobs), "downloading", show_eta=True)
+                yield track, playlist_download_folder, downloaded
+
+
+def resume_queued_downloads(
+    spotify_client: SpotifyClient,
+    playlists: List[str],
+    download_folder: str,
+    prefetched: Dict,
+    manual_verify: bool = False,
+    manual_link: bool = False,
+    dont_filter: bool = False
+) -> dict:
+    """
+    Finish the downloads an interrupted run left in the download queue.
+    Downloads that were in progress when it stopped have their work folders
+    removed and are started again. Jobs of processes that are still running are
+    left to them, and jobs whose track has been downloaded since or is no longer
+    in its playlist are closed without downloading. Playlists are fetched only
+    when there is something to resume and are added to prefetched.
+    
+    Args:
+        spotify_client: SpotifyClient instance
+        playlists: List of playlist IDs/URLs
+        download_folder: Base folder for downloads (jobs for other folders are left alone)
+        prefetched: Playlist ID -> get_playlist_tracks_cached result (or exception), updated in place
+        manual_verify: Show YouTube URL and ask for confirmation
+        manual_link: Manually provide YouTube links
+        dont_filter: Disable spotdl result filtering
+        
+    Returns:
+        Stats dict with missing/downloaded/skipped/failed counts
+    """
+    stats = {'missing': 0, 'downloaded': 0, 'skipped': 0, 'failed': 0}
+    queue = DownloadQueue.get_instance()
+    if not queue:
+        return stats
+    
+    recovered = queue.recover()
+    if recovered:
+        Logger.info(f"Cleaned up {recovered} interrupted downloads")
+    claimed = queue.claim_pending(download_folder)
+    if not claimed:
+        return stats
+    
+    # Tracks of each playlist folder, as the playlists are now
+    wanted: Dict[str, List[Track]] = {}
+    fetch_failed = False
+    for playlist_id in playlists:
+        if playlist_id not in prefetched:
+            try:
+                prefetched[playlist_id] = spotify_client.get_playlist_tracks_cached(playlist_id)
+            except Exception as e:
+                prefetched[playlist_id] = e
+        result = prefetched[playlist_id]
+        if isinstance(result, Exception):
+            fetch_failed = True
+            continue
+        tracks, playlist_info, _ = result
+        playlist_name = playlist_info.get('name') if playlist_info else None
+        folder = os.path.abspath(os.path.join(download_folder, FileManager.get_playlist_folder_name(playlist_id, playlist_name)))
+        wanted.setdefault(folder, []).extend(tracks)
+    wanted_keys = {folder: {track.key for track in tracks} for folder, tracks in wanted.items()}
+    
+    pending = []
+    downloaded_sets = {}
+    for job in claimed:
+        if job.folder not in wanted and fetch_failed:
+            continue  # Its playlist may not have been fetched; claimable again once this run ends
+        if job.track.key not in wanted_keys.get(job.folder, ()) or not os.path.isdir(job.folder):
+            queue.finish(job.job_id, False, "No longer in playlist")
+            continue
+        # The file may have been written before the interrupted run recorded it
+        if job.folder not in downloaded_sets:
+            playlist_ids = frozenset(track.id for track in wanted[job.folder] if track.id)
+            downloaded_sets[job.folder] = (FileManager.get_downloaded_songs(job.folder), playlist_ids)
+        downloaded, playlist_ids = downloaded_sets[job.folder]
+        if FileManager.is_song_downloaded(job.track, downloaded, playlist_ids):
+            queue.finish(job.job_id, True)
+            continue
+        pending.append(job)
+    if not pending:
+        return stats
+    
+    Logger.section(f"Resuming {len(pending)} queued downloads from an interrupted run")
+    
+    stats['missing'] = len(pending)
+    store = TrackStore(download_folder) if settings.get('download', 'shared_store') else None
+    Logger.start_progress("downloading songs")
+    for _ in download_tracks(
+        [(job.track, job.folder) for job in pending],
+        download_folder,
+        stats,
+        TrackStatusTable(),
+        manual_verify=manual_verify,
+        manual_link=manual_link,
+        dont_filter=dont_filter,
+        store=store
+    ):
+        pass
+    return stats
+
+
+def run_download_plan(
+    spotify_client: SpotifyClient,
+    playlists: List[str],
+    download_folder: str,
+    prefetched: Dict,
+    manual_verify: bool = False,
+    manual_link: bool = False,
+    dont_filter: bool = False
+) -> Tuple[dict, TrackStatusTable]:
+    """
+    Fetch every playlist, then download each track missing from any of them
+    once and distribute it to all playlist folders that need it.
+    Fetched playlists are added to prefetched so they are not fetched again.
+    
+    Args:
+        spotify_client: SpotifyClient instance
+        playlists: List of playlist IDs/URLs
+        download_folder: Base folder for downloads
+        prefetched: Playlist ID -> get_playlist_tracks_cached result (or exception), updated in place
+        manual_verify: Show YouTube URL and ask for confirmation
+        manual_link: Manually provide YouTube links
+        dont_filter: Disable spotdl result filtering
+        
+    Returns:
+        Tuple of (stats, attempted). stats counts playlist occurrences (missing,
+        downloaded, skipped, failed) plus unique_downloads and saved_downloads;
+        attempted holds the outcome of every planned track.
+    """
+    Logger.section("Planning downloads across playlists")
+    
+    fetched = []
+    for playlist_id in playlists:
+        if playlist_id not in prefetched:
+            try:
+                prefetched[playlist_id] = spotify_client.get_playlist_tracks_cached(playlist_id)
+            except Exception as e:
+                prefetched[playlist_id] = e
+        result = prefetched[playlist_id]
+        if not isinstance(result, Exception):
+            fetched.append((playlist_id, result[0], result[1]))
+    
+    plan = DownloadPlan.build(fetched, download_folder)
+    stats = {
+        'missing': plan.occurrences,
+        'downloaded': 0,
+        'skipped': 0,
+        'failed': 0,
+        'unique_downloads': len(plan),
+        'saved_downloads': plan.saved
+    }
+    attempted = TrackStatusTable()
+    
+    if not len(plan):
+        Logger.success("No missing songs in any playlist")
+        return stats, attempted
+    
+    Logger.info(f"{plan.occurrences} missing songs across playlists, {len(plan)} unique to download")
+    store = TrackStore(download_folder) if settings.get('download', 'shared_store') else None
+    
+    Logger.start_progress("downloading songs")
+    planned_downloads = plan.downloads
+    statuses = TrackStatusTable()
+    results = download_tracks(
+        [(planned.track, planned.folders[0]) for planned in planned_downloads],
+        download_folder,
+        {'downloaded': 0, 'skipped': 0, 'failed': 0},
+        statuses,
+        manual_verify=manual_verify,
+        manual_link=manual_link,
+        dont_filter=dont_filter,
+        store=store
+    )
+    planned_by_key = {planned.track.key: planned for planned in planned_downloads}
+    for track, _, downloaded in results:
+        planned = planned_by_key[track.key]
+        if downloaded:
+            distributed = DownloadPlan.distribute(planned, store)
+            if distributed:
+                Logger.info(f"Added to {distributed} more playlist(s): {planned.track.name}")
+            stats['downloaded'] += 1 + distributed
+            stats['failed'] += len(planned.folders) - 1 - distributed
+            attempted.set(planned.track, TrackStatus.DOWNLOADED)
+        else:
+            outcome = statuses.get(planned.track) or TrackStatus.UNABLE_TO_FIND
+            stats['skipped' if outcome == TrackStatus.MANUALLY_SKIPPED else 'failed'] += len(planned.folders)
+            attempted.set(planned.track, outcome)
+    
+    return stats, attempted
+
+
 def process_playlist(
     spotify_client: SpotifyClient,
     playlist_id: str,
@@ -37,7 +527,10 @@ def process_playlist(
     dont_filter: bool = False,
     cleanup_removed: bool = False,
     auto_delete_removed: bool = False,
-    keep_removed: bool = False
+    keep_removed: bool = False,
+    prefetched: Optional[Union[Tuple[List[Track], Optional[Dict], bool], Exception]] = None,
+    stream: bool = False,
+    attempted: Optional[TrackStatusTable] = None
 ) -> dict:
     """
     Process a single playlist: fetch tracks, check downloads, download missing songs.
@@ -52,6 +545,12 @@ def process_playlist(
         cleanup_removed: Check for and handle removed songs
         auto_delete_removed: Automatically delete files for removed songs
         keep_removed: Keep files for removed songs without prompting
+        prefetched: Result of get_playlist_tracks_cached fetched ahead of time
+            (e.g. by the async client), or the exception raised while fetching it
+        stream: Start matching and downloading each page of tracks as soon as it
+            arrives instead of waiting for the whole playlist (ignored with prefetched)
+        attempted: Outcomes of downloads already attempted by the global download
+            plan; these tracks are not downloaded again (and not counted again)
         
     Returns:
         Dictionary with stats (total_tracks, missing, downloaded, skipped, failed)
@@ -67,12 +566,21 @@ def process_playlist(
     }
     
     try:
-        # Fetch playlist info and tracks
-        tracks = spotify_client.get_playlist_tracks(playlist_id)
-        stats['total_tracks'] = len(tracks)
-        Logger.info(f"Found {len(tracks)} songs in playlist")
+        # Fetch playlist info and tracks (served from cache if the snapshot is unchanged)
+        if isinstance(prefetched, Exception):
+            raise prefetched
+        if stream and not prefetched:
+            pages, playlist_info, unchanged = spotify_client.stream_playlist_tracks_cached(playlist_id)
+            if playlist_info and playlist_info.get('total') is not None:
+                Logger.info(f"Found {playlist_info['total']} items in playlist, streaming tracks")
+        else:
+            tracks, playlist_info, unchanged = prefetched or spotify_client.get_playlist_tracks_cached(playlist_id)
+            pages = [tracks]
+            Logger.info(f"Found {len(tracks)} songs in playlist")
+        
+        if unchanged:
+            Logger.info("Playlist unchanged since last check, using cached track list")
         
-        playlist_info = spotify_client.get_playlist_info(playlist_id)
         playlist_name = playlist_info.get('name') if playlist_info else None
         
         if playlist_name:
@@ -88,99 +596,84 @@ def process_playlist(
         csv_filepath = CSVManager.get_csv_filepath(playlist_id, playlist_name)
         csv_status_map = CSVManager.read_csv_status(csv_filepath)
         
-        # Find missing songs
-        missing_tracks = []
-        for track in tracks:
-            song_key = f"{track['artists'][0] if track['artists'] else 'Unknown'} - {track['name']}".lower()
+        # Tracks already downloaded for another playlist are linked from the shared store
+        store = TrackStore(download_folder) if settings.get('download', 'shared_store') else None
+        
+        # Find and download missing songs one page at a time; when streaming,
+        # later pages are still being fetched while earlier ones download
+        statuses = TrackStatusTable()
+        tracks = []
+        # Tagged files whose ID is not among the tracks seen so far can still be
+        # matched by name (when streaming, that includes files of later pages)
+        playlist_ids = set()
+        planned_count = 0
+        for page in pages:
+            tracks.extend(page)
+            stats['total_tracks'] = len(tracks)
+            playlist_ids.update(track.id for track in page if track.id)
             
-            # Skip if already downloaded
-            if FileManager.is_song_downloaded(track, downloaded):
-                continue
+            missing_tracks = []
+            for track in page:
+                outcome = attempted.get(track) if attempted is not None else None
+                if outcome:
+                    planned_count += 1
+                
+                # Skip if already downloaded
+                if FileManager.is_song_downloaded(track, downloaded, playlist_ids):
+                    continue
+                
+                # Skip if previously marked as unable to find
+                if csv_status_map.get(track.csv_key) == Config.CSV_STATUS_UNABLE_TO_FIND:
+                    Logger.warning(f"Skipped (previously unable to find): {track.name}")
+                    statuses.set(track, TrackStatus.UNABLE_TO_FIND)
+                    stats['skipped'] += 1
+                    continue
+                
+                # Skip if the global download plan already tried it this run
+                if outcome:
+                    statuses.set(track, outcome)
+                    continue
+                
+                missing_tracks.append(track)
             
-            # Skip if previously marked as unable to find
-            if csv_status_map.get(song_key) == Config.CSV_STATUS_UNABLE_TO_FIND:
-                Logger.warning(f"Skipped (previously unable to find): {track['name']}")
-                track['unable_to_find'] = True
-                stats['skipped'] += 1
+            if not missing_tracks:
                 continue
+            if stats['missing'] == 0:
+                Logger.start_progress("downloading songs")
+            stats['missing'] += len(missing_tracks)
             
-            missing_tracks.append(track)
-        
-        stats['missing'] = len(missing_tracks)
+            # Download missing songs
+            for _ in download_tracks(
+                [(track, playlist_download_folder) for track in missing_tracks],
+                download_folder,
+                stats,
+                statuses,
+                manual_verify=manual_verify,
+                manual_link=manual_link,
+                dont_filter=dont_filter,
+                store=store
+            ):
+                pass
         
-        if not missing_tracks:
+        if not stats['missing'] and not planned_count:
             Logger.success("All songs already downloaded!")
+            if stats['skipped'] == 0:
+                spotify_client.playlist_cache.mark_synced(playlist_id)
             return stats
         
-        Logger.start_progress("downloading songs")
-        
-        # Download missing songs
-        for idx, track in enumerate(missing_tracks, 1):
-            Logger.progress(idx, len(missing_tracks), f"downloading", show_eta=True)
-            artist_str = ', '.join(track['artists']) if track['artists'] else 'Unknown'
-            Logger.info(f"Downloading: {track['name']} - {artist_str}")
-            
-            success = False
-            
-            if manual_link:
-                # Manual YouTube link mode
-                Logger.info(f"Need YouTube link for: {track['name']} - {artist_str}")
-                youtube_url = UserInput.get_youtube_url()
-                if not youtube_url:
-                    Logger.warning(f"Skipped: {track['name']}")
-                    track['manually_skipped'] = True
-                    stats['skipped'] += 1
-                elif SpotdlDownloader.download_from_youtube(youtube_url, playlist_download_folder, track):
-                    Logger.success(f"Downloaded: {track['name']}")
-                    success = True
-                    stats['downloaded'] += 1
-                else:
-                    Logger.error(f"Failed to download: {track['name']}")
-                    track['unable_to_find'] = True
-                    stats['failed'] += 1
-            
-            elif manual_verify:
-                # Manual verification mode
-                yt_url = SpotdlDownloader.get_youtube_url(track, dont_filter=dont_filter)
-                if yt_url:
-                    Logger.info(f"YouTube match: {yt_url}")
-                
-                if UserInput.confirm_download(track['name']):
-                    if SpotdlDownloader.download_from_spotify(track, playlist_download_folder, dont_filter=dont_filter):
-                        Logger.success(f"Downloaded: {track['name']}")
-                        success = True
-                        stats['downloaded'] += 1
-                    else:
-                        Logger.error(f"Failed to download: {track['name']}")
-                        track['unable_to_find'] = True
-                        stats['failed'] += 1
-                else:
-                    Logger.warning(f"Skipped: {track['name']}")
-                    track['manually_skipped'] = True
-                    stats['skipped'] += 1
-            
-            else:
-                # Automatic mode
-                if SpotdlDownloader.download_from_spotify(track, playlist_download_folder, dont_filter=dont_filter):
-                    Logger.success(f"Downloaded: {track['name']}")
-                    success = True
-                    stats['downloaded'] += 1
-                else:
-                    Logger.error(f"Failed to download: {track['name']}")
-                    track['unable_to_find'] = True
-                    stats['failed'] += 1
-        
         # Refresh downloads and update CSV
         downloaded = FileManager.get_downloaded_songs(playlist_download_folder)
         csv_filepath = CSVManager.get_csv_filepath(playlist_id, playlist_name, playlist_download_folder)
-        CSVManager.write_playlist_songs(
+        downloaded_count = CSVManager.write_playlist_songs(
             playlist_id,
             tracks,
             downloaded,
-            FileManager.is_song_downloaded,
+            lambda track, downloaded_set: FileManager.is_song_downloaded(track, downloaded_set, playlist_ids),
             playlist_name,
-            playlist_download_folder
+            playlist_download_folder,
+            statuses
         )
+        spotify_client.playlist_cache.mark_synced(playlist_id, downloaded_count == len(tracks))
         
         # Handle cleanup of removed songs if requested
         if cleanup_removed or auto_delete_removed or keep_removed:
@@ -226,6 +719,9 @@ def main():
     parser.add_argument("--cleanup-removed", action="store_true", help="Check for songs removed from playlists and ask to delete files")
     parser.add_argument("--auto-delete-removed", action="store_true", help="Automatically delete files for songs removed from playlists")
     parser.add_argument("--keep-removed", action="store_true", help="Keep files for songs removed from playlists (no prompt)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Fetch all playlists concurrently before downloading")
+    parser.add_argument("--stream", action="store_true", help="Start downloading while later pages of a playlist are still being fetched")
+    parser.add_argument("--no-plan", action="store_true", help="Download per playlist instead of planning unique downloads across all playlists")
     
     args = parser.parse_args()
     
@@ -245,7 +741,7 @@ def main():
     
     try:
         Logger.info("Initializing Spotify client...")
-        spotify_client = SpotifyClient()
+        spotify_client = SpotifyClient.get_instance()
         Logger.success("Connected to Spotify")
     except Exception as e:
         ErrorHandler.handle_fatal_exception(e, "Failed to initialize Spotify client")
@@ -264,8 +760,14 @@ def main():
         Logger.warning("No playlists to process")
         return
     
-    # Process each playlist
-    Logger.header(f"Processing {len(playlists)} Playlists")
+    # Fetch all playlists concurrently up front if requested
+    prefetched = {}
+    if args.use_async:
+        try:
+            Logger.info(f"Fetching {len(playlists)} playlists concurrently...")
+            prefetched = AsyncSpotifyClient.fetch_playlists(playlists)
+        except Exception as e:
+            ErrorHandler.handle_exception(e, "Async fetch failed, falling back to sequential fetching")
     
     total_stats = {
         'total_playlists': len(playlists),
@@ -279,6 +781,46 @@ def main():
         'total_files_kept': 0
     }
     
+    # Pick up where an interrupted run stopped
+    try:
+        resumed_stats = resume_queued_downloads(
+            spotify_client,
+            playlists,
+            args.download_folder,
+            prefetched,
+            manual_verify=args.manual_verify,
+            manual_link=args.manual_link,
+            dont_filter=args.dont_filter_results
+        )
+        for key in ('missing', 'downloaded', 'skipped', 'failed'):
+            total_stats[f'total_{key}'] += resumed_stats[key]
+    except Exception as e:
+        ErrorHandler.handle_exception(e, "Could not resume queued downloads")
+    
+    # Download each song missing from any playlist once, before the per-playlist pass
+    plan_stats = None
+    attempted = None
+    if len(playlists) > 1 and not args.no_plan and not args.stream:
+        try:
+            plan_stats, attempted = run_download_plan(
+                spotify_client,
+                playlists,
+                args.download_folder,
+                prefetched,
+                manual_verify=args.manual_verify,
+                manual_link=args.manual_link,
+                dont_filter=args.dont_filter_results
+            )
+            total_stats['total_missing'] += plan_stats['missing']
+            total_stats['total_downloaded'] += plan_stats['downloaded']
+            total_stats['total_skipped'] += plan_stats['skipped']
+            total_stats['total_failed'] += plan_stats['failed']
+        except Exception as e:
+            ErrorHandler.handle_exception(e, "Download planning failed, downloading per playlist")
+    
+    # Process each playlist
+    Logger.header(f"Processing {len(playlists)} Playlists")
+    
     for idx, playlist_id in enumerate(playlists, 1):
         try:
             Logger.progress(idx, len(playlists), "processing playlists")
@@ -292,7 +834,10 @@ def main():
                 dont_filter=args.dont_filter_results,
                 cleanup_removed=args.cleanup_removed,
                 auto_delete_removed=args.auto_delete_removed,
-                keep_removed=args.keep_removed
+                keep_removed=args.keep_removed,
+                prefetched=prefetched.get(playlist_id),
+                stream=args.stream,
+                attempted=attempted
             )
             
             # Accumulate stats
@@ -320,6 +865,31 @@ def main():
     Logger.summary('Successfully Downloaded', str(total_stats['total_downloaded']))
     Logger.summary('Skipped', str(total_stats['total_skipped']))
     Logger.summary('Failed', str(total_stats['total_failed']))
+    if plan_stats:
+        Logger.summary('Unique Downloads', str(plan_stats['unique_downloads']))
+        Logger.summary('Downloads Saved by Dedupe', str(plan_stats['saved_downloads']))
+    
+    # Spotify API usage, for tuning the rate limiter against the quota
+    api_stats = spotify_rate_limiter.get_stats()
+    Logger.summary('Spotify API Requests', str(api_stats['requests']))
+    if api_stats['throttles']:
+        Logger.summary('Rate Limited (429)', str(api_stats['throttles']), success=False)
+        Logger.summary('Rate Limit Wait', f"{api_stats['wait_time']:.1f}s", success=False)
+    
+    # Transient download failures, for tuning max_retries and download_timeout_seconds
+    retry_stats = download_retry_policy.get_stats()
+    if retry_stats['retries'] or retry_stats['timeouts']:
+        Logger.summary('Download Retries', str(retry_stats['retries']), success=False)
+        Logger.summary('Download Timeouts', str(retry_stats['timeouts']), success=False)
+    
+    # Time each pipeline stage spent working, to see which one holds downloads back
+    bottleneck = pipeline_metrics.get_bottleneck()
+    for stage, stage_stats in pipeline_metrics.get_stats().items():
+        Logger.summary(
+            f"Pipeline {stage.capitalize()}{' (bottleneck)' if stage == bottleneck else ''}",
+            f"{stage_stats['songs']} songs, {stage_stats['busy']:.1f}s busy on {stage_stats['workers']} workers "
+            f"({stage_stats['utilization']:.0%} utilized)"
+        )
     
     # Print cleanup summary if any cleanup was performed
     if total_stats['total_removed_songs'] > 0:
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Library deduplicator.
+Moves tagged songs from all playlist folders into the shared track store and
+replaces duplicate copies with hardlinks to the stored file.
+
+Usage:
+    python dedupe.py
+    python dedupe.py --download-folder "/path/to/folder"
+"""
+
+import warnings
+warnings.simplefilter('ignore')
+warnings.filterwarnings('ignore')
+
+import argparse
+from spotify_sync.core.track_store import TrackStore
+from spotify_sync.core.logger import Logger
+from spotify_sync.utils.error_handler import ErrorHandler
+from spotify_sync.core.settings_manager import settings, Config
+
+
+def main():
+    """Main entry point for the deduplicator."""
+    parser = argparse.ArgumentParser(description="Deduplicate downloaded songs into the shared track store")
+    parser.add_argument("--download-folder", default=Config.get_downloads_folder(), help="Folder with downloaded songs")
+    args = parser.parse_args()
+
+    Logger.header("Library Deduplicator")
+
+    try:
+        ErrorHandler.validate_folder(args.download_folder)
+    except Exception as e:
+        ErrorHandler.handle_fatal_exception(e, "Invalid download folder")
+        return
+
+    store = TrackStore(args.download_folder)
+    Logger.info(f"Moving tagged songs into {store.folder}...")
+
+    try:
+        stats = store.dedupe(args.download_folder)
+    except Exception as e:
+        ErrorHandler.handle_fatal_exception(e, "Deduplication failed")
+        return
+
+    Logger.header("Dedupe Summary")
+    Logger.summary("Files Scanned", str(stats['files_scanned']))
+    Logger.summary("Added to Store", str(stats['stored']))
+    Logger.summary("Duplicates Linked", str(stats['linked']))
+    Logger.summary("Space Saved", f"{stats['bytes_saved'] / (1024 * 1024):.1f} MB")
+    if stats['untagged']:
+        Logger.summary("Untagged (left as is)", str(stats['untagged']), success=False)
+
+    if not settings.get('download', 'shared_store'):
+        Logger.info("Tip: set download.shared_store to true so new downloads reuse the store")
+    Logger.success("Deduplication complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Library retagger.
+Re-applies Spotify metadata (title, artists, album, year, cover art and the
+Spotify track ID) to songs that are already downloaded, without downloading
+anything. Files are tagged in parallel by a pool of worker processes.
+
+Usage:
+    python retag.py
+    python retag.py --download-folder "/path/to/folder" --workers 4
+    python retag.py --no-cover
+"""
+
+import warnings
+warnings.simplefilter('ignore')
+warnings.filterwarnings('ignore')
+
+import os
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from spotify_sync.core.spotify_api import SpotifyClient
+from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.download_plan import DownloadPlan
+from spotify_sync.core.cover_art_cache import CoverArtCache
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_tags import TrackTagger
+from spotify_sync.utils.utils import PlaylistReader
+from spotify_sync.core.logger import Logger
+from spotify_sync.utils.error_handler import ErrorHandler
+from spotify_sync.core.settings_manager import Config
+
+
+def find_retag_jobs(
+    spotify_client: SpotifyClient,
+    playlists: List[str],
+    download_folder: str
+) -> Tuple[List[Tuple[str, Track]], Dict[str, int]]:
+    """
+    Find the downloaded file of every playlist track.
+    A file linked into several playlist folders (shared track store) is tagged once.
+
+    Args:
+        spotify_client: SpotifyClient instance
+        playlists: List of playlist IDs/URLs
+        download_folder: Base folder for downloads
+
+    Returns:
+        Tuple of (jobs, stats). jobs is a list of (filepath, track); stats has
+        'tracks' and 'not_found' counts
+    """
+    jobs = []
+    seen_files = set()
+    stats = {'tracks': 0, 'not_found': 0}
+
+    for playlist_id in playlists:
+        try:
+            tracks, playlist_info, _ = spotify_client.get_playlist_tracks_cached(playlist_id)
+        except Exception as e:
+            ErrorHandler.handle_exception(e, f"Could not fetch playlist {playlist_id}")
+            continue
+
+        playlist_name = playlist_info.get('name') if playlist_info else None
+        folder = os.path.join(download_folder, FileManager.get_playlist_folder_name(playlist_id, playlist_name))
+        if not os.path.isdir(folder):
+            continue
+
+        for track in tracks:
+            stats['tracks'] += 1
+            filepath = DownloadPlan.find_downloaded_file(folder, track)
+            if not filepath or not filepath.lower().endswith('.mp3'):
+                stats['not_found'] += 1
+                continue
+
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                stats['not_found'] += 1
+                continue
+            if (stat.st_dev, stat.st_ino) in seen_files:
+                continue
+            seen_files.add((stat.st_dev, stat.st_ino))
+            jobs.append((filepath, track))
+
+    return jobs, stats
+
+
+def retag_file(job: Tuple[str, Track, bool]) -> bool:
+    """
+    Tag one file (runs in a worker process).
+
+    Args:
+        job: Tuple of (filepath, track, include_cover)
+
+    Returns:
+        True if the file was tagged
+    """
+    filepath, track, include_cover = job
+    cover_data = CoverArtCache.get_instance().get(track.cover_art_url) if include_cover else None
+    return TrackTagger.write(filepath, track, cover_data)
+
+
+def main():
+    """Main entry point for the retagger."""
+    parser = argparse.ArgumentParser(description="Re-apply Spotify metadata to downloaded songs")
+    parser.add_argument("--download-folder", default=Config.get_downloads_folder(), help="Folder with downloaded songs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of files tagged in parallel")
+    parser.add_argument("--no-cover", action="store_true", help="Leave cover art as it is")
+    args = parser.parse_args()
+
+    Logger.header("Library Retagger")
+
+    try:
+        ErrorHandler.validate_folder(args.download_folder)
+    except Exception as e:
+        ErrorHandler.handle_fatal_exception(e, "Invalid download folder")
+        return
+
+    try:
+        spotify_client = SpotifyClient.get_instance()
+        playlists = PlaylistReader.read_playlists(Config.get_playlists_file())
+    except Exception as e:
+        ErrorHandler.handle_fatal_exception(e, "Failed to initialize")
+        return
+
+    if not playlists:
+        Logger.warning("No playlists to process")
+        return
+
+    Logger.info(f"Finding downloaded songs of {len(playlists)} playlists...")
+    jobs, stats = find_retag_jobs(spotify_client, playlists, args.download_folder)
+    if not jobs:
+        Logger.warning("No downloaded songs found")
+        return
+
+    Logger.info(f"Retagging {len(jobs)} files with {max(1, args.workers)} workers...")
+    Logger.start_progress("retagging")
+    tagged = 0
+    failed = 0
+    try:
+        # Spawned, not forked: the parent holds open database connections and threads
+        with ProcessPoolExecutor(
+            max_workers=max(1, args.workers),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            results = executor.map(
+                retag_file,
+                [(filepath, track, not args.no_cover) for filepath, track in jobs],
+                chunksize=16
+            )
+            for idx, ((filepath, track), success) in enumerate(zip(jobs, results), 1):
+                if idx % 50 == 0 or idx == len(jobs):
+                    Logger.progress(idx, len(jobs), "retagging", show_eta=True)
+                if success:
+                    tagged += 1
+                    FileManager.record_track_id(filepath, track.id, write_tag=False)
+                else:
+                    failed += 1
+    except Exception as e:
+        ErrorHandler.handle_fatal_exception(e, "Retagging failed")
+        return
+
+    Logger.header("Retag Summary")
+    Logger.summary("Playlist Tracks", str(stats['tracks']))
+    Logger.summary("Files Retagged", str(tagged))
+    if failed:
+        Logger.summary("Failed", str(failed), success=False)
+    if stats['not_found']:
+        Logger.summary("Not Downloaded (or untagged with a different name)", str(stats['not_found']), success=False)
+    Logger.success("Retagging complete!")
+
+
+if __name__ == "__main__":
+    main()
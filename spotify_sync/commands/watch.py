@@ -6,6 +6,7 @@ Periodically checks playlists for new songs and downloads them.
 Usage:
     python watch.py --download-folder "/path/to/folder" --interval 10
     python watch.py  # Uses defaults: downloaded_songs folder, 10-minute intervals
+    python watch.py --async  # Poll all playlists concurrently each cycle
 """
 
 import warnings
@@ -16,10 +17,19 @@ import os
 import time
 import argparse
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 from spotify_sync.core.spotify_api import SpotifyClient
+from spotify_sync.core.async_spotify_api import AsyncSpotifyClient
+from spotify_sync.core.rate_limiter import spotify_rate_limiter
 from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.folder_watcher import FolderWatcher
 from spotify_sync.core.downloader import SpotdlDownloader
 from spotify_sync.core.csv_manager import CSVManager
+from spotify_sync.core.track import Track, TrackStatus, TrackStatusTable
+from spotify_sync.core.track_store import TrackStore
+from spotify_sync.core.download_pool import DownloadPool
+from spotify_sync.core.download_queue import DownloadQueue
+from spotify_sync.core.download_pipeline import DownloadPipeline
 from spotify_sync.utils.utils import PlaylistReader
 from spotify_sync.core.logger import Logger
 from spotify_sync.utils.error_handler import ErrorHandler, SpotifyError
@@ -29,7 +39,9 @@ from spotify_sync.core.settings_manager import settings, Config
 def process_playlist_watch(
     spotify_client: SpotifyClient,
     playlist_id: str,
-    download_folder: str
+    download_folder: str,
+    prefetched: Optional[Union[Tuple[List[Track], Optional[Dict], bool], Exception]] = None,
+    folder_watcher: Optional[FolderWatcher] = None
 ) -> int:
     """
     Check a playlist for new songs and download them.
@@ -38,6 +50,9 @@ def process_playlist_watch(
         spotify_client: SpotifyClient instance
         playlist_id: Spotify playlist ID or URL
         download_folder: Base folder for downloads
+        prefetched: Result of get_playlist_tracks_cached fetched ahead of time
+            (e.g. by the async client), or the exception raised while fetching it
+        folder_watcher: Keeps folder listings current between cycles (lists folders directly if None)
         
     Returns:
         Number of new songs downloaded
@@ -45,9 +60,11 @@ def process_playlist_watch(
     try:
         Logger.info(f"Checking: {playlist_id}")
         
-        # Fetch playlist info and tracks
-        tracks = spotify_client.get_playlist_tracks(playlist_id)
-        playlist_info = spotify_client.get_playlist_info(playlist_id)
+        # Fetch playlist info and tracks (served from cache if the snapshot is unchanged)
+        if isinstance(prefetched, Exception):
+            raise prefetched
+        tracks, playlist_info, unchanged = prefetched or spotify_client.get_playlist_tracks_cached(playlist_id)
+        
         playlist_name = playlist_info.get('name') if playlist_info else None
         
         # Setup playlist folder
@@ -56,41 +73,92 @@ def process_playlist_watch(
         FileManager.create_folder(playlist_download_folder)
         
         # Get current downloads
-        downloaded = FileManager.get_downloaded_songs(playlist_download_folder)
+        get_downloaded_songs = folder_watcher.get_downloaded_songs if folder_watcher else FileManager.get_downloaded_songs
+        downloaded = get_downloaded_songs(playlist_download_folder)
         
         # Find missing songs
+        statuses = TrackStatusTable()
         missing_tracks = []
+        playlist_ids = frozenset(track.id for track in tracks if track.id)
         for track in tracks:
-            if not FileManager.is_song_downloaded(track, downloaded):
+            if not FileManager.is_song_downloaded(track, downloaded, playlist_ids):
                 missing_tracks.append(track)
         
-        # Download new songs
+        # Unchanged and fully downloaded last time: only files deleted since then need work
+        if unchanged and playlist_info.get('synced') and not missing_tracks:
+            Logger.info("No changes since last check")
+            return 0
+        
+        # Download new songs (linking those already in the shared track store)
         if missing_tracks:
             Logger.success(f"Found {len(missing_tracks)} new songs")
+            store = TrackStore(download_folder) if settings.get('download', 'shared_store') else None
             
-            for idx, track in enumerate(missing_tracks, 1):
+            # Record the downloads before starting them, so an interrupted cycle can be cleaned up
+            queue = DownloadQueue.get_instance()
+            job_ids = {}
+            if queue:
+                for track in missing_tracks:
+                    job_ids[track.key] = queue.enqueue(track, playlist_download_folder)
+            
+            def report(idx: int, track: Track, found: bool) -> None:
                 Logger.progress(idx, len(missing_tracks), "downloading")
-                artist_str = ', '.join(track['artists']) if track['artists'] else 'Unknown'
-                Logger.info(f"Downloading: {track['name']} - {artist_str}")
-                
-                if not SpotdlDownloader.download_from_spotify(track, playlist_download_folder):
-                    track['unable_to_find'] = True
-                    Logger.warning(f"Could not find: {track['name']}")
+                if not found:
+                    statuses.set(track, TrackStatus.UNABLE_TO_FIND)
+                    Logger.warning(f"Could not find: {track.name}")
+            
+            if DownloadPipeline.is_enabled():
+                # Resolve, download, tag and verify run as overlapping stages
+                with DownloadPipeline(download_folder, store=store) as pipeline:
+                    def start(track: Track, folder: str) -> None:
+                        queue.start([job_ids[track.key]], pipeline.work_folder)
+                    
+                    results = pipeline.run(
+                        ((track, playlist_download_folder) for track in missing_tracks),
+                        on_download=start if queue else None
+                    )
+                    for idx, result in enumerate(results, 1):
+                        if queue:
+                            queue.finish(job_ids[result.track.key], result.downloaded, result.error)
+                        report(idx, result.track, result.downloaded)
+            else:
+                # Downloads run in parallel when advanced.parallel_downloads is enabled
+                with DownloadPool(download_folder) as pool:
+                    def download(track: Track, work_folder: Optional[str]) -> bool:
+                        if queue:
+                            queue.start([job_ids[track.key]], work_folder)
+                        if store and store.link_track(track, playlist_download_folder):
+                            Logger.info(f"Linked from track store: {track.name}")
+                            found = True
+                        else:
+                            artist_str = track.artist_string
+                            Logger.info(f"Downloading: {track.name} - {artist_str}")
+                            found = SpotdlDownloader.download_from_spotify(
+                                track, playlist_download_folder, store=store, work_folder=work_folder, quiet=pool.workers > 1
+                            )
+                        if queue:
+                            queue.finish(job_ids[track.key], found, None if found else TrackStatus.UNABLE_TO_FIND)
+                        return found
+                    
+                    for idx, (track, found) in enumerate(pool.map(download, missing_tracks), 1):
+                        report(idx, track, found)
         else:
             Logger.info("No new songs")
         
         # Refresh downloads
-        downloaded = FileManager.get_downloaded_songs(playlist_download_folder)
+        downloaded = get_downloaded_songs(playlist_download_folder)
         
         # Update CSV
-        CSVManager.write_playlist_songs(
+        downloaded_count = CSVManager.write_playlist_songs(
             playlist_id,
             tracks,
             downloaded,
-            FileManager.is_song_downloaded,
+            lambda track, downloaded_set: FileManager.is_song_downloaded(track, downloaded_set, playlist_ids),
             playlist_name,
-            playlist_download_folder
+            playlist_download_folder,
+            statuses
         )
+        spotify_client.playlist_cache.mark_synced(playlist_id, downloaded_count == len(tracks))
         
         return len(missing_tracks)
     
@@ -102,7 +170,7 @@ def process_playlist_watch(
         return 0
 
 
-def main_loop(playlists: list, download_folder: str, check_interval: int) -> None:
+def main_loop(playlists: list, download_folder: str, check_interval: int, use_async: bool = False) -> None:
     """
     Continuously check playlists for new songs.
     
@@ -110,17 +178,35 @@ def main_loop(playlists: list, download_folder: str, check_interval: int) -> Non
         playlists: List of playlist IDs/URLs
         download_folder: Base folder for downloads
         check_interval: Check interval in minutes
+        use_async: Poll all playlists concurrently with the async client each cycle
     """
     try:
-        spotify_client = SpotifyClient()
+        spotify_client = SpotifyClient.get_instance()
         Logger.success(f"Connected to Spotify")
     except Exception as e:
         ErrorHandler.handle_fatal_exception(e, "Failed to connect to Spotify")
         return
     
+    # Keep folder listings in memory between cycles instead of re-listing every folder
+    folder_watcher = None
+    folder_events = settings.get('watcher', 'folder_events') or 'auto'
+    if folder_events != 'off':
+        folder_watcher = FolderWatcher(folder_events)
+    
+    # Clean up downloads a previous run left unfinished. Their jobs stay pending:
+    # polling queues the tracks still missing again (keeping their attempt
+    # history), and check resumes or closes the rest
+    queue = DownloadQueue.get_instance()
+    if queue:
+        recovered = queue.recover()
+        if recovered:
+            Logger.info(f"Cleaned up {recovered} interrupted downloads")
+    
     Logger.header(f"Starting Playlist Watcher")
     Logger.info(f"Checking every {check_interval} minute(s)")
     Logger.info(f"Monitoring {len(playlists)} playlists")
+    if folder_watcher:
+        Logger.debug(f"Tracking download folders with {folder_watcher.backend}")
     Logger.info("Press Ctrl+C to stop\n")
     
     iteration = 0
@@ -134,14 +220,32 @@ def main_loop(playlists: list, download_folder: str, check_interval: int) -> Non
             total_new = 0
             successful_checks = 0
             
+            prefetched = {}
+            if use_async:
+                try:
+                    prefetched = AsyncSpotifyClient.fetch_playlists(playlists)
+                except Exception as e:
+                    ErrorHandler.handle_exception(e, "Async fetch failed, falling back to sequential fetching")
+            
             for idx, playlist_id in enumerate(playlists, 1):
                 Logger.progress(idx, len(playlists), "checking playlists")
-                new_songs = process_playlist_watch(spotify_client, playlist_id, download_folder)
+                new_songs = process_playlist_watch(
+                    spotify_client,
+                    playlist_id,
+                    download_folder,
+                    prefetched=prefetched.get(playlist_id),
+                    folder_watcher=folder_watcher
+                )
                 total_new += new_songs
                 successful_checks += 1
             
             # Summary for this iteration
             Logger.success(f"Check complete: Found {total_new} new songs")
+            api_stats = spotify_rate_limiter.get_stats()
+            Logger.debug(
+                f"Spotify API: {api_stats['requests']} requests, {api_stats['throttles']} throttled, "
+                f"{api_stats['wait_time']:.1f}s waited, current rate {api_stats['rate']}/s"
+            )
             Logger.info(f"Next check in {check_interval} minute(s) at {datetime.now().strftime('%H:%M:%S')}")
             
             time.sleep(check_interval * 60)
@@ -149,6 +253,9 @@ def main_loop(playlists: list, download_folder: str, check_interval: int) -> Non
     except KeyboardInterrupt:
         Logger.warning("\nWatcher stopped by user")
         Logger.info(f"Total checks performed: {iteration}")
+    finally:
+        if folder_watcher:
+            folder_watcher.close()
 
 
 def main():
@@ -156,6 +263,7 @@ def main():
     parser = argparse.ArgumentParser(description="Continuous Spotify Playlist Watcher")
     parser.add_argument("--download-folder", default=Config.get_downloads_folder(), help="Folder to download songs to")
     parser.add_argument("--interval", type=int, default=Config.DEFAULT_CHECK_INTERVAL_MINUTES, help="Check interval in minutes")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Poll all playlists concurrently each cycle")
     
     args = parser.parse_args()
     
@@ -185,7 +293,7 @@ def main():
         return
     
     # Start watcher
-    main_loop(playlists, args.download_folder, args.interval)
+    main_loop(playlists, args.download_folder, args.interval, use_async=args.use_async)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,362 @@
+"""
+Asynchronous Spotify API client built on a pooled aiohttp session.
+Lets many playlists be fetched concurrently from a single thread.
+Returns the same shapes as SpotifyClient.
+"""
+
+import os
+import json
+import time
+import asyncio
+from urllib.parse import urlencode
+from typing import Dict, List, Optional, Tuple, Union
+from dotenv import load_dotenv
+from spotipy.cache_handler import CacheFileHandler
+from spotify_sync.core.spotify_api import SpotifyClient
+from spotify_sync.core.playlist_cache import PlaylistCache
+from spotify_sync.core.track import Track
+from spotify_sync.core.http_cache import ResponseCache
+from spotify_sync.core.rate_limiter import spotify_rate_limiter, RateLimiter
+from spotify_sync.core.settings_manager import settings, Config
+from spotify_sync.utils.error_handler import SpotifyError
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for --async
+    aiohttp = None
+
+
+# Result of a cached playlist fetch: (tracks, playlist_info, unchanged)
+PlaylistResult = Tuple[List[Track], Optional[Dict], bool]
+
+
+class AsyncSpotifyClient:
+    """Async wrapper for the Spotify Web API using client credentials."""
+
+    API_URL = 'https://api.spotify.com/v1/'
+    TOKEN_URL = 'https://accounts.spotify.com/api/token'
+
+    def __init__(self, max_connections: Optional[int] = None):
+        """
+        Initialize the client with credentials from .env.
+        The HTTP session is opened by 'async with'.
+
+        Args:
+            max_connections: Connection pool size (defaults to advanced.async_max_connections)
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for async mode. Install it with: pip install aiohttp")
+
+        load_dotenv()
+
+        self.client_id = os.getenv('SPOTIFY_CLIENT_ID')
+        self.client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
+
+        if not self.client_id or not self.client_secret:
+            raise RuntimeError(
+                "Spotify API credentials not set. "
+                "Please create a .env file with SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET."
+            )
+
+        self.max_connections = max_connections or settings.get('advanced', 'async_max_connections') or 20
+        self.playlist_cache = PlaylistCache()
+        self.response_cache = ResponseCache() if settings.get('advanced', 'http_cache') is not False else None
+        self._session = None
+        self._token = None
+        self._token_expires_at = 0.0
+        self._token_lock = None
+
+    async def __aenter__(self) -> 'AsyncSpotifyClient':
+        # Created here so the lock belongs to the running event loop
+        self._token_lock = asyncio.Lock()
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self._session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _get_token(self, force_refresh: bool = False) -> str:
+        """Get a client-credentials access token, refreshing it shortly before expiry."""
+        async with self._token_lock:
+            if not force_refresh and self._token and time.time() < self._token_expires_at - 60:
+                return self._token
+
+            # Reuse a token cached on disk by an earlier run or by the sync client
+            cache_handler = CacheFileHandler(cache_path=SpotifyClient.get_token_cache_path(self.client_id))
+            cached = cache_handler.get_cached_token()
+            if not force_refresh and cached and time.time() < cached.get('expires_at', 0) - 60:
+                self._token = cached['access_token']
+                self._token_expires_at = cached['expires_at']
+                return self._token
+
+            async with self._session.post(
+                AsyncSpotifyClient.TOKEN_URL,
+                data={'grant_type': 'client_credentials'},
+                auth=aiohttp.BasicAuth(self.client_id, self.client_secret)
+            ) as response:
+                if response.status != 200:
+                    raise SpotifyError(f"Token request failed with HTTP {response.status}")
+                payload = await response.json()
+
+            self._token = payload['access_token']
+            self._token_expires_at = time.time() + payload.get('expires_in', 3600)
+            payload['expires_at'] = int(self._token_expires_at)
+            cache_handler.save_token_to_cache(payload)
+            return self._token
+
+    async def _get(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Perform an authenticated GET request against the Web API.
+
+        Args:
+            path: Endpoint path relative to the API root
+            params: Query parameters
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            SpotifyError: If the request fails
+        """
+        url = AsyncSpotifyClient.API_URL + path
+        cache_key = f"{url}?{urlencode(params or {})}"
+        cached = None
+        if self.response_cache and ResponseCache.is_cacheable(url):
+            cached = self.response_cache.get(cache_key)
+        
+        token = await self._get_token()
+        refreshed = False
+        for attempt in range(SpotifyClient.MAX_THROTTLE_RETRIES + 1):
+            await spotify_rate_limiter.acquire_async()
+            headers = {'Authorization': f'Bearer {token}'}
+            if cached:
+                headers['If-None-Match'] = cached[0]
+            async with self._session.get(url, params=params, headers=headers) as response:
+                if response.status == 401 and not refreshed:
+                    token = await self._get_token(force_refresh=True)
+                    refreshed = True
+                    continue
+                if response.status == 429:
+                    spotify_rate_limiter.on_throttle(RateLimiter.parse_retry_after(response.headers.get('Retry-After')))
+                    continue
+                if response.status == 304 and cached:
+                    spotify_rate_limiter.on_success()
+                    return json.loads(cached[1])
+                if response.status != 200:
+                    raise SpotifyError(f"GET {path} failed with HTTP {response.status}")
+                spotify_rate_limiter.on_success()
+                body = await response.read()
+                etag = response.headers.get('ETag')
+                if etag and self.response_cache and ResponseCache.is_cacheable(url):
+                    self.response_cache.put(cache_key, etag, body)
+                return json.loads(body)
+        raise SpotifyError(f"GET {path} failed: too many retries")
+
+    async def _fetch_page(self, playlist_id: str, offset: int) -> Dict:
+        """Fetch one field-filtered page of playlist items starting at the given offset."""
+        # Same endpoint as spotipy's playlist_items, used by SpotifyClient
+        return await self._get(f'playlists/{playlist_id}/tracks', {
+            'fields': SpotifyClient.PAGE_FIELDS,
+            'limit': Config.SPOTIFY_PLAYLIST_PAGE_SIZE,
+            'offset': offset
+        })
+
+    async def get_playlist_snapshot(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Get the playlist name, snapshot ID and size without fetching any tracks.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+
+        Returns:
+            Dict with 'name', 'snapshot_id' and 'total' (item count) keys, or None if not found
+        """
+        try:
+            snapshot = await self._get(
+                f'playlists/{PlaylistCache.normalize_id(playlist_id)}',
+                {'fields': 'name,snapshot_id,tracks(total)'}
+            )
+        except Exception:
+            return None
+        if not snapshot or 'snapshot_id' not in snapshot:
+            return None
+        snapshot['total'] = (snapshot.pop('tracks', None) or {}).get('total')
+        return snapshot
+
+    async def get_playlist(self, playlist_id: str) -> Tuple[Optional[Dict], List[Track]]:
+        """
+        Fetch playlist metadata and all of its tracks.
+        Remaining pages after the first are fetched concurrently.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+
+        Returns:
+            Tuple of (playlist_info, tracks). playlist_info has 'name' and 'snapshot_id' keys.
+        """
+        bare_id = PlaylistCache.normalize_id(playlist_id)
+        playlist_info = await self._get(f'playlists/{bare_id}', {'fields': SpotifyClient.PLAYLIST_FIELDS})
+        if not playlist_info:
+            return None, []
+
+        first_page = playlist_info.pop('tracks', None) or {'items': [], 'total': 0}
+        playlist_info['total'] = first_page.get('total') or 0
+        offsets = range(len(first_page['items']), playlist_info['total'], Config.SPOTIFY_PLAYLIST_PAGE_SIZE)
+        pages = await asyncio.gather(*(self._fetch_page(bare_id, offset) for offset in offsets))
+
+        tracks = SpotifyClient._parse_page(first_page)
+        for page in pages:
+            tracks.extend(SpotifyClient._parse_page(page))
+        return playlist_info, tracks
+
+    async def get_playlist_tail(
+        self,
+        playlist_id: str,
+        cached_tracks: List[Track],
+        cached_total: int,
+        total: int
+    ) -> Optional[List[Track]]:
+        """
+        Fetch only the tracks appended since a cached version of the playlist.
+        Same contract as SpotifyClient.get_playlist_tail.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            cached_tracks: Track list of the cached version
+            cached_total: Number of playlist items in the cached version
+            total: Current number of playlist items
+
+        Returns:
+            Full current track list, or None if the cached prefix is no longer valid
+        """
+        if not cached_tracks or not cached_total or total <= cached_total:
+            return None
+
+        bare_id = PlaylistCache.normalize_id(playlist_id)
+        boundary_offset = cached_total - 1
+        page = await self._fetch_page(bare_id, boundary_offset)
+        items = page.get('items') or []
+        boundary = SpotifyClient._parse_track(items[0]) if items else None
+        last_cached = cached_tracks[-1]
+        if not boundary or boundary.id != last_cached.id or boundary.name != last_cached.name:
+            return None
+
+        offsets = range(boundary_offset + len(items), total, Config.SPOTIFY_PLAYLIST_PAGE_SIZE)
+        pages = await asyncio.gather(*(self._fetch_page(bare_id, offset) for offset in offsets))
+
+        tracks = list(cached_tracks)
+        tracks.extend(SpotifyClient._parse_page({'items': items[1:]}))
+        for tail_page in pages:
+            tracks.extend(SpotifyClient._parse_page(tail_page))
+        return tracks
+
+    async def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
+        """
+        Fetch all tracks from a Spotify playlist.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+
+        Returns:
+            List of Tracks with name, artists, id, url, album, cover_art
+        """
+        _, tracks = await self.get_playlist(playlist_id)
+        return tracks
+
+    async def get_playlist_info(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Get playlist name and metadata (see get_playlist_snapshot; no tracks are fetched).
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+
+        Returns:
+            Playlist info dict with 'name', 'snapshot_id' and 'total' keys, or None if not found
+        """
+        return await self.get_playlist_snapshot(playlist_id)
+
+    async def get_playlist_tracks_cached(self, playlist_id: str) -> PlaylistResult:
+        """
+        Fetch playlist tracks, reusing the local cache when the snapshot is unchanged
+        and fetching only the new tail of playlists that grew at the end.
+        Same contract as SpotifyClient.get_playlist_tracks_cached.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+
+        Returns:
+            Tuple of (tracks, playlist_info, unchanged)
+        """
+        snapshot = await self.get_playlist_snapshot(playlist_id)
+        cached = self.playlist_cache.load(playlist_id) if snapshot else None
+        if cached and cached['snapshot_id'] == snapshot['snapshot_id']:
+            snapshot['synced'] = cached.get('synced', False)
+            return cached.get('tracks', []), snapshot, True
+
+        if cached and snapshot.get('total') and settings.get('advanced', 'tail_fetch') is not False:
+            tracks = await self.get_playlist_tail(
+                playlist_id,
+                cached.get('tracks', []),
+                cached.get('total') or 0,
+                snapshot['total']
+            )
+            if tracks is not None:
+                self.playlist_cache.save(
+                    playlist_id, snapshot['snapshot_id'], snapshot.get('name'), tracks, total=snapshot['total']
+                )
+                return tracks, snapshot, False
+
+        playlist_info, tracks = await self.get_playlist(playlist_id)
+        if playlist_info and playlist_info.get('snapshot_id'):
+            self.playlist_cache.save(
+                playlist_id, playlist_info['snapshot_id'], playlist_info.get('name'), tracks,
+                total=playlist_info.get('total')
+            )
+        return tracks, playlist_info, False
+
+    async def get_many_playlists_cached(
+        self,
+        playlist_ids: List[str],
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Union[PlaylistResult, Exception]]:
+        """
+        Fetch many playlists concurrently.
+
+        Args:
+            playlist_ids: Spotify playlist IDs or URLs
+            concurrency: Maximum number of playlists in flight (defaults to the pool size)
+
+        Returns:
+            Dict mapping each playlist ID to its (tracks, playlist_info, unchanged)
+            result, or to the exception raised while fetching it
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_connections)
+
+        async def fetch(playlist_id: str):
+            async with semaphore:
+                return await self.get_playlist_tracks_cached(playlist_id)
+
+        results = await asyncio.gather(*(fetch(pid) for pid in playlist_ids), return_exceptions=True)
+        return dict(zip(playlist_ids, results))
+
+    @staticmethod
+    def fetch_playlists(playlist_ids: List[str]) -> Dict[str, Union[PlaylistResult, Exception]]:
+        """
+        Synchronous entry point: fetch many playlists concurrently on a fresh event loop.
+        At most advanced.async_max_connections playlists are in flight, over as
+        many pooled connections.
+
+        Args:
+            playlist_ids: Spotify playlist IDs or URLs
+
+        Returns:
+            Same as get_many_playlists_cached
+        """
+        async def run():
+            async with AsyncSpotifyClient() as client:
+                return await client.get_many_playlists_cached(playlist_ids)
+
+        return asyncio.run(run())
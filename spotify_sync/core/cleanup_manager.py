@@ -9,6 +9,7 @@ import glob
 from typing import Set, List, Dict, Tuple, Optional
 from spotify_sync.core.csv_manager import CSVManager
 from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.track import Track
 from spotify_sync.utils.utils import UserInput
 from spotify_sync.core.logger import Logger
 
@@ -18,7 +19,7 @@ class CleanupManager:
 
     @staticmethod
     def find_removed_songs(
-        current_tracks: List[dict],
+        current_tracks: List[Track],
         csv_filepath: str,
         download_folder: str
     ) -> Tuple[List[Dict], List[str]]:
@@ -42,10 +43,9 @@ class CleanupManager:
         
         for track in current_tracks:
             # Use track ID if available, otherwise use filename
-            if 'id' in track:
-                current_track_ids.add(track['id'])
-            filename = FileManager.get_song_filename(track)
-            current_filenames.add(filename)
+            if track.id:
+                current_track_ids.add(track.id)
+            current_filenames.add(FileManager.get_song_filename(track))
         
         # Read previous CSV data
         csv_status = CSVManager.read_csv_status(csv_filepath)
@@ -56,14 +56,7 @@ class CleanupManager:
         # Check each previously tracked song
         for song_key, status in csv_status.items():
             # Skip if song is still in playlist
-            found_in_current = False
-            for track in current_tracks:
-                current_key = FileManager.get_song_filename(track)
-                if current_key == song_key:
-                    found_in_current = True
-                    break
-            
-            if found_in_current:
+            if song_key in current_filenames:
                 continue
                 
             # Only consider songs that were previously downloaded
@@ -221,7 +214,7 @@ class CleanupManager:
 
     @staticmethod
     def cleanup_removed_songs(
-        current_tracks: List[dict],
+        current_tracks: List[Track],
         csv_filepath: str,
         download_folder: str,
         auto_action: Optional[str] = None
@@ -0,0 +1,135 @@
+"""
+Cache of album cover art shared by all downloads.
+Cover images are kept in a small in-memory LRU and on disk, keyed by image URL
+(Spotify serves one URL per album cover), so the tracks of an album fetch the
+cover once and later runs do not fetch it at all.
+"""
+
+import os
+import hashlib
+import tempfile
+import threading
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, Optional
+from spotify_sync.core.settings_manager import settings
+
+
+class CoverArtCache:
+    """In-memory LRU plus on-disk store of cover image bytes, keyed by URL."""
+
+    # Covers kept in memory (a few hundred KB each)
+    MEMORY_ENTRIES = 32
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, cache_folder: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Base cache folder (defaults to the configured cache folder)
+        """
+        base_folder = cache_folder or settings.get_cache_folder()
+        self.folder = os.path.join(base_folder, 'covers')
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    @classmethod
+    def get_instance(cls) -> 'CoverArtCache':
+        """
+        Get the process-wide cache stored in the configured cache folder.
+
+        Returns:
+            Shared CoverArtCache instance
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get_filepath(self, url: str) -> str:
+        """Get the cache file path for an image URL."""
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, digest[:2], f"{digest}.jpg")
+
+    def _remember(self, url: str, data: bytes) -> None:
+        """Put an image in the in-memory LRU, evicting the least recently used."""
+        with self._lock:
+            self._memory[url] = data
+            self._memory.move_to_end(url)
+            while len(self._memory) > CoverArtCache.MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def _read_disk(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._get_filepath(url), 'rb') as f:
+                return f.read() or None
+        except OSError:
+            return None
+
+    def _write_disk(self, url: str, data: bytes) -> None:
+        filepath = self._get_filepath(url)
+        temp_filepath = None
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            # Unique per thread and per process (retag workers share the cache folder)
+            fd, temp_filepath = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(filepath))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_filepath, filepath)
+        except OSError as e:
+            print(f"⚠ Could not cache cover art: {e}")
+            if temp_filepath and os.path.exists(temp_filepath):
+                os.remove(temp_filepath)
+
+    def get(self, url: Optional[str]) -> Optional[bytes]:
+        """
+        Get the bytes of a cover image, fetching it only if it is not cached.
+        Concurrent requests for the same image wait for a single fetch.
+
+        Args:
+            url: Cover image URL
+
+        Returns:
+            Image bytes, or None if there is no URL or it cannot be fetched
+        """
+        if not url:
+            return None
+
+        with self._lock:
+            data = self._memory.get(url)
+            if data is not None:
+                self._memory.move_to_end(url)
+                return data
+            fetch_lock = self._fetch_locks.setdefault(url, threading.Lock())
+
+        with fetch_lock:
+            # Another thread may have fetched it while this one waited
+            with self._lock:
+                data = self._memory.get(url)
+            if data is None:
+                data = self._read_disk(url)
+            if data is None:
+                data = self._fetch(url)
+                if data is not None:
+                    self._write_disk(url, data)
+            if data is not None:
+                self._remember(url, data)
+
+        with self._lock:
+            self._fetch_locks.pop(url, None)
+        return data
+
+    @staticmethod
+    def _fetch(url: str) -> Optional[bytes]:
+        """Download an image."""
+        timeout = settings.get('advanced', 'timeout_seconds') or 30
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                return response.read() or None
+        except Exception as e:
+            print(f"⚠ Could not download cover art: {e}")
+            return None
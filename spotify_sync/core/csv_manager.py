@@ -6,6 +6,8 @@ Stores download status (downloaded, missing, unable to be found).
 import os
 import csv
 from typing import Dict, List, Optional
+from spotify_sync.core.track import Track, TrackStatusTable
+from spotify_sync.core.file_manager import FileManager
 
 
 class CSVManager:
@@ -75,47 +77,55 @@ class CSVManager:
     @staticmethod
     def write_playlist_songs(
         playlist_id: str,
-        tracks: List[Dict],
+        tracks: List[Track],
         downloaded_set: set,
         is_song_downloaded_func,
         playlist_name: Optional[str] = None,
-        output_folder: Optional[str] = None
-    ) -> None:
+        output_folder: Optional[str] = None,
+        statuses: Optional[TrackStatusTable] = None
+    ) -> int:
         """
         Write playlist songs to a CSV file with their download status.
         
         Args:
             playlist_id: Spotify playlist ID
-            tracks: List of track dictionaries
+            tracks: List of tracks
             downloaded_set: Set of downloaded song filenames
             is_song_downloaded_func: Function to check if song is downloaded
             playlist_name: Playlist name (for filename)
             output_folder: Folder to save CSV (if None, saves to current directory)
+            statuses: Per-track statuses recorded during this run (e.g. unable to find)
+            
+        Returns:
+            Number of tracks with status "downloaded"
         """
         if output_folder is None:
             output_folder = "."
             
         os.makedirs(output_folder, exist_ok=True)
         filepath = CSVManager.get_csv_filepath(playlist_id, playlist_name, output_folder)
+        downloaded_count = 0
         
         with open(filepath, "w", encoding="utf-8", newline='') as f:
             writer = csv.writer(f)
             writer.writerow(["Artist", "Song Title", "Status"])
             
             for track in tracks:
-                artist = track['artists'][0] if track['artists'] else 'Unknown'
+                artist = track.artists[0] if track.artists else 'Unknown'
                 
                 # Determine status
                 if is_song_downloaded_func(track, downloaded_set):
                     status = "downloaded"
-                elif track.get('unable_to_find'):
+                    downloaded_count += 1
+                elif statuses is not None and statuses.is_unable_to_find(track):
                     status = "unable to be found"
                 else:
                     status = "missing"
                 
-                writer.writerow([artist, track['name'], status])
+                writer.writerow([artist, track.name, status])
         
         print(f"Wrote song list to {filepath}")
+        return downloaded_count
 
     @staticmethod
     def update_csv_file(csv_filepath: str, downloaded_set: set) -> int:
@@ -152,11 +162,7 @@ class CSVManager:
             current_status = row.get('Status', 'missing')
             
             # Simple matching: check if song title is in any downloaded file
-            is_downloaded = False
-            for downloaded_file in downloaded_set:
-                if song_title.lower() in downloaded_file:
-                    is_downloaded = True
-                    break
+            is_downloaded = FileManager.contains_substring(downloaded_set, song_title.lower())
             
             if is_downloaded and current_status != 'downloaded':
                 row['Status'] = 'downloaded'
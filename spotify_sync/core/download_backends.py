@@ -0,0 +1,582 @@
+"""
+Pluggable backends that do the actual searching and downloading for SpotdlDownloader.
+The subprocess backend runs the spotdl and yt-dlp command line tools for every
+call. The in-process backend drives yt-dlp and spotdl as libraries inside a pool
+of long-lived worker processes, which keep their imports, extractors, HTTP
+sessions and Spotify authentication warm between downloads, and falls back to
+the subprocess backend whenever it cannot handle a call.
+"""
+
+import os
+import sys
+import json
+import shutil
+import signal
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Set, Tuple
+from spotify_sync.core.settings_manager import settings
+from spotify_sync.core.retry_policy import (
+    RetryPolicy, TransientError, DownloadTimeoutError, DownloadCancelledError, get_download_timeout
+)
+
+
+def _kill_process_tree(pid: int) -> None:
+    """Kill a process started in its own process group, and everything it started."""
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass  # Already gone
+
+
+# Process groups run_process is waiting on, so cancel_downloads() can kill them
+_running_processes: Set[int] = set()
+_running_lock = threading.Lock()
+_cancelled = threading.Event()
+
+
+def cancel_downloads() -> None:
+    """
+    Kill every download process tree still running (and the in-process
+    download workers), e.g. on Ctrl+C. They run in process groups of their own,
+    so the terminal's interrupt does not reach them, and waiting for them would
+    hang until each one finishes. New downloads fail with DownloadCancelledError
+    until resume_downloads() is called.
+    """
+    with _running_lock:
+        _cancelled.set()
+        pids = list(_running_processes)
+    for pid in pids:
+        _kill_process_tree(pid)
+    backend = _backend
+    if isinstance(backend, InProcessBackend):
+        backend.terminate()
+
+
+def resume_downloads() -> None:
+    """Allow downloads again after cancel_downloads(), once the cancelled ones have been waited for."""
+    _cancelled.clear()
+
+
+def run_process(cmd: List[str], timeout: Optional[float] = None, **kwargs) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run, but in its own process group so that on
+    timeout the command and its children (e.g. ffmpeg under yt-dlp) are all killed.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds before the process tree is killed (None waits forever)
+        **kwargs: Passed to subprocess.Popen (stdout, stderr, text, ...)
+
+    Returns:
+        CompletedProcess with the exit status and captured output
+
+    Raises:
+        DownloadTimeoutError: If the command ran past the timeout
+        DownloadCancelledError: If downloads were cancelled before or while it ran
+    """
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+
+    name = os.path.basename(cmd[0])
+    if _cancelled.is_set():
+        raise DownloadCancelledError(f"{name} not started, downloads were cancelled")
+    with subprocess.Popen(cmd, **kwargs) as process:
+        with _running_lock:
+            _running_processes.add(process.pid)
+            cancelled = _cancelled.is_set()
+        try:
+            if cancelled:
+                _kill_process_tree(process.pid)
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_tree(process.pid)
+            process.communicate()
+            raise DownloadTimeoutError(f"{name} timed out after {timeout:.0f}s")
+        except BaseException:
+            # The group does not get the terminal's Ctrl+C, so do not leave it running
+            _kill_process_tree(process.pid)
+            raise
+        finally:
+            with _running_lock:
+                _running_processes.discard(process.pid)
+    if _cancelled.is_set():
+        raise DownloadCancelledError(f"{name} was stopped, downloads were cancelled")
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+# spotdl output that means a song has no match (as opposed to a failed search)
+NO_MATCH_PATTERNS = ('no results found', 'could not find a match')
+
+
+def _reports_no_match(output: Optional[str]) -> bool:
+    """Check whether spotdl's output says a song has no match."""
+    text = (output or '').lower()
+    return any(pattern in text for pattern in NO_MATCH_PATTERNS)
+
+
+def _last_line(output: Optional[str]) -> str:
+    """Get the last non-empty line of a command's output (usually the error)."""
+    lines = [line.strip() for line in (output or '').splitlines() if line.strip()]
+    return lines[-1] if lines else "unknown error"
+
+
+class SubprocessBackend:
+    """Runs the spotdl and yt-dlp command line tools for every call."""
+
+    name = 'subprocess'
+
+    @staticmethod
+    def find_spotdl() -> str:
+        """
+        Find spotdl executable in PATH or virtualenv.
+
+        Returns:
+            Path to spotdl executable
+
+        Raises:
+            RuntimeError: If spotdl is not found
+        """
+        spotdl_path = shutil.which('spotdl')
+        if spotdl_path:
+            return spotdl_path
+
+        venv_spotdl = os.path.join(os.path.dirname(sys.executable), 'spotdl')
+        if os.path.exists(venv_spotdl):
+            return venv_spotdl
+
+        raise RuntimeError("spotdl not found. Please install spotdl in your environment.")
+
+    def find_youtube_url(self, track_url: str, dont_filter: bool = False) -> Optional[str]:
+        """
+        Find the YouTube URL spotdl would download a track from (spotdl url).
+
+        Args:
+            track_url: Spotify track URL
+            dont_filter: Whether to disable result filtering
+
+        Returns:
+            YouTube URL, or None if spotdl found no match
+
+        Raises:
+            TransientError: If the search failed in a way worth retrying
+            RuntimeError: If the search failed without saying whether there is a match
+        """
+        cmd = [SubprocessBackend.find_spotdl(), 'url', track_url]
+        if dont_filter:
+            cmd.append('--dont-filter-results')
+
+        result = run_process(cmd, get_download_timeout(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            if RetryPolicy.is_transient(result.stderr):
+                raise TransientError(_last_line(result.stderr))
+            raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        # spotdl logs to stdout as well, so pick out the URL it printed
+        urls = [line.strip() for line in result.stdout.splitlines() if line.strip().startswith('http')]
+        if urls:
+            return urls[-1]
+        # spotdl url exits successfully even when the search itself failed
+        output = f"{result.stdout}\n{result.stderr}"
+        if _reports_no_match(output):
+            return None
+        if RetryPolicy.is_transient(output):
+            raise TransientError(_last_line(output))
+        raise RuntimeError(f"spotdl url failed: {_last_line(output)}")
+
+    def download_audio(self, youtube_url: str, output_template: str, convert: bool = True) -> bool:
+        """
+        Download the audio of a YouTube video as MP3 with yt-dlp.
+
+        Args:
+            youtube_url: YouTube URL to download from
+            output_template: yt-dlp output template (folder and file name)
+            convert: Convert to MP3; if False the best audio stream is saved as is
+
+        Returns:
+            True if yt-dlp succeeded
+
+        Raises:
+            TransientError: If the download failed in a way worth retrying
+        """
+        cmd = [
+            'yt-dlp',
+            '-q',  # Quiet mode
+            '--no-warnings',  # No warnings
+            '--socket-timeout', str(settings.get('advanced', 'timeout_seconds') or 30),
+            '-o', output_template,
+            youtube_url
+        ]
+        if convert:
+            cmd[3:3] = [
+                '-x',  # Extract audio only
+                '--audio-format', 'mp3',
+                '--audio-quality', '192'
+            ]
+        else:
+            cmd[3:3] = ['-f', 'bestaudio/best']
+        result = run_process(cmd, get_download_timeout(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            if RetryPolicy.is_transient(result.stderr):
+                raise TransientError(_last_line(result.stderr))
+            print(f"✗ Failed to download from YouTube: {result.stderr}")
+            return False
+        return True
+
+    def download_spotify(
+        self,
+        track_urls: List[str],
+        output_folder: str,
+        dont_filter: bool = False,
+        quiet: bool = False,
+        resolved: Optional[Dict[str, str]] = None,
+        not_found: Optional[Set[str]] = None
+    ) -> bool:
+        """
+        Download Spotify tracks with spotdl.
+
+        Args:
+            track_urls: Spotify track URLs to download in one run; a
+                "youtube_url|spotify_url" entry downloads that video without searching
+            output_folder: Folder to save the downloads
+            dont_filter: Whether to disable result filtering
+            quiet: Suppress spotdl's console output
+            resolved: Filled with Spotify track ID -> YouTube URL of the downloaded songs
+            not_found: Filled with the track URLs spotdl reported no match for (only
+                known for quiet single-track runs, whose output is captured)
+
+        Returns:
+            True if spotdl exited successfully (it may still skip songs it cannot find)
+
+        Raises:
+            TransientError: If spotdl timed out, or (quiet runs, whose output is
+                captured) failed in a way worth retrying
+        """
+        cmd = [SubprocessBackend.find_spotdl(), *track_urls, '--output', output_folder]
+        if dont_filter:
+            cmd.append('--dont-filter-results')
+
+        save_file = None
+        if resolved is not None:
+            # spotdl writes the songs it handled, including the video each was downloaded from
+            fd, save_file = tempfile.mkstemp(suffix='.spotdl')
+            os.close(fd)
+            cmd.extend(['--save-file', save_file])
+
+        try:
+            timeout = get_download_timeout(len(track_urls))
+            if quiet:
+                result = run_process(cmd, timeout, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace')
+                if result.returncode != 0 and RetryPolicy.is_transient(result.stdout):
+                    raise TransientError(_last_line(result.stdout))
+                if not_found is not None and len(track_urls) == 1 and _reports_no_match(result.stdout):
+                    not_found.add(track_urls[0])
+            else:
+                result = run_process(cmd, timeout)
+
+            if save_file:
+                try:
+                    with open(save_file, 'r', encoding='utf-8') as f:
+                        songs = json.load(f)
+                    for song in songs:
+                        if song.get('song_id') and song.get('download_url'):
+                            resolved[song['song_id']] = song['download_url']
+                except (OSError, ValueError, AttributeError):
+                    pass  # Older spotdl versions do not write the file
+        finally:
+            if save_file and os.path.exists(save_file):
+                os.remove(save_file)
+        return result.returncode == 0
+
+    def close(self) -> None:
+        """Release backend resources (nothing to release)."""
+
+
+# State of an in-process worker, kept for the life of the worker process
+_worker_credentials: Dict[str, str] = {}
+_worker_youtube_dls: Dict[str, object] = {}
+_worker_spotdl = None
+
+# Output templates a worker keeps a warm YoutubeDL instance for
+_MAX_YOUTUBE_DLS = 8
+
+
+def _init_worker(credentials: Dict[str, str]) -> None:
+    """Import the download libraries once when a worker process starts."""
+    _worker_credentials.update(credentials)
+    if os.name != 'nt':
+        # Lead a process group, so a timed out worker is killed together with its ffmpeg children
+        os.setsid()
+    import yt_dlp  # noqa: F401 - fails the worker early if yt-dlp is missing
+
+
+def _get_youtube_dl(output_template: str, convert: bool = True):
+    """Get a reusable YoutubeDL instance for an output template."""
+    key = f"{output_template}|{convert}"
+    youtube_dl = _worker_youtube_dls.get(key)
+    if youtube_dl is None:
+        import yt_dlp
+        if len(_worker_youtube_dls) >= _MAX_YOUTUBE_DLS:
+            _worker_youtube_dls.pop(next(iter(_worker_youtube_dls))).close()
+        options = {
+            'format': 'bestaudio/best',
+            'outtmpl': output_template,
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+            'socket_timeout': settings.get('advanced', 'timeout_seconds') or 30
+        }
+        if convert:
+            options['postprocessors'] = [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '192'
+            }]
+        youtube_dl = yt_dlp.YoutubeDL(options)
+        _worker_youtube_dls[key] = youtube_dl
+    return youtube_dl
+
+
+def _get_spotdl(dont_filter: bool):
+    """Get the worker's Spotdl instance (spotdl allows one Spotify client per process)."""
+    global _worker_spotdl
+    if _worker_spotdl is None:
+        from spotdl import Spotdl
+        _worker_spotdl = Spotdl(
+            client_id=_worker_credentials.get('client_id'),
+            client_secret=_worker_credentials.get('client_secret'),
+            headless=True,
+            downloader_settings={'simple_tui': True, 'log_level': 'CRITICAL'}
+        )
+    for provider in _worker_spotdl.downloader.audio_providers:
+        provider.filter_results = not dont_filter
+    return _worker_spotdl
+
+
+def _worker_download_audio(youtube_url: str, output_template: str, convert: bool) -> bool:
+    from yt_dlp.utils import DownloadError
+    try:
+        return _get_youtube_dl(output_template, convert).download([youtube_url]) == 0
+    except DownloadError as e:
+        if RetryPolicy.is_transient(str(e)):
+            raise TransientError(str(e))
+        print(f"✗ Failed to download from YouTube: {e}")
+        return False
+
+
+def _worker_find_youtube_url(track_url: str, dont_filter: bool) -> Optional[str]:
+    spotdl = _get_spotdl(dont_filter)
+    songs = spotdl.search([track_url])
+    if not songs:
+        raise RuntimeError(f"spotdl could not load {track_url}")
+    try:
+        # Unlike get_download_urls, tells a missing match (LookupError) from a failed search
+        return spotdl.downloader.search(songs[0]) or None
+    except LookupError:
+        return None
+    except Exception as e:
+        if RetryPolicy.is_transient(str(e)):
+            raise TransientError(str(e))
+        raise
+
+
+def _worker_download_spotify(
+    track_urls: List[str],
+    output_folder: str,
+    dont_filter: bool
+) -> Tuple[bool, Dict[str, str], List[str]]:
+    spotdl = _get_spotdl(dont_filter)
+    spotdl.downloader.settings['output'] = os.path.join(output_folder, '{artists} - {title}.{output-ext}')
+    errors = getattr(spotdl.downloader, 'errors', [])
+    known_errors = len(errors)
+    results = spotdl.download_songs(spotdl.search(track_urls))
+    resolved = {
+        song.song_id: song.download_url
+        for song, path in results
+        if path is not None and getattr(song, 'download_url', None)
+    }
+    # spotdl records failures as "<song url> - <exception>: <message>"
+    not_found = [
+        song.url for song, path in results
+        if path is None and any(
+            error.startswith(f"{song.url} - LookupError") for error in errors[known_errors:]
+        )
+    ]
+    return all(path is not None for _, path in results), resolved, not_found
+
+
+class InProcessBackend:
+    """Runs yt-dlp and spotdl as libraries in a pool of long-lived worker processes."""
+
+    name = 'in-process'
+
+    def __init__(self, workers: int = 1, fallback: Optional[SubprocessBackend] = None):
+        """
+        Initialize the backend (worker processes start on first use).
+
+        Args:
+            workers: Number of worker processes
+            fallback: Backend used for calls the worker pool cannot handle
+        """
+        self.workers = max(1, workers)
+        self.fallback = fallback or SubprocessBackend()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether yt-dlp and spotdl can be imported."""
+        import importlib.util
+        return all(importlib.util.find_spec(module) is not None for module in ('yt_dlp', 'spotdl'))
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._broken:
+                return None
+            if self._executor is None:
+                # Spawned, not forked: the parent runs threads (download pool, page fetches)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=({
+                        'client_id': settings.get('spotify', 'client_id'),
+                        'client_secret': settings.get('spotify', 'client_secret')
+                    },)
+                )
+            return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool's worker processes (and their children); the next call starts a new pool."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            _kill_process_tree(process.pid)
+        executor.shutdown(wait=False)
+
+    def _call(self, function, *args, jobs: int = 1):
+        """
+        Run a worker function, raising if the worker pool cannot be used.
+        A missing library or a crashed pool disables the pool for the rest of the run.
+        A call that runs past its time limit restarts the pool; calls that were
+        running in the killed workers fail as transient errors.
+        """
+        if _cancelled.is_set():
+            raise DownloadCancelledError("in-process download not started, downloads were cancelled")
+        executor = self._get_executor()
+        if executor is None:
+            raise RuntimeError("in-process downloader disabled")
+        timeout = get_download_timeout(jobs)
+        try:
+            return executor.submit(function, *args).result(timeout=timeout)
+        except FutureTimeoutError:
+            self._restart(executor)
+            raise DownloadTimeoutError(f"in-process download timed out after {timeout:.0f}s")
+        except BrokenProcessPool as e:
+            if _cancelled.is_set():
+                raise DownloadCancelledError("in-process download was stopped, downloads were cancelled")
+            with self._lock:
+                restarted = self._executor is not executor
+                if not restarted:
+                    self._broken = True
+            if restarted:
+                raise TransientError("download worker restarted after a timeout")
+            print(f"⚠ In-process downloader unavailable, using command line tools: {e}")
+            raise
+        except ImportError as e:
+            print(f"⚠ In-process downloader unavailable, using command line tools: {e}")
+            with self._lock:
+                self._broken = True
+            raise
+
+    def find_youtube_url(self, track_url: str, dont_filter: bool = False) -> Optional[str]:
+        """Find the YouTube URL spotdl would download a track from (see SubprocessBackend)."""
+        try:
+            return self._call(_worker_find_youtube_url, track_url, dont_filter)
+        except (TransientError, DownloadCancelledError):
+            raise
+        except Exception:
+            return self.fallback.find_youtube_url(track_url, dont_filter)
+
+    def download_audio(self, youtube_url: str, output_template: str, convert: bool = True) -> bool:
+        """Download the audio of a YouTube video, as MP3 unless convert is False (see SubprocessBackend)."""
+        try:
+            return self._call(_worker_download_audio, youtube_url, output_template, convert)
+        except (TransientError, DownloadCancelledError):
+            raise
+        except Exception:
+            return self.fallback.download_audio(youtube_url, output_template, convert)
+
+    def download_spotify(
+        self,
+        track_urls: List[str],
+        output_folder: str,
+        dont_filter: bool = False,
+        quiet: bool = False,
+        resolved: Optional[Dict[str, str]] = None,
+        not_found: Optional[Set[str]] = None
+    ) -> bool:
+        """Download Spotify tracks (see SubprocessBackend); spotdl output is always quiet."""
+        try:
+            success, worker_resolved, worker_not_found = self._call(
+                _worker_download_spotify, track_urls, output_folder, dont_filter, jobs=len(track_urls)
+            )
+        except (TransientError, DownloadCancelledError):
+            raise
+        except Exception:
+            return self.fallback.download_spotify(track_urls, output_folder, dont_filter, quiet, resolved, not_found)
+        if resolved is not None:
+            resolved.update(worker_resolved)
+        if not_found is not None:
+            not_found.update(worker_not_found)
+        return success
+
+    def terminate(self) -> None:
+        """Kill the worker processes (and their children) without waiting for running calls."""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            self._restart(executor)
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_download_backend():
+    """
+    Get the process-wide download backend selected by advanced.download_backend:
+    'subprocess' (the default), 'in-process', or 'auto' (in-process when yt-dlp
+    and spotdl are importable, otherwise subprocess).
+
+    Returns:
+        SubprocessBackend or InProcessBackend instance
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            choice = settings.get('advanced', 'download_backend') or 'subprocess'
+            use_in_process = choice == 'in-process' or (choice == 'auto' and InProcessBackend.is_available())
+            if use_in_process:
+                from spotify_sync.core.download_pool import DownloadPool
+                _backend = InProcessBackend(workers=DownloadPool.get_worker_count())
+            else:
+                _backend = SubprocessBackend()
+        return _backend
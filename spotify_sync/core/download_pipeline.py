@@ -0,0 +1,399 @@
+"""
+Staged download pipeline.
+Splits downloading a song into four stages that run concurrently, each on its
+own threads and connected by bounded queues: resolve (find the YouTube video,
+or link the song from the track store), download (fetch the audio stream),
+tag (transcode to MP3 and write Spotify metadata) and verify (check the MP3
+and move it into its playlist folder). Network and CPU work of different songs
+overlap, and per-stage timings show which stage holds the pipeline back.
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from spotify_sync.utils.utils import FilenameSanitizer
+from spotify_sync.core.track import Track
+from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.track_store import TrackStore
+from spotify_sync.core.download_pool import DownloadPool
+from spotify_sync.core.download_backends import get_download_backend, run_process, cancel_downloads, resume_downloads
+from spotify_sync.core.downloader import SpotdlDownloader
+from spotify_sync.core.resolution_cache import ResolutionCache
+from spotify_sync.core.cover_art_cache import CoverArtCache
+from spotify_sync.core.track_tags import TrackTagger
+from spotify_sync.core.retry_policy import get_download_timeout
+from spotify_sync.core.settings_manager import settings
+
+_END = object()
+
+
+class PipelineResult(NamedTuple):
+    """Outcome of one song that went through the pipeline."""
+    track: Track
+    folder: str
+    downloaded: bool
+    linked: bool
+    error: Optional[str]
+
+
+class _PipelineItem:
+    """A song moving through the pipeline; each stage fills in what it produced."""
+
+    __slots__ = (
+        'track', 'folder', 'youtube_url', 'job_folder', 'filepath', 'linked', 'error', 'failed_stage', 'retryable'
+    )
+
+    def __init__(self, track: Track, folder: str):
+        self.track = track
+        self.folder = folder
+        self.youtube_url: Optional[str] = None
+        self.job_folder: Optional[str] = None
+        self.filepath: Optional[str] = None
+        self.linked = False
+        self.error: Optional[str] = None
+        # Stage that failed the song, and whether it failed for a reason that may pass
+        # (an exception, e.g. retries exhausted) rather than a verdict on the video
+        self.failed_stage: Optional[str] = None
+        self.retryable = False
+
+
+class PipelineMetrics:
+    """Thread-safe per-stage counters, accumulated over every pipeline in this process."""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, workers: int, **values: float) -> None:
+        """
+        Add to the counters of a stage.
+
+        Args:
+            stage: Stage name
+            workers: Number of workers the stage runs
+            **values: Amounts to add ('songs', 'failed', 'busy', 'starved', 'blocked')
+        """
+        with self._lock:
+            counters = self._stages.setdefault(stage, {
+                'workers': workers, 'songs': 0, 'failed': 0, 'busy': 0.0, 'starved': 0.0, 'blocked': 0.0
+            })
+            counters['workers'] = max(counters['workers'], workers)
+            for key, value in values.items():
+                counters[key] += value
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the counters of every stage, in pipeline order.
+        'busy' is time spent working, 'starved' waiting for input and 'blocked'
+        waiting for room in the next stage's queue (all in worker-seconds);
+        'utilization' is the share of worker time spent busy.
+
+        Returns:
+            Dict mapping stage name to its counters
+        """
+        with self._lock:
+            stats = {}
+            for stage, counters in self._stages.items():
+                total = counters['busy'] + counters['starved'] + counters['blocked']
+                stats[stage] = dict(counters, utilization=round(counters['busy'] / total, 2) if total else 0.0)
+                for key in ('busy', 'starved', 'blocked'):
+                    stats[stage][key] = round(stats[stage][key], 2)
+            return stats
+
+    def get_bottleneck(self) -> Optional[str]:
+        """
+        Get the stage whose workers were busy the largest share of the time.
+
+        Returns:
+            Stage name, or None if nothing went through a pipeline yet
+        """
+        stats = self.get_stats()
+        if not stats:
+            return None
+        return max(stats, key=lambda stage: stats[stage]['utilization'])
+
+
+class DownloadPipeline:
+    """Resolve, download, tag and verify stages connected by bounded queues."""
+
+    # Hidden folder inside the download folder (shared with DownloadPool), so listings skip it
+    WORK_FOLDER_NAME = DownloadPool.WORK_FOLDER_NAME
+
+    # Songs waiting between two stages; keeps memory and half-finished work bounded
+    QUEUE_SIZE = 8
+
+    # Concurrent searches (mostly waiting on YouTube and Spotify)
+    RESOLVE_WORKERS = 4
+
+    # Files checked at a time (cheap, local)
+    VERIFY_WORKERS = 1
+
+    def __init__(self, download_folder: str, store: Optional[TrackStore] = None, dont_filter: bool = False):
+        """
+        Initialize the pipeline (needs ffmpeg on the PATH, see is_enabled).
+        Downloads run on advanced.parallel_downloads workers and tagging on one
+        worker per CPU.
+
+        Args:
+            download_folder: Base download folder (work files go in its .downloading subfolder)
+            store: Shared track store; songs already in it are linked instead of downloaded
+            dont_filter: Disable spotdl result filtering when searching
+        """
+        self.store = store
+        self.dont_filter = dont_filter
+        self.ffmpeg = shutil.which('ffmpeg') or 'ffmpeg'
+        work_root = os.path.join(download_folder, DownloadPipeline.WORK_FOLDER_NAME)
+        os.makedirs(work_root, exist_ok=True)
+        self.work_folder = tempfile.mkdtemp(prefix='pipeline-', dir=work_root)
+
+        self.stages: List[Tuple[str, int, Callable[[_PipelineItem], None]]] = [
+            ('resolve', DownloadPipeline.RESOLVE_WORKERS, self._resolve),
+            ('download', DownloadPool.get_worker_count(), self._download),
+            ('tag', os.cpu_count() or 1, self._tag),
+            ('verify', DownloadPipeline.VERIFY_WORKERS, self._verify)
+        ]
+        self._stop = threading.Event()
+        self._on_download: Optional[Callable[[Track, str], None]] = None
+
+    _warned_no_ffmpeg = False
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        Check whether advanced.download_pipeline is enabled and can be used.
+        The tag stage transcodes with ffmpeg (and yt-dlp could not convert to MP3
+        without it either), so without ffmpeg on the PATH songs are downloaded
+        with spotdl instead.
+        """
+        if not settings.get('advanced', 'download_pipeline'):
+            return False
+        if shutil.which('ffmpeg'):
+            return True
+        if not DownloadPipeline._warned_no_ffmpeg:
+            DownloadPipeline._warned_no_ffmpeg = True
+            print("⚠ Download pipeline needs ffmpeg on the PATH, downloading with spotdl instead")
+        return False
+
+    def _resolve(self, item: _PipelineItem) -> None:
+        """Link the song from the track store, or find the YouTube video to download."""
+        if self.store and self.store.link_track(item.track, item.folder):
+            item.linked = True
+            return
+        item.youtube_url = SpotdlDownloader.get_youtube_url(item.track, dont_filter=self.dont_filter)
+        if not item.youtube_url:
+            item.error = "no match found"
+
+    def _download(self, item: _PipelineItem) -> None:
+        """Fetch the audio stream into a folder of its own."""
+        if self._on_download:
+            self._on_download(item.track, item.folder)
+        item.job_folder = tempfile.mkdtemp(prefix='job-', dir=self.work_folder)
+        template = os.path.join(item.job_folder, 'source.%(ext)s')
+        downloaded = SpotdlDownloader.download_with_retries(
+            lambda: get_download_backend().download_audio(item.youtube_url, template, convert=False),
+            item.job_folder,
+            f"Download of {item.track.name}"
+        )
+        files = [name for name in os.listdir(item.job_folder) if not name.endswith(('.part', '.ytdl'))]
+        if not downloaded or not files:
+            item.error = "download failed"
+            return
+        item.filepath = os.path.join(item.job_folder, files[0])
+
+    def _tag(self, item: _PipelineItem) -> None:
+        """Transcode the audio to MP3 and write the Spotify metadata."""
+        safe_title = FilenameSanitizer.sanitize(item.track.name or 'Unknown')
+        target = os.path.join(item.job_folder, f"{item.track.artist_string} - {safe_title}.mp3")
+        cmd = [
+            self.ffmpeg, '-nostdin', '-loglevel', 'error', '-y',
+            '-i', item.filepath,
+            '-vn',  # Drop video and embedded images
+            '-codec:a', 'libmp3lame', '-b:a', '192k',
+            target
+        ]
+        result = run_process(cmd, get_download_timeout(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            item.error = f"transcoding failed: {result.stderr.strip()}"
+            return
+        os.remove(item.filepath)
+        item.filepath = target
+
+        # Cover art is cached, so an album's tracks share one fetch
+        cover_data = CoverArtCache.get_instance().get(item.track.cover_art_url)
+        if not TrackTagger.write(item.filepath, item.track, cover_data):
+            item.error = "could not write tags"
+
+    def _verify(self, item: _PipelineItem) -> None:
+        """Check that the MP3 decodes to some audio, then move it into its playlist folder."""
+        try:
+            from mutagen.mp3 import MP3
+            length = MP3(item.filepath).info.length
+        except Exception as e:
+            item.error = f"not a valid MP3: {e}"
+            return
+        if not length:
+            item.error = "MP3 has no audio"
+            return
+
+        final_filepath = os.path.join(item.folder, os.path.basename(item.filepath))
+        shutil.move(item.filepath, final_filepath)
+        item.filepath = final_filepath
+        FileManager.record_track_id(final_filepath, item.track.id, write_tag=False)
+        if self.store:
+            self.store.adopt(final_filepath, item.track.id)
+
+    def _finish(self, item: _PipelineItem, results: 'queue.Queue') -> None:
+        """Hand a song that is done (or failed) to the consumer and clean up after it."""
+        if item.job_folder:
+            shutil.rmtree(item.job_folder, ignore_errors=True)
+        if item.failed_stage == 'download' and not item.retryable:
+            # A video that cannot be downloaded is searched again next time; local
+            # failures (transcoding, tagging) and cancelled songs keep their resolution
+            cache = ResolutionCache.get_instance()
+            if cache:
+                cache.invalidate(item.track.id)
+        results.put(PipelineResult(item.track, item.folder, item.error is None, item.linked, item.error))
+
+    def _run_stage(
+        self,
+        name: str,
+        workers: int,
+        process: Callable[[_PipelineItem], None],
+        inbox: 'queue.Queue',
+        outbox: Optional['queue.Queue'],
+        results: 'queue.Queue',
+        remaining: List[int],
+        lock: threading.Lock
+    ) -> None:
+        """Worker loop of a stage: take songs from inbox, process them, pass them on."""
+        while True:
+            started = time.monotonic()
+            item = inbox.get()
+            taken = time.monotonic()
+            pipeline_metrics.add(name, workers, starved=taken - started)
+            if item is _END:
+                break
+
+            if not self._stop.is_set():
+                try:
+                    process(item)
+                except Exception as e:
+                    item.error = str(e) or type(e).__name__
+                    item.retryable = True
+                if item.error:
+                    item.failed_stage = name
+            else:
+                item.error = "cancelled"
+            done = time.monotonic()
+            pipeline_metrics.add(name, workers, songs=1, failed=1 if item.error else 0, busy=done - taken)
+
+            if item.error or item.linked or outbox is None:
+                self._finish(item, results)
+            else:
+                outbox.put(item)
+                pipeline_metrics.add(name, workers, blocked=time.monotonic() - done)
+
+        # The last worker of a stage to stop tells the next stage there is nothing more
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            if outbox is None:
+                results.put(_END)
+            else:
+                for _ in range(self._next_workers(name)):
+                    outbox.put(_END)
+
+    def _next_workers(self, name: str) -> int:
+        names = [stage[0] for stage in self.stages]
+        return self.stages[names.index(name) + 1][1]
+
+    def run(
+        self,
+        jobs: Iterable[Tuple[Track, str]],
+        on_download: Optional[Callable[[Track, str], None]] = None
+    ) -> Iterator[PipelineResult]:
+        """
+        Download songs through the pipeline.
+
+        Args:
+            jobs: (track, playlist_download_folder) pairs to download
+            on_download: Called with (track, folder) by the download stage when it
+                starts on a song (songs linked from the track store never get there)
+
+        Yields:
+            PipelineResult for each job, in the order the songs finish
+        """
+        self._on_download = on_download
+        inboxes = [queue.Queue(maxsize=DownloadPipeline.QUEUE_SIZE) for _ in self.stages]
+        results = queue.Queue()
+        threads = []
+        for index, (name, workers, process) in enumerate(self.stages):
+            outbox = inboxes[index + 1] if index + 1 < len(self.stages) else None
+            remaining = [workers]
+            lock = threading.Lock()
+            for number in range(workers):
+                thread = threading.Thread(
+                    target=self._run_stage,
+                    args=(name, workers, process, inboxes[index], outbox, results, remaining, lock),
+                    name=f"pipeline-{name}-{number}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        def feed() -> None:
+            for track, folder in jobs:
+                if self._stop.is_set():
+                    break
+                inboxes[0].put(_PipelineItem(track, folder))
+            for _ in range(self.stages[0][1]):
+                inboxes[0].put(_END)
+
+        feeder = threading.Thread(target=feed, name="pipeline-feed", daemon=True)
+        feeder.start()
+        threads.append(feeder)
+
+        finished = False
+        try:
+            while True:
+                result = results.get()
+                if result is _END:
+                    finished = True
+                    break
+                yield result
+        finally:
+            # Consumer stopped early (e.g. Ctrl+C): let the stages drain without doing
+            # more work, and kill running downloads instead of waiting for them
+            self._stop.set()
+            if not finished:
+                cancel_downloads()
+            try:
+                for thread in threads:
+                    thread.join()
+            finally:
+                if not finished:
+                    resume_downloads()
+
+    def close(self) -> None:
+        """Remove the pipeline's work folder."""
+        shutil.rmtree(self.work_folder, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(self.work_folder))
+        except OSError:
+            pass  # Still used by another run
+
+    def __enter__(self) -> 'DownloadPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+# Stage counters shared by every pipeline in this process
+pipeline_metrics = PipelineMetrics()
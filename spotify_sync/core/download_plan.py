@@ -0,0 +1,150 @@
+"""
+Global download plan across playlists.
+Collects the missing tracks of every playlist before anything is downloaded,
+so a track missing from several playlists is downloaded once and then
+distributed to the other playlist folders.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_store import TrackStore
+from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.csv_manager import CSVManager
+from spotify_sync.core.settings_manager import Config
+
+
+class PlannedDownload:
+    """A unique missing track and every playlist folder that needs it."""
+
+    __slots__ = ('track', 'folders')
+
+    def __init__(self, track: Track):
+        self.track = track
+        self.folders: List[str] = []
+
+
+class DownloadPlan:
+    """Deduplicated set of missing tracks, in first-seen order."""
+
+    def __init__(self):
+        self._planned: Dict[str, PlannedDownload] = {}
+        self.occurrences = 0
+
+    def __len__(self) -> int:
+        return len(self._planned)
+
+    @property
+    def downloads(self) -> List[PlannedDownload]:
+        """Planned downloads in the order the tracks were first seen."""
+        return list(self._planned.values())
+
+    @property
+    def saved(self) -> int:
+        """Number of downloads avoided by deduplication."""
+        return self.occurrences - len(self._planned)
+
+    def add(self, track: Track, folder: str) -> None:
+        """
+        Record that a playlist folder is missing a track.
+
+        Args:
+            track: Missing track
+            folder: Playlist folder that should contain it
+        """
+        planned = self._planned.get(track.key)
+        if planned is None:
+            planned = PlannedDownload(track)
+            self._planned[track.key] = planned
+        if folder not in planned.folders:
+            planned.folders.append(folder)
+            self.occurrences += 1
+
+    @staticmethod
+    def build(
+        playlists: List[Tuple[str, List[Track], Optional[Dict]]],
+        download_folder: str
+    ) -> 'DownloadPlan':
+        """
+        Find the missing tracks of every playlist, using the same rules as a
+        per-playlist check (tracks previously marked unable to find are left out).
+
+        Args:
+            playlists: List of (playlist_id, tracks, playlist_info) tuples
+            download_folder: Base folder for downloads
+
+        Returns:
+            DownloadPlan covering all playlists
+        """
+        plan = DownloadPlan()
+        for playlist_id, tracks, playlist_info in playlists:
+            playlist_name = playlist_info.get('name') if playlist_info else None
+            folder = os.path.join(download_folder, FileManager.get_playlist_folder_name(playlist_id, playlist_name))
+            FileManager.create_folder(folder)
+
+            downloaded = FileManager.get_downloaded_songs(folder)
+            csv_status_map = CSVManager.read_csv_status(CSVManager.get_csv_filepath(playlist_id, playlist_name))
+            playlist_ids = frozenset(track.id for track in tracks if track.id)
+            for track in tracks:
+                if FileManager.is_song_downloaded(track, downloaded, playlist_ids):
+                    continue
+                if csv_status_map.get(track.csv_key) == Config.CSV_STATUS_UNABLE_TO_FIND:
+                    continue
+                plan.add(track, folder)
+        return plan
+
+    @staticmethod
+    def find_downloaded_file(folder: str, track: Track) -> Optional[str]:
+        """
+        Locate the file a track was downloaded to.
+
+        Args:
+            folder: Folder the track was downloaded into
+            track: Downloaded track
+
+        Returns:
+            Path of the file, or None if it cannot be identified
+        """
+        if track.id:
+            for name, track_id in FileManager.get_track_ids(folder).items():
+                if track_id == track.id:
+                    return os.path.join(folder, name)
+
+        names = (track.filename_key, track.all_artists_key)
+        for name in FileManager.list_folder(folder):
+            if FileManager.normalize_filename(name) in names:
+                return os.path.join(folder, name)
+        return None
+
+    @staticmethod
+    def distribute(planned: PlannedDownload, store: Optional[TrackStore] = None) -> int:
+        """
+        Copy a track downloaded into its first folder to all other folders that need it.
+        Uses the shared store when given, otherwise links (or copies) the downloaded file.
+
+        Args:
+            planned: Planned download whose first folder now has the track
+            store: Shared track store the download was added to
+
+        Returns:
+            Number of other folders that received the track
+        """
+        other_folders = planned.folders[1:]
+        if not other_folders:
+            return 0
+
+        if store and store.has(planned.track.id):
+            return sum(1 for folder in other_folders if store.link_track(planned.track, folder))
+
+        source = DownloadPlan.find_downloaded_file(planned.folders[0], planned.track)
+        if not source:
+            return 0
+
+        distributed = 0
+        for folder in other_folders:
+            try:
+                TrackStore.link_file(source, os.path.join(folder, os.path.basename(source)))
+                distributed += 1
+            except OSError as e:
+                print(f"⚠ Could not copy {planned.track.name} to {folder}: {e}")
+        return distributed
@@ -0,0 +1,145 @@
+"""
+Bounded pool of download workers.
+Runs downloads concurrently in background threads while results are handed
+back in submission order, so progress and stats are reported as if the
+downloads ran one after another. Each worker downloads into its own temporary
+folder, so listing a folder before and after a download still finds exactly
+the files that download produced, and half-written files never show up in
+playlist folders.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from spotify_sync.core.download_backends import cancel_downloads, resume_downloads
+from spotify_sync.core.settings_manager import settings
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_NO_JOB = object()
+
+
+class DownloadPool:
+    """Runs download jobs on a fixed number of workers, each with a private work folder."""
+
+    # Hidden, so folder listings and the library index skip it
+    WORK_FOLDER_NAME = '.downloading'
+
+    # Worker count used when advanced.parallel_downloads is simply true
+    DEFAULT_WORKERS = 4
+
+    def __init__(self, download_folder: str, workers: Optional[int] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            download_folder: Base download folder (work folders are created in its
+                .downloading subfolder, on the same filesystem as the playlist folders)
+            workers: Number of concurrent downloads (defaults to get_worker_count())
+        """
+        self.workers = max(1, workers if workers is not None else DownloadPool.get_worker_count())
+        self.work_root = os.path.join(download_folder, DownloadPool.WORK_FOLDER_NAME)
+        self._local = threading.local()
+        self._work_folders: List[str] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    @staticmethod
+    def get_worker_count() -> int:
+        """
+        Get the number of concurrent downloads from advanced.parallel_downloads.
+        The setting may be false (one at a time), true (DEFAULT_WORKERS) or a worker count.
+
+        Returns:
+            Number of download workers (at least 1)
+        """
+        value = settings.get('advanced', 'parallel_downloads')
+        if isinstance(value, bool):
+            return DownloadPool.DEFAULT_WORKERS if value else 1
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return 1
+
+    def _get_work_folder(self) -> str:
+        """Get (creating on first use) the work folder of the calling worker thread."""
+        work_folder = getattr(self._local, 'work_folder', None)
+        if work_folder is None:
+            os.makedirs(self.work_root, exist_ok=True)
+            work_folder = tempfile.mkdtemp(prefix='worker-', dir=self.work_root)
+            self._local.work_folder = work_folder
+            with self._lock:
+                self._work_folders.append(work_folder)
+        return work_folder
+
+    def _run(self, download: Callable[[T, Optional[str]], R], job: T) -> R:
+        return download(job, self._get_work_folder())
+
+    def map(self, download: Callable[[T, Optional[str]], R], jobs: Iterable[T]) -> Iterator[Tuple[T, R]]:
+        """
+        Run a download function over jobs and yield the results in job order.
+        With one worker, jobs run in the calling thread, as a plain loop would.
+
+        Args:
+            download: Function called as download(job, work_folder)
+            jobs: Jobs to run
+
+        Yields:
+            Tuple of (job, result) for each job, in the order the jobs were given
+        """
+        if self._executor is None:
+            for job in jobs:
+                yield job, download(job, self._get_work_folder())
+            return
+
+        # Keep every worker busy while a slow job holds up in-order reporting
+        jobs = iter(jobs)
+        pending = deque()
+
+        def submit_next() -> None:
+            job = next(jobs, _NO_JOB)
+            if job is not _NO_JOB:
+                pending.append((job, self._executor.submit(self._run, download, job)))
+
+        try:
+            for _ in range(self.workers * 2):
+                submit_next()
+            while pending:
+                job, future = pending.popleft()
+                result = future.result()
+                submit_next()
+                yield job, result
+        finally:
+            # Consumer stopped early or a job failed: drop jobs not yet started
+            for _, future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Wait for running downloads and remove the work folders."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        for work_folder in self._work_folders:
+            shutil.rmtree(work_folder, ignore_errors=True)
+        try:
+            os.rmdir(self.work_root)
+        except OSError:
+            pass  # Missing, or still used by another run
+
+    def __enter__(self) -> 'DownloadPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Interrupted (e.g. Ctrl+C): kill running downloads instead of waiting for them
+        cancel_downloads()
+        try:
+            self.close()
+        finally:
+            resume_downloads()
@@ -0,0 +1,257 @@
+"""
+Crash-safe, persistent queue of download jobs.
+Every missing track is recorded in SQLite before it is downloaded and its
+state (pending, in progress, done, failed) is updated as the download runs,
+so a run that is interrupted can be resumed where it stopped. Jobs left in
+progress by a run that died are reset and their work folders removed. Every
+job remembers the process that queued or started it, so jobs of a process
+that is still running are never taken over by another one.
+"""
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import threading
+from typing import List, NamedTuple, Optional
+from spotify_sync.core.track import Track
+from spotify_sync.core.settings_manager import settings
+
+
+class QueuedDownload(NamedTuple):
+    """A job in the download queue."""
+    job_id: int
+    track: Track
+    folder: str
+    attempts: int
+
+
+class DownloadQueue:
+    """SQLite-backed queue of (track, playlist folder) download jobs."""
+
+    PENDING = 'pending'
+    IN_PROGRESS = 'in_progress'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    # Jobs started this many times are not resumed again (the track keeps failing)
+    MAX_ATTEMPTS = 3
+
+    # Finished jobs are kept this long for inspection, then pruned on recovery
+    DONE_RETENTION_SECONDS = 30 * 86400
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and create if needed) the queue database.
+
+        Args:
+            db_path: Path of the SQLite file (defaults to queue.db in the cache folder)
+        """
+        self.db_path = db_path or os.path.join(settings.get_cache_folder(), 'queue.db')
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # Waits for another process (e.g. watch next to check) instead of failing on a locked database
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                track_key TEXT NOT NULL,
+                folder TEXT NOT NULL,
+                track TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                owner_pid INTEGER,
+                work_folder TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (track_key, folder)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+        ''')
+        self._conn.commit()
+
+    @classmethod
+    def get_instance(cls) -> Optional['DownloadQueue']:
+        """
+        Get the process-wide queue stored in the configured cache folder.
+
+        Returns:
+            Shared DownloadQueue instance, or None if advanced.download_queue is
+            disabled or the database cannot be opened
+        """
+        if settings.get('advanced', 'download_queue') is False:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                try:
+                    cls._instance = cls()
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Warning: Download queue unavailable: {e}")
+                    return None
+            return cls._instance
+
+    @staticmethod
+    def _folder_key(folder: str) -> str:
+        """Normalize a folder path for use as a database key."""
+        return os.path.abspath(folder)
+
+    @staticmethod
+    def _is_process_alive(pid: Optional[int]) -> bool:
+        """Check whether a process is still running."""
+        if not pid:
+            return False
+        if pid == os.getpid():
+            return True
+        if os.name == 'nt':
+            import ctypes
+            # os.kill(pid, 0) would send CTRL_C_EVENT on Windows, so ask for the exit code instead
+            handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return False
+            exit_code = ctypes.c_ulong()
+            ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            ctypes.windll.kernel32.CloseHandle(handle)
+            return exit_code.value == 259  # STILL_ACTIVE
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def enqueue(self, track: Track, folder: str) -> int:
+        """
+        Add a download job, or return to pending a finished job for the same
+        track and folder (the track is missing again). Jobs in progress are left
+        alone. The job is owned by this process until it finishes or the process dies.
+
+        Args:
+            track: Track to download
+            folder: Playlist folder to download into
+
+        Returns:
+            Job ID
+        """
+        key = self._folder_key(folder)
+        with self._lock, self._conn:
+            self._conn.execute('''
+                INSERT INTO jobs (track_key, folder, track, state, owner_pid, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(track_key, folder) DO UPDATE SET
+                    track = excluded.track,
+                    state = excluded.state,
+                    owner_pid = excluded.owner_pid,
+                    attempts = CASE WHEN jobs.state = ? THEN 0 ELSE jobs.attempts END,
+                    updated_at = excluded.updated_at
+                WHERE jobs.state != ?
+            ''', (
+                track.key, key, json.dumps(track.to_dict()), DownloadQueue.PENDING, os.getpid(), time.time(),
+                DownloadQueue.DONE, DownloadQueue.IN_PROGRESS
+            ))
+            return self._conn.execute(
+                'SELECT id FROM jobs WHERE track_key = ? AND folder = ?', (track.key, key)
+            ).fetchone()[0]
+
+    def start(self, job_ids: List[int], work_folder: Optional[str] = None) -> None:
+        """
+        Mark jobs as in progress by this process.
+
+        Args:
+            job_ids: Jobs being downloaded
+            work_folder: Folder partial files of these downloads are written to
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'UPDATE jobs SET state = ?, owner_pid = ?, work_folder = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?',
+                [(DownloadQueue.IN_PROGRESS, os.getpid(), work_folder, time.time(), job_id) for job_id in job_ids]
+            )
+
+    def finish(self, job_id: int, downloaded: bool, error: Optional[str] = None) -> None:
+        """
+        Record the outcome of a job.
+
+        Args:
+            job_id: Finished job
+            downloaded: Whether the track was downloaded
+            error: Why the download failed
+        """
+        state = DownloadQueue.DONE if downloaded else DownloadQueue.FAILED
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE jobs SET state = ?, last_error = ?, owner_pid = NULL, work_folder = NULL, updated_at = ? WHERE id = ?',
+                (state, None if downloaded else error, time.time(), job_id)
+            )
+
+    def claim_pending(self, base_folder: Optional[str] = None) -> List[QueuedDownload]:
+        """
+        Take over the pending jobs whose owner is no longer running, oldest first.
+        Jobs already started MAX_ATTEMPTS times are marked failed instead.
+        Pending jobs of running processes (e.g. a watcher that queued its
+        downloads but has not started them yet) are left to them.
+
+        Args:
+            base_folder: Only claim jobs for playlist folders in this folder
+
+        Returns:
+            List of jobs now owned by this process
+        """
+        base_key = self._folder_key(base_folder) if base_folder else None
+        with self._lock, self._conn:
+            # Lock the database so two processes cannot claim the same jobs
+            self._conn.execute('BEGIN IMMEDIATE')
+            rows = self._conn.execute(
+                'SELECT id, track, folder, attempts, owner_pid FROM jobs WHERE state = ? ORDER BY id',
+                (DownloadQueue.PENDING,)
+            ).fetchall()
+            orphaned = [
+                row for row in rows
+                if (base_key is None or os.path.dirname(row[2]) == base_key) and not self._is_process_alive(row[4])
+            ]
+            exhausted = [row for row in orphaned if row[3] >= DownloadQueue.MAX_ATTEMPTS]
+            claimed = [row for row in orphaned if row[3] < DownloadQueue.MAX_ATTEMPTS]
+            now = time.time()
+            self._conn.executemany(
+                'UPDATE jobs SET state = ?, last_error = ?, owner_pid = NULL, updated_at = ? WHERE id = ?',
+                [(DownloadQueue.FAILED, f"Gave up after {row[3]} attempts", now, row[0]) for row in exhausted]
+            )
+            self._conn.executemany(
+                'UPDATE jobs SET owner_pid = ?, updated_at = ? WHERE id = ?',
+                [(os.getpid(), now, row[0]) for row in claimed]
+            )
+        return [
+            QueuedDownload(job_id, Track.from_dict(json.loads(track)), folder, attempts)
+            for job_id, track, folder, attempts, _ in claimed
+        ]
+
+    def recover(self) -> int:
+        """
+        Reset jobs left in progress by a process that is no longer running and
+        remove the work folders their interrupted downloads wrote to. Playlist
+        folders are left alone, as a live process may be downloading into them.
+
+        Returns:
+            Number of jobs returned to pending
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, folder, owner_pid, work_folder FROM jobs WHERE state = ?', (DownloadQueue.IN_PROGRESS,)
+            ).fetchall()
+        abandoned = [row for row in rows if not self._is_process_alive(row[2])]
+
+        for work_folder in {row[3] for row in abandoned if row[3]}:
+            shutil.rmtree(work_folder, ignore_errors=True)
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'UPDATE jobs SET state = ?, owner_pid = NULL, work_folder = NULL, updated_at = ? WHERE id = ?',
+                [(DownloadQueue.PENDING, time.time(), row[0]) for row in abandoned]
+            )
+            self._conn.execute(
+                'DELETE FROM jobs WHERE state = ? AND updated_at < ?',
+                (DownloadQueue.DONE, time.time() - DownloadQueue.DONE_RETENTION_SECONDS)
+            )
+        return len(abandoned)
@@ -3,15 +3,20 @@ Downloader module for spotdl operations.
 Handles downloading songs from Spotify/YouTube URLs.
 """
 
-import subprocess
 import shutil
-import sys
 import os
-from typing import Optional, Dict
-import urllib.request
-from mutagen.mp3 import MP3
-from mutagen.easyid3 import EasyID3
+from typing import Callable, Dict, List, Optional, TypeVar
 from spotify_sync.utils.utils import FilenameSanitizer
+from spotify_sync.core.track import Track
+from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.track_store import TrackStore
+from spotify_sync.core.download_backends import SubprocessBackend, get_download_backend
+from spotify_sync.core.resolution_cache import Resolution, ResolutionCache
+from spotify_sync.core.cover_art_cache import CoverArtCache
+from spotify_sync.core.track_tags import TrackTagger
+from spotify_sync.core.retry_policy import TransientError, download_retry_policy
+
+T = TypeVar('T')
 
 
 class SpotdlDownloader:
@@ -28,78 +33,159 @@ class SpotdlDownloader:
         Raises:
             RuntimeError: If spotdl is not found
         """
-        spotdl_path = shutil.which('spotdl')
-        if spotdl_path:
-            return spotdl_path
-        
-        venv_spotdl = os.path.join(os.path.dirname(sys.executable), 'spotdl')
-        if os.path.exists(venv_spotdl):
-            return venv_spotdl
-        
-        raise RuntimeError("spotdl not found. Please install spotdl in your environment.")
+        return SubprocessBackend.find_spotdl()
 
     @staticmethod
-    def get_youtube_url(track: dict, dont_filter: bool = False) -> Optional[str]:
+    def get_youtube_url(track: Track, dont_filter: bool = False) -> Optional[str]:
         """
         Get the YouTube URL for a song using spotdl url command.
+        Served from the resolution cache when the track was resolved before.
         
         Args:
-            track: Track dictionary with 'url' key
+            track: Track to download
             dont_filter: Whether to disable result filtering
             
         Returns:
             YouTube URL or None if not found
         """
+        cache = ResolutionCache.get_instance()
+        resolution = SpotdlDownloader._get_resolution(cache, track, dont_filter)
+        if resolution:
+            return resolution.youtube_url
+        
         try:
-            spotdl_path = SpotdlDownloader.find_spotdl()
-            cmd = [spotdl_path, 'url', track['url']]
-            if dont_filter:
-                cmd.append('--dont-filter-results')
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, stderr=subprocess.DEVNULL)
-            youtube_url = result.stdout.strip()
-            return youtube_url if youtube_url else None
+            youtube_url = download_retry_policy.call(
+                lambda: get_download_backend().find_youtube_url(track.url, dont_filter=dont_filter),
+                f"Search for {track.name}"
+            )
         except Exception as e:
-            print(f"Failed to get YouTube URL for {track['name']}: {e}")
+            print(f"Failed to get YouTube URL for {track.name}: {e}")
+            return None
+        
+        # Backends return None only when the search found no match (failed searches raise)
+        if cache:
+            if youtube_url:
+                cache.record(track.id, youtube_url, SpotdlDownloader._search_confidence(dont_filter))
+            else:
+                cache.record_not_found(track.id)
+        return youtube_url
+
+    @staticmethod
+    def download_with_retries(operation: Callable[[], T], folder: str, description: str) -> T:
+        """
+        Run a backend download under the download retry policy.
+        Files an attempt that failed transiently left in folder (e.g. a half
+        converted MP3 of a killed download) are removed before the next attempt.
+        
+        Args:
+            operation: Backend call to run
+            folder: Folder the backend downloads into
+            description: What is being downloaded (for log messages)
+            
+        Returns:
+            Result of the backend call
+            
+        Raises:
+            TransientError: If every attempt failed transiently
+        """
+        def attempt() -> T:
+            existing_files = set(os.listdir(folder))
+            try:
+                return operation()
+            except TransientError:
+                for name in set(os.listdir(folder)) - existing_files:
+                    path = os.path.join(folder, name)
+                    try:
+                        if os.path.isdir(path):
+                            shutil.rmtree(path)
+                        else:
+                            os.remove(path)
+                    except OSError:
+                        pass
+                raise
+        
+        return download_retry_policy.call(attempt, description)
+
+    @staticmethod
+    def _search_confidence(dont_filter: bool) -> float:
+        """Get the confidence of a match found by spotdl's search."""
+        return ResolutionCache.CONFIDENCE_UNFILTERED if dont_filter else ResolutionCache.CONFIDENCE_SEARCH
+
+    @staticmethod
+    def _get_resolution(cache: Optional[ResolutionCache], track: Track, dont_filter: bool) -> Optional[Resolution]:
+        """
+        Look up a cached resolution that the current search mode may reuse.
+        A URL is reused only if it was matched with at least the confidence of a
+        search in this mode (an unfiltered match is not reused by filtered runs).
+        "Not found" entries come from filtered searches, so unfiltered runs search again.
+        
+        Args:
+            cache: Resolution cache (None if disabled)
+            track: Track to look up
+            dont_filter: Whether result filtering is disabled
+            
+        Returns:
+            Usable cached Resolution, or None if the track has to be searched
+        """
+        resolution = cache.get(track.id) if cache else None
+        if resolution is None:
+            return None
+        if resolution.youtube_url is None:
+            return None if dont_filter else resolution
+        if resolution.confidence < SpotdlDownloader._search_confidence(dont_filter):
             return None
+        return resolution
 
     @staticmethod
-    def download_from_youtube(youtube_url: str, download_folder: str, track: Optional[Dict] = None) -> bool:
+    def _get_spotdl_query(track: Track, resolution: Optional[Resolution]) -> str:
+        """
+        Get the spotdl query for a track. A cached YouTube URL is passed as
+        "youtube_url|spotify_url", which downloads that video with the track's
+        Spotify metadata without searching.
+        """
+        if resolution and resolution.youtube_url:
+            return f"{resolution.youtube_url}|{track.url}"
+        return track.url
+
+    @staticmethod
+    def download_from_youtube(
+        youtube_url: str,
+        download_folder: str,
+        track: Optional[Track] = None,
+        store: Optional[TrackStore] = None,
+        work_folder: Optional[str] = None
+    ) -> bool:
         """
         Download audio from YouTube URL using yt-dlp and apply Spotify metadata via ffmpeg.
         
         Args:
             youtube_url: YouTube URL to download from
             download_folder: Folder to save the downloaded file
-            track: Optional track dict from Spotify with metadata
+            track: Optional Spotify track with metadata
+            store: Shared track store to add the downloaded file to
+            work_folder: Private folder to download into before the file is moved to
+                download_folder (keeps partial files and concurrent downloads apart)
             
         Returns:
             True if successful, False otherwise
         """
         try:
+            work_folder = work_folder or download_folder
+            
             # Get list of existing files before download
-            existing_files = set(os.listdir(download_folder))
+            existing_files = set(os.listdir(work_folder))
             
             # Step 1: Download audio from YouTube using yt-dlp
-            temp_file = os.path.join(download_folder, '%(title)s.%(ext)s')
-            yt_dlp_cmd = [
-                'yt-dlp',
-                '-q',  # Quiet mode
-                '--no-warnings',  # No warnings
-                '-x',  # Extract audio only
-                '--audio-format', 'mp3',
-                '--audio-quality', '192',
-                '-o', temp_file,
-                youtube_url
-            ]
-            
-            result = subprocess.run(yt_dlp_cmd, capture_output=True, text=True, stderr=subprocess.DEVNULL)
-            if result.returncode != 0:
-                print(f"✗ Failed to download from YouTube: {result.stderr}")
+            temp_file = os.path.join(work_folder, '%(title)s.%(ext)s')
+            if not SpotdlDownloader.download_with_retries(
+                lambda: get_download_backend().download_audio(youtube_url, temp_file),
+                work_folder,
+                f"Download of {youtube_url}"
+            ):
                 return False
             
             # Get the newly downloaded file (the one that wasn't there before)
-            current_files = set(os.listdir(download_folder))
+            current_files = set(os.listdir(work_folder))
             new_files = current_files - existing_files
             mp3_files = [f for f in new_files if f.endswith('.mp3')]
             
@@ -107,77 +193,26 @@ class SpotdlDownloader:
                 print("✗ No MP3 file found after download")
                 return False
             
-            downloaded_file = os.path.join(download_folder, mp3_files[0])  # Get the newly downloaded file
+            downloaded_file = os.path.join(work_folder, mp3_files[0])  # Get the newly downloaded file
             
             # Step 2: Apply Spotify metadata using mutagen if track info provided
-            if track and isinstance(track, dict):
+            if track is not None:
                 try:
-                    # Handle artists - list of strings
-                    artists_list = track.get('artists', [])
-                    artist = ', '.join(artists_list) if isinstance(artists_list, list) else str(artists_list)
-                    if not artist:
-                        artist = 'Unknown'
-                    
-                    # Get other metadata
-                    title = track.get('name', 'Unknown')
-                    album = track.get('album', 'Unknown')
-                    album_year = track.get('album_year', '')
-                    
                     # Sanitize filename using centralized sanitizer
-                    safe_title = FilenameSanitizer.sanitize(title)
-                    final_filename = f"{artist} - {safe_title}.mp3"
+                    safe_title = FilenameSanitizer.sanitize(track.name or 'Unknown')
+                    final_filename = f"{track.artist_string} - {safe_title}.mp3"
                     final_filepath = os.path.join(download_folder, final_filename)
                     
-                    # Rename file first
-                    os.rename(downloaded_file, final_filepath)
-                    
-                    # Apply metadata using EasyID3
-                    try:
-                        audio = EasyID3(final_filepath)
-                    except Exception:
-                        # If no ID3 tag exists, create one
-                        audio = EasyID3()
-                    
-                    # Set metadata
-                    audio['title'] = [title]
-                    audio['artist'] = [artist]
-                    audio['album'] = [album]
-                    if album_year:
-                        audio['date'] = [album_year]
+                    # Rename file first (moving it out of the work folder)
+                    shutil.move(downloaded_file, final_filepath)
                     
-                    # Save basic metadata
-                    audio.save()
-                    
-                    # Now add cover art using mutagen's ID3 directly
-                    cover_art_url = track.get('cover_art_url')
-                    if cover_art_url:
-                        try:
-                            from mutagen.id3 import ID3
-                            from mutagen.id3._frames import APIC
-                            cover_path = os.path.join(download_folder, 'cover_temp.jpg')
-                            urllib.request.urlretrieve(cover_art_url, cover_path)
-                            
-                            with open(cover_path, 'rb') as cover_file:
-                                cover_data = cover_file.read()
-                            
-                            # Get or create ID3 tags
-                            try:
-                                id3 = ID3(final_filepath)
-                            except Exception:
-                                id3 = ID3()
-                            
-                            # Add cover art
-                            id3.add(APIC(
-                                encoding=3,
-                                mime='image/jpeg',
-                                type=3,
-                                desc='',
-                                data=cover_data
-                            ))
-                            id3.save(final_filepath, v2_version=3)
-                            os.remove(cover_path)
-                        except Exception as e:
-                            print(f"⚠ Could not add cover art: {str(e)}")
+                    # Write metadata, cover art (cached, so an album's tracks share one fetch)
+                    # and the Spotify track ID tag in a single save
+                    cover_data = CoverArtCache.get_instance().get(track.cover_art_url)
+                    if TrackTagger.write(final_filepath, track, cover_data):
+                        FileManager.record_track_id(final_filepath, track.id, write_tag=False)
+                    if store:
+                        store.adopt(final_filepath, track.id)
                     
                     print(f"✓ Downloaded: {final_filename}")
                     
@@ -186,6 +221,8 @@ class SpotdlDownloader:
                     # File is still downloaded and renamed, just without proper metadata
                     return True
             else:
+                if work_folder != download_folder:
+                    shutil.move(downloaded_file, os.path.join(download_folder, mp3_files[0]))
                 print(f"✓ Downloaded: {os.path.basename(downloaded_file)}")
             
             return True
@@ -195,26 +232,223 @@ class SpotdlDownloader:
             return False
 
     @staticmethod
-    def download_from_spotify(track: dict, download_folder: str, dont_filter: bool = False) -> bool:
+    def download_from_spotify(
+        track: Track,
+        download_folder: str,
+        dont_filter: bool = False,
+        store: Optional[TrackStore] = None,
+        work_folder: Optional[str] = None,
+        quiet: bool = False
+    ) -> bool:
         """
         Download a song from Spotify URL using spotdl.
+        A YouTube URL cached for the track is downloaded directly (no search), and a
+        track spotdl reported no match for recently fails without running spotdl.
         
         Args:
-            track: Track dictionary with 'url' key
+            track: Track to download
             download_folder: Folder to save the download
             dont_filter: Whether to disable result filtering
+            store: Shared track store to add the downloaded file to
+            work_folder: Private folder to download into before the file is moved to
+                download_folder (so partial files never appear there)
+            quiet: Suppress spotdl's console output (e.g. when downloads run in parallel)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            spotdl_path = SpotdlDownloader.find_spotdl()
-            cmd = [spotdl_path, track['url'], '--output', download_folder]
-            if dont_filter:
-                cmd.append('--dont-filter-results')
+            cache = ResolutionCache.get_instance()
+            resolution = SpotdlDownloader._get_resolution(cache, track, dont_filter)
+            if resolution and resolution.youtube_url is None:
+                print(f"Skipped {track.name}: no match found in a previous search")
+                return False
+            
+            output_folder = work_folder or download_folder
+            existing_files = set(os.listdir(output_folder))
+            resolved = {}
+            not_found = set()
+            completed = SpotdlDownloader.download_with_retries(
+                lambda: get_download_backend().download_spotify(
+                    [SpotdlDownloader._get_spotdl_query(track, resolution)],
+                    output_folder,
+                    dont_filter=dont_filter,
+                    quiet=quiet,
+                    resolved=resolved,
+                    not_found=not_found
+                ),
+                output_folder,
+                f"Download of {track.name}"
+            )
             
-            subprocess.run(cmd, check=True)
+            new_files = [f for f in set(os.listdir(output_folder)) - existing_files if f.endswith('.mp3')]
+            if work_folder:
+                for name in new_files:
+                    shutil.move(os.path.join(work_folder, name), os.path.join(download_folder, name))
+            
+            if cache:
+                if resolved.get(track.id):
+                    cache.record(track.id, resolved[track.id], SpotdlDownloader._search_confidence(dont_filter))
+                elif not completed and not new_files:
+                    # A cached video that no longer downloads is searched again next time;
+                    # other failures (network, ffmpeg, ...) are only cached when spotdl said no match
+                    if resolution:
+                        cache.invalidate(track.id)
+                    elif track.url in not_found:
+                        cache.record_not_found(track.id)
+            
+            if not completed:
+                print(f"Failed to download {track.name}: spotdl did not complete")
+                return False
+            
+            # Tag the new file with the Spotify track ID so it is matched by ID later
+            if len(new_files) == 1:
+                new_filepath = os.path.join(download_folder, new_files[0])
+                FileManager.record_track_id(new_filepath, track.id)
+                if store:
+                    store.adopt(new_filepath, track.id)
             return True
         except Exception as e:
-            print(f"Failed to download {track['name']}: {e}")
+            print(f"Failed to download {track.name}: {e}")
             return False
+
+    @staticmethod
+    def _spotdl_name_key(text: str) -> str:
+        """
+        Reduce an artist or title string to a form that survives spotdl's
+        filename sanitization, so names from Spotify and from disk compare equal.
+        spotdl drops /?\\*|<> and replaces ':' with '-' and '"' with "'"; ':' and
+        '-' are both treated as spaces here so either spelling of a colon matches.
+        
+        Args:
+            text: Artist or title string, from Spotify or from a file name
+            
+        Returns:
+            Comparison key
+        """
+        text = text.lower().replace('"', "'")
+        for char in '/?\\*|<>:-':
+            text = text.replace(char, ' ')
+        return ' '.join(text.split())
+
+    @staticmethod
+    def _match_batch_files(tracks: List[Track], filenames: List[str]) -> Dict[str, str]:
+        """
+        Work out which new file belongs to which track after a batch download.
+        File names are split into spotdl's "Artists - Title" parts and matched on
+        both parts first, then on the whole title alone; each file is assigned to
+        at most one track.
+        
+        Args:
+            tracks: Tracks passed to spotdl
+            filenames: MP3 files that appeared during the run
+            
+        Returns:
+            Dict mapping track key to file name, for the tracks that were found
+        """
+        name_key = SpotdlDownloader._spotdl_name_key
+        unclaimed = {}
+        for name in filenames:
+            artists, separator, title = FileManager.normalize_filename(name).partition(' - ')
+            if separator:
+                unclaimed[name] = (name_key(artists), name_key(title))
+        matched = {}
+        
+        for track in tracks:
+            title = name_key(track.name)
+            artist_keys = {name_key(', '.join(track.artists)), name_key(track.artists[0] if track.artists else 'Unknown')}
+            for name, (artists, file_title) in unclaimed.items():
+                if file_title == title and artists in artist_keys:
+                    matched[track.key] = name
+                    del unclaimed[name]
+                    break
+        
+        for track in tracks:
+            if track.key in matched:
+                continue
+            title = name_key(track.name)
+            for name, (_, file_title) in unclaimed.items():
+                if file_title == title:
+                    matched[track.key] = name
+                    del unclaimed[name]
+                    break
+        
+        return matched
+
+    @staticmethod
+    def download_batch_from_spotify(
+        tracks: List[Track],
+        download_folder: str,
+        dont_filter: bool = False,
+        store: Optional[TrackStore] = None,
+        work_folder: Optional[str] = None,
+        quiet: bool = False
+    ) -> Dict[str, bool]:
+        """
+        Download several songs with a single spotdl run, so spotdl's startup and
+        Spotify authentication are paid once per batch instead of once per song.
+        Tracks with a cached YouTube URL are downloaded from it without searching.
+        spotdl carries on past songs it cannot download, so outcomes are read
+        back from the files that appeared rather than from the exit status.
+        
+        Args:
+            tracks: Tracks to download
+            download_folder: Folder to save the downloads
+            dont_filter: Whether to disable result filtering
+            store: Shared track store to add the downloaded files to
+            work_folder: Private folder to download into before the files are moved to
+                download_folder (so partial files never appear there)
+            quiet: Suppress spotdl's console output
+            
+        Returns:
+            Dict mapping track key to True if that track was downloaded
+        """
+        results = {track.key: False for track in tracks}
+        try:
+            # Tracks no match was found for recently are not searched again
+            cache = ResolutionCache.get_instance()
+            resolutions = {track.key: SpotdlDownloader._get_resolution(cache, track, dont_filter) for track in tracks}
+            tracks = [
+                track for track in tracks
+                if not (resolutions.get(track.key) and resolutions[track.key].youtube_url is None)
+            ]
+            if not tracks:
+                return results
+            
+            output_folder = work_folder or download_folder
+            existing_files = set(os.listdir(output_folder))
+            resolved = {}
+            SpotdlDownloader.download_with_retries(
+                lambda: get_download_backend().download_spotify(
+                    [SpotdlDownloader._get_spotdl_query(track, resolutions.get(track.key)) for track in tracks],
+                    output_folder,
+                    dont_filter=dont_filter,
+                    quiet=quiet,
+                    resolved=resolved
+                ),
+                output_folder,
+                f"Download of {len(tracks)} songs"
+            )
+            
+            new_files = [f for f in set(os.listdir(output_folder)) - existing_files if f.endswith('.mp3')]
+            if work_folder:
+                for name in new_files:
+                    shutil.move(os.path.join(work_folder, name), os.path.join(download_folder, name))
+            
+            # Tag each new file with its Spotify track ID so it is matched by ID later
+            matched = SpotdlDownloader._match_batch_files(tracks, new_files)
+            for track in tracks:
+                name = matched.get(track.key)
+                if cache and resolved.get(track.id):
+                    cache.record(track.id, resolved[track.id], SpotdlDownloader._search_confidence(dont_filter))
+                if name is None:
+                    # Missing tracks are retried one at a time, which settles their cache entry
+                    continue
+                new_filepath = os.path.join(download_folder, name)
+                FileManager.record_track_id(new_filepath, track.id)
+                if store:
+                    store.adopt(new_filepath, track.id)
+                results[track.key] = True
+        except Exception as e:
+            print(f"Failed to download batch of {len(tracks)} songs: {e}")
+        return results
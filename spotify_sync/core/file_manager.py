@@ -5,15 +5,20 @@ Handles downloading songs, managing folders, and file name normalization.
 
 import os
 import glob
-from typing import Set, Tuple, Optional
-from spotify_sync.utils.utils import FilenameSanitizer
+import sqlite3
+from typing import AbstractSet, Dict, List, Set, Tuple, Optional
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_tags import TrackIdTag
+from spotify_sync.core.match_index import SongMatchIndex
+from spotify_sync.core.library_index import LibraryIndex
+from spotify_sync.core.settings_manager import settings
 
 
 class FileManager:
     """Manages file and folder operations."""
 
     @staticmethod
-    def get_downloaded_songs(download_folder: str) -> Set[str]:
+    def get_downloaded_songs(download_folder: str) -> SongMatchIndex:
         """
         Get set of downloaded songs (normalized filenames).
         
@@ -21,67 +26,170 @@ class FileManager:
             download_folder: Path to folder containing downloaded songs
             
         Returns:
-            Set of normalized song filenames (lowercase, without extension)
-        """
-        downloaded = set()
-        for file in glob.glob(os.path.join(download_folder, '*')):
-            base = os.path.basename(file)
-            name, _ = os.path.splitext(base)
-            downloaded.add(name.lower())
-        return downloaded
+            Set of normalized song filenames (lowercase, without extension),
+            indexed for substring lookups and carrying the files' Spotify track IDs
+        """
+        downloaded = [
+            FileManager.normalize_filename(base) for base in FileManager.list_folder(download_folder)
+        ]
+        tagged = {
+            FileManager.normalize_filename(base): track_id
+            for base, track_id in FileManager.get_track_ids(download_folder, refresh=False).items()
+        }
+        return SongMatchIndex(downloaded, tagged)
+
+    @staticmethod
+    def normalize_filename(filename: str) -> str:
+        """
+        Normalize a downloaded filename for matching (lowercase, without extension).
+        
+        Args:
+            filename: File name without directory
+            
+        Returns:
+            Normalized name
+        """
+        name, _ = os.path.splitext(filename)
+        return name.lower()
+
+    @staticmethod
+    def get_track_ids(download_folder: str, refresh: bool = True) -> Dict[str, str]:
+        """
+        Get the Spotify track IDs tagged in a download folder's files.
+        Tags are only read through the library index, which remembers them per
+        file; with advanced.library_index disabled no IDs are returned and
+        matching relies on filenames alone.
+        
+        Args:
+            download_folder: Path to folder containing downloaded songs
+            refresh: Refresh the folder listing first (skip right after list_folder)
+            
+        Returns:
+            Dict mapping file name to Spotify track ID
+        """
+        if settings.get('advanced', 'library_index') is False:
+            return {}
+        try:
+            return LibraryIndex.get_instance().get_track_ids(download_folder, refresh=refresh)
+        except (OSError, sqlite3.Error):
+            return {}
+
+    @staticmethod
+    def record_track_id(filepath: str, track_id: str, write_tag: bool = True) -> None:
+        """
+        Tag a downloaded file with its Spotify track ID and remember it in the library index.
+        
+        Args:
+            filepath: Path to the downloaded MP3 file
+            track_id: Spotify track ID
+            write_tag: Write the ID tag (False if it was already written, e.g. by TrackTagger)
+        """
+        if not track_id:
+            return
+        if write_tag and not TrackIdTag.write(filepath, track_id):
+            return
+        if settings.get('advanced', 'library_index') is False:
+            return
+        try:
+            LibraryIndex.get_instance().record_track_id(filepath, track_id)
+        except (OSError, sqlite3.Error):
+            pass
 
     @staticmethod
-    def get_song_filename(track: dict) -> str:
+    def list_folder(download_folder: str) -> List[str]:
+        """
+        List the (non-hidden) entries of a download folder.
+        Served from the persistent library index when advanced.library_index is
+        enabled, so unchanged folders are not listed again.
+        
+        Args:
+            download_folder: Path to folder containing downloaded songs
+            
+        Returns:
+            Entry names in the folder
+        """
+        if settings.get('advanced', 'library_index') is not False:
+            try:
+                return LibraryIndex.get_instance().list_files(download_folder)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Warning: Library index unavailable, listing folder directly: {e}")
+        return [os.path.basename(file) for file in glob.glob(os.path.join(download_folder, '*'))]
+
+    @staticmethod
+    def contains_substring(downloaded_set: Set[str], text: str, excluded: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Check whether any downloaded filename contains a string.
+        Uses the index when given a SongMatchIndex, otherwise scans the set.
+        
+        Args:
+            downloaded_set: Set of downloaded song filenames
+            text: Normalized (lowercase) string to look for
+            excluded: Filenames to ignore (e.g. files claimed by another track's ID tag)
+            
+        Returns:
+            True if some filename contains text
+        """
+        if isinstance(downloaded_set, SongMatchIndex):
+            return downloaded_set.contains_substring(text, excluded)
+        excluded = excluded or {}
+        return any(text in downloaded_file for downloaded_file in downloaded_set if downloaded_file not in excluded)
+
+    @staticmethod
+    def get_song_filename(track: Track) -> str:
         """
         Return normalized filename for a track.
         Sanitizes special characters that are invalid in filenames.
         
         Args:
-            track: Track dictionary with 'artists' and 'name' keys
+            track: Track to get the filename for
             
         Returns:
             Normalized filename string "Artist - Song Name" (lowercase, sanitized)
         """
-        artist = track['artists'][0] if track['artists'] else 'Unknown'
-        name = track['name']
-        
-        # Sanitize the song name to match filenames that were actually created
-        safe_name = FilenameSanitizer.sanitize(name)
-        
-        return f"{artist} - {safe_name}".lower()
+        return track.filename_key
 
     @staticmethod
-    def is_song_downloaded(track: dict, downloaded_set: Set[str]) -> bool:
+    def is_song_downloaded(
+        track: Track,
+        downloaded_set: Set[str],
+        playlist_ids: Optional[AbstractSet[str]] = None
+    ) -> bool:
         """
-        Check if a song is downloaded using fuzzy matching.
-        Handles multiple artist formats and file name variations.
+        Check if a song is downloaded.
+        Files tagged with a Spotify track ID are matched by ID (so renamed files
+        are still found). Other files are matched by fuzzy filename matching,
+        which handles multiple artist formats and name variations; a tagged file
+        only takes part when its ID is not one of the playlist's tracks (e.g. the
+        track was relinked, or the file is the single of an album track).
         
         Args:
-            track: Track dictionary
+            track: Track to look for
             downloaded_set: Set of downloaded song filenames
+            playlist_ids: Spotify track IDs of the playlist (None keeps every tagged
+                file out of filename matching)
             
         Returns:
             True if song is found in downloaded set
         """
-        song_name = track['name']
+        tagged = {}
+        if isinstance(downloaded_set, SongMatchIndex):
+            # Exact match on the track ID tag
+            if track.id and track.id in downloaded_set.track_ids:
+                return True
+            tagged = downloaded_set.get_claimed(playlist_ids)
         
         # Try exact match with first artist
-        exact_match = FileManager.get_song_filename(track)
-        if exact_match in downloaded_set:
+        filename_key = track.filename_key
+        if filename_key in downloaded_set and filename_key not in tagged:
             return True
         
         # Try with all artists combined
-        all_artists = ", ".join([artist for artist in track['artists']])
-        all_artists_match = f"{all_artists} - {song_name}".lower()
-        if all_artists_match in downloaded_set:
+        all_artists_key = track.all_artists_key
+        if all_artists_key in downloaded_set and all_artists_key not in tagged:
             return True
         
         # Try matching just the song title
-        for downloaded_file in downloaded_set:
-            if song_name.lower() in downloaded_file:
-                return True
-        
-        return False
+        return FileManager.contains_substring(downloaded_set, track.title_key, excluded=tagged)
 
     @staticmethod
     def get_playlist_folder_name(playlist_id: str, playlist_name: Optional[str] = None) -> str:
@@ -0,0 +1,242 @@
+"""
+Live downloaded-song sets for the watch daemon.
+Keeps each playlist folder's listing in memory across watch cycles and updates
+it from filesystem events (inotify on Linux), falling back to checking the
+folder mtime, so folders are not listed again every cycle.
+"""
+
+import os
+import sys
+import time
+import errno
+import ctypes
+import ctypes.util
+import struct
+import threading
+from typing import Dict, List, Optional, Set
+from spotify_sync.core.file_manager import FileManager
+from spotify_sync.core.library_index import LibraryIndex
+from spotify_sync.core.match_index import SongMatchIndex
+
+
+class Inotify:
+    """Minimal non-blocking inotify wrapper (Linux only, via libc)."""
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+
+    WATCH_MASK = (
+        IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+        IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+
+    _EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        """
+        Create an inotify instance.
+
+        Raises:
+            OSError: If inotify is not available on this system
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: str) -> int:
+        """
+        Watch a directory for entries being added or removed.
+
+        Args:
+            path: Directory to watch
+
+        Returns:
+            Watch descriptor
+
+        Raises:
+            OSError: If the watch cannot be added (e.g. watch limit reached)
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), Inotify.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self) -> List[tuple]:
+        """
+        Read all pending events without blocking.
+
+        Returns:
+            List of (wd, mask, name) tuples
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            if not data:
+                return events
+
+            offset = 0
+            header_size = Inotify._EVENT_HEADER.size
+            while offset + header_size <= len(data):
+                wd, mask, _, name_length = Inotify._EVENT_HEADER.unpack_from(data, offset)
+                offset += header_size
+                name = os.fsdecode(data[offset:offset + name_length].rstrip(b'\0'))
+                offset += name_length
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FolderWatcher:
+    """
+    Serves downloaded-song sets for folders that are checked repeatedly.
+    With inotify, a folder is listed once and then kept current from events;
+    otherwise (or if a watch cannot be added) a folder is only listed again
+    when its mtime changes.
+    """
+
+    def __init__(self, backend: str = 'auto'):
+        """
+        Initialize the watcher.
+
+        Args:
+            backend: 'auto' (inotify when available, else polling), 'inotify' or 'polling'
+        """
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Set[str]] = {}
+        self._indexes: Dict[str, SongMatchIndex] = {}
+        self._mtimes: Dict[str, int] = {}
+        self._watches: Dict[int, str] = {}
+        self._watched: Set[str] = set()
+        self._inotify: Optional[Inotify] = None
+
+        if backend in ('auto', 'inotify'):
+            try:
+                self._inotify = Inotify()
+            except (OSError, AttributeError) as e:
+                if backend == 'inotify':
+                    print(f"Warning: inotify unavailable, falling back to polling: {e}")
+
+    @property
+    def backend(self) -> str:
+        """Name of the active backend ('inotify' or 'polling')."""
+        return 'inotify' if self._inotify else 'polling'
+
+    def _apply_events(self) -> None:
+        """Apply pending inotify events to the in-memory listings."""
+        for wd, mask, name in self._inotify.read_events():
+            if mask & Inotify.IN_Q_OVERFLOW:
+                # Events were lost: relist every folder on next access
+                self._entries.clear()
+                self._indexes.clear()
+                continue
+
+            key = self._watches.get(wd)
+            if key is None:
+                continue
+
+            if mask & (Inotify.IN_DELETE_SELF | Inotify.IN_MOVE_SELF | Inotify.IN_IGNORED):
+                # The folder itself went away; forget it and watch it again if recreated
+                self._watches.pop(wd, None)
+                self._watched.discard(key)
+                self._entries.pop(key, None)
+                self._indexes.pop(key, None)
+                continue
+
+            entries = self._entries.get(key)
+            if entries is None or not name or name.startswith('.'):
+                continue
+            if mask & (Inotify.IN_CREATE | Inotify.IN_MOVED_TO):
+                entries.add(name)
+            elif mask & (Inotify.IN_DELETE | Inotify.IN_MOVED_FROM):
+                entries.discard(name)
+            else:
+                continue
+            self._indexes.pop(key, None)
+
+    def _is_unchanged(self, key: str, folder: str) -> bool:
+        """Polling check: has the folder kept the mtime seen at its last listing?"""
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return False
+        previous = self._mtimes.get(key)
+        self._mtimes[key] = mtime_ns
+        # Same coarse-mtime caveat as the library index
+        recent = time.time_ns() - mtime_ns <= LibraryIndex.MTIME_GRANULARITY_NS
+        return previous == mtime_ns and not recent
+
+    def _list(self, key: str, folder: str) -> None:
+        """List a folder into memory, adding an inotify watch first when possible."""
+        if self._inotify and key not in self._watched and os.path.isdir(folder):
+            try:
+                # Watch before listing so no entry created in between is missed
+                self._watches[self._inotify.add_watch(folder)] = key
+                self._watched.add(key)
+            except OSError as e:
+                print(f"Warning: Could not watch {folder}, polling it instead: {e}")
+
+        self._entries[key] = set(FileManager.list_folder(folder))
+        self._indexes.pop(key, None)
+
+    def get_downloaded_songs(self, download_folder: str) -> SongMatchIndex:
+        """
+        Get the downloaded-song set of a folder, as FileManager.get_downloaded_songs.
+
+        Args:
+            download_folder: Path to folder containing downloaded songs
+
+        Returns:
+            Set of normalized song filenames, indexed for substring lookups
+        """
+        key = os.path.normcase(os.path.abspath(download_folder))
+        with self._lock:
+            if self._inotify:
+                self._apply_events()
+
+            if key not in self._watched or key not in self._entries:
+                # Record the mtime before listing so a change made meanwhile is seen next time
+                unchanged = self._is_unchanged(key, download_folder)
+                if key not in self._entries or not unchanged:
+                    self._list(key, download_folder)
+
+            index = self._indexes.get(key)
+            if index is None:
+                entries = self._entries[key]
+                tagged = {
+                    FileManager.normalize_filename(name): track_id
+                    for name, track_id in FileManager.get_track_ids(download_folder).items()
+                    if name in entries
+                }
+                index = SongMatchIndex(
+                    (FileManager.normalize_filename(name) for name in entries), tagged
+                )
+                self._indexes[key] = index
+            return index
+
+    def close(self) -> None:
+        """Stop watching all folders."""
+        with self._lock:
+            if self._inotify:
+                self._inotify.close()
+                self._inotify = None
+            self._watches.clear()
+            self._watched.clear()
@@ -0,0 +1,167 @@
+"""
+Conditional-request cache for Spotify API responses.
+Stores ETags and response bodies on disk and revalidates them with
+If-None-Match, so unchanged playlist pages come back as tiny 304s.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from spotify_sync.core.settings_manager import settings
+
+
+class ResponseCache:
+    """On-disk ETag/body store keyed by request URL, plus an in-memory memo of parsed results."""
+
+    # Only these endpoints are cached (playlist metadata and playlist items)
+    CACHEABLE_PREFIXES = ('https://api.spotify.com/v1/playlists/',)
+
+    def __init__(self, cache_folder: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Base cache folder (defaults to the configured cache folder)
+        """
+        base_folder = cache_folder or settings.get_cache_folder()
+        self.folder = os.path.join(base_folder, 'http')
+        self._parsed = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable(url: str) -> bool:
+        """Check whether responses for a URL should be cached."""
+        return url.startswith(ResponseCache.CACHEABLE_PREFIXES)
+
+    def _get_filepath(self, url: str) -> str:
+        """Get the cache file path for a URL."""
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, digest[:2], f"{digest}.json")
+
+    def get(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Look up a cached response.
+
+        Args:
+            url: Full request URL including query string
+
+        Returns:
+            Tuple of (etag, body), or None if not cached
+        """
+        filepath = self._get_filepath(url)
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry['etag'], entry['body'].encode('utf-8')
+        except Exception:
+            return None
+
+    def put(self, url: str, etag: str, body: bytes) -> None:
+        """
+        Store a response body with its ETag.
+
+        Args:
+            url: Full request URL including query string
+            etag: ETag header of the response
+            body: Raw response body
+        """
+        filepath = self._get_filepath(url)
+        temp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(temp_filepath, 'w', encoding='utf-8') as f:
+                json.dump({'url': url, 'etag': etag, 'body': body.decode('utf-8')}, f)
+            os.replace(temp_filepath, filepath)
+        except Exception as e:
+            print(f"Warning: Could not write HTTP cache entry for {url}: {e}")
+
+    def get_parsed(self, url: str, etag: str) -> Optional[Any]:
+        """
+        Get a value previously derived from a response, if the ETag still matches.
+
+        Args:
+            url: Full request URL
+            etag: Current ETag of the response
+
+        Returns:
+            The remembered value, or None
+        """
+        with self._lock:
+            entry = self._parsed.get(url)
+        if entry and entry[0] == etag:
+            return entry[1]
+        return None
+
+    def remember_parsed(self, url: str, etag: Optional[str], value: Any) -> None:
+        """
+        Remember a value derived from a response (e.g. parsed tracks) for this process.
+
+        Args:
+            url: Full request URL
+            etag: ETag of the response the value was derived from
+            value: Derived value
+        """
+        if not etag:
+            return
+        with self._lock:
+            self._parsed[url] = (etag, value)
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    requests transport adapter that revalidates cached GET responses.
+    A 304 is turned into a normal 200 response carrying the cached body, so
+    callers such as spotipy are unaware of the cache.
+    """
+
+    def __init__(self, response_cache: ResponseCache, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            response_cache: Cache backing the adapter
+            **kwargs: Passed to HTTPAdapter (pool sizes, retries)
+        """
+        super().__init__(**kwargs)
+        self.response_cache = response_cache
+        self._local = threading.local()
+
+    def last_response_info(self) -> Dict[str, Any]:
+        """
+        Get cache info about the last response sent from the calling thread.
+
+        Returns:
+            Dict with 'url', 'etag' and 'revalidated' (True if served from cache after a 304)
+        """
+        return getattr(self._local, 'info', {'url': None, 'etag': None, 'revalidated': False})
+
+    def send(self, request, **kwargs):
+        cached = None
+        if request.method == 'GET' and ResponseCache.is_cacheable(request.url):
+            cached = self.response_cache.get(request.url)
+            if cached:
+                request.headers['If-None-Match'] = cached[0]
+
+        response = super().send(request, **kwargs)
+        info = {'url': request.url, 'etag': response.headers.get('ETag'), 'revalidated': False}
+
+        if response.status_code == 304 and cached:
+            response.status_code = 200
+            response.reason = 'OK'
+            response._content = cached[1]
+            response.headers['X-Cache'] = 'revalidated'
+            info['etag'] = cached[0]
+            info['revalidated'] = True
+        elif response.status_code == 200 and info['etag'] and request.method == 'GET' \
+                and ResponseCache.is_cacheable(request.url):
+            self.response_cache.put(request.url, info['etag'], response.content)
+
+        self._local.info = info
+        return response
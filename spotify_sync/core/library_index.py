@@ -0,0 +1,215 @@
+"""
+Persistent index of the files in download folders.
+Keeps each folder's listing (name, size, mtime, Spotify track ID tag) in SQLite
+and only rescans a folder when its directory mtime changes, so an unchanged
+folder costs a single stat instead of a full listing (important on network shares).
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from spotify_sync.core.settings_manager import settings
+from spotify_sync.core.track_tags import TrackIdTag
+
+
+class LibraryIndex:
+    """SQLite-backed cache of download folder listings, refreshed incrementally."""
+
+    # Directory mtimes on some filesystems (FAT, SMB shares) only have 2s resolution.
+    # A folder modified this close to its last scan may have changed again without
+    # its mtime moving, so its cached listing is not trusted.
+    MTIME_GRANULARITY_NS = 2_000_000_000
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            db_path: Path of the SQLite file (defaults to library.db in the cache folder)
+        """
+        self.db_path = db_path or os.path.join(settings.get_cache_folder(), 'library.db')
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS folders (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                scanned_at_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                folder TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                track_id TEXT,
+                PRIMARY KEY (folder, name)
+            );
+        ''')
+        # Indexes created before track IDs were stored lack the column
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(files)')}
+        if 'track_id' not in columns:
+            self._conn.execute('ALTER TABLE files ADD COLUMN track_id TEXT')
+        self._conn.commit()
+
+    @classmethod
+    def get_instance(cls) -> 'LibraryIndex':
+        """
+        Get the process-wide index stored in the configured cache folder.
+
+        Returns:
+            Shared LibraryIndex instance
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def _folder_key(folder: str) -> str:
+        """Normalize a folder path for use as a database key."""
+        return os.path.normcase(os.path.abspath(folder))
+
+    def _is_fresh(self, key: str, mtime_ns: int) -> bool:
+        """Check whether the stored listing of a folder can be used as is."""
+        row = self._conn.execute(
+            'SELECT mtime_ns, scanned_at_ns FROM folders WHERE path = ?', (key,)
+        ).fetchone()
+        if row is None or row[0] != mtime_ns:
+            return False
+        return row[1] - mtime_ns > LibraryIndex.MTIME_GRANULARITY_NS
+
+    def _rescan(self, key: str, folder: str, mtime_ns: int) -> None:
+        """
+        Bring the stored listing of a folder up to date.
+        Entries whose size and mtime match the stored ones keep their track ID;
+        new entries and entries that changed (e.g. replaced by a re-download) are
+        stored with an unknown track ID, which get_track_ids reads lazily.
+        Vanished entries are removed.
+        """
+        scanned_at_ns = time.time_ns()
+        known = {
+            name: (size, mtime_ns) for name, size, mtime_ns in self._conn.execute(
+                'SELECT name, size, mtime_ns FROM files WHERE folder = ?', (key,)
+            )
+        }
+
+        present = set()
+        added: List[Tuple[str, str, int, int]] = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                # Match glob('*'): hidden entries are not part of the library
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                present.add(entry.name)
+                if known.get(entry.name) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                added.append((key, entry.name, stat.st_size, stat.st_mtime_ns))
+
+        removed = [(key, name) for name in set(known) - present]
+        with self._conn:
+            self._conn.executemany('DELETE FROM files WHERE folder = ? AND name = ?', removed)
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO files (folder, name, size, mtime_ns, track_id) VALUES (?, ?, ?, ?, NULL)', added
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO folders (path, mtime_ns, scanned_at_ns) VALUES (?, ?, ?)',
+                (key, mtime_ns, scanned_at_ns)
+            )
+
+    def list_files(self, folder: str) -> List[str]:
+        """
+        List the (non-hidden) entries of a folder, rescanning it only if it changed.
+
+        Args:
+            folder: Folder to list
+
+        Returns:
+            Entry names in the folder (empty if the folder does not exist)
+        """
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return []
+
+        key = self._folder_key(folder)
+        with self._lock:
+            if not self._is_fresh(key, mtime_ns):
+                self._rescan(key, folder, mtime_ns)
+            return [
+                name for (name,) in self._conn.execute('SELECT name FROM files WHERE folder = ?', (key,))
+            ]
+
+    def get_track_ids(self, folder: str, refresh: bool = True) -> Dict[str, str]:
+        """
+        Get the Spotify track IDs tagged in a folder's MP3 files.
+        Tags are read once per file (header only) and stored in the index.
+
+        Args:
+            folder: Folder to look in
+            refresh: Bring the folder listing up to date first (skip if list_files was just called)
+
+        Returns:
+            Dict mapping entry name to Spotify track ID, for tagged files only
+        """
+        if refresh:
+            self.list_files(folder)
+        key = self._folder_key(folder)
+        with self._lock:
+            unread = [
+                name for (name,) in self._conn.execute(
+                    'SELECT name FROM files WHERE folder = ? AND track_id IS NULL', (key,)
+                )
+            ]
+            if unread:
+                # '' marks files that were read and carry no ID tag
+                updates = [
+                    ((TrackIdTag.read(os.path.join(folder, name)) or '') if name.lower().endswith('.mp3') else '', key, name)
+                    for name in unread
+                ]
+                with self._conn:
+                    self._conn.executemany('UPDATE files SET track_id = ? WHERE folder = ? AND name = ?', updates)
+
+            return {
+                name: track_id for name, track_id in self._conn.execute(
+                    "SELECT name, track_id FROM files WHERE folder = ? AND track_id != ''", (key,)
+                )
+            }
+
+    def record_track_id(self, filepath: str, track_id: str) -> None:
+        """
+        Record the track ID of a file that was just tagged, so it is not read back later.
+
+        Args:
+            filepath: Path to the tagged file
+            track_id: Spotify track ID written to the file
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return
+        folder, name = os.path.split(filepath)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO files (folder, name, size, mtime_ns, track_id) VALUES (?, ?, ?, ?, ?)',
+                (self._folder_key(folder), name, stat.st_size, stat.st_mtime_ns, track_id)
+            )
+
+    def invalidate(self, folder: str) -> None:
+        """
+        Force the next list_files call for a folder to rescan it.
+
+        Args:
+            folder: Folder whose cached listing should be discarded
+        """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM folders WHERE path = ?', (self._folder_key(folder),))
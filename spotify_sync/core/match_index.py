@@ -0,0 +1,134 @@
+"""
+Substring index over downloaded song filenames.
+Replaces the linear "is this title contained in any filename" scan with a
+trigram lookup, so matching N tracks against M files is no longer O(N*M).
+Also carries the Spotify track IDs tagged in the files for exact matching.
+"""
+
+from typing import AbstractSet, Dict, Iterable, List, Optional, Set
+
+
+class SongMatchIndex(frozenset):
+    """
+    Immutable set of normalized filenames that also answers substring queries.
+    Behaves exactly like the set returned by FileManager.get_downloaded_songs
+    before; the trigram index is built on the first substring query.
+    """
+
+    # Length of the n-grams used to find candidate filenames
+    GRAM_SIZE = 3
+
+    def __new__(cls, names: Iterable[str] = (), tagged: Optional[Dict[str, str]] = None):
+        """
+        Create the index.
+
+        Args:
+            names: Normalized filenames
+            tagged: Normalized filename -> Spotify track ID, for files with an ID tag
+        """
+        index = super().__new__(cls, names)
+        index.tagged = dict(tagged or {})
+        index.track_ids = frozenset(index.tagged.values())
+        index._names = None
+        index._grams = None
+        index._short_queries = {}
+        index._claimed = None
+        return index
+
+    def _build(self) -> None:
+        """Build the trigram -> filename postings."""
+        names = list(self)
+        grams: Dict[str, Set[int]] = {}
+        size = SongMatchIndex.GRAM_SIZE
+        for position, name in enumerate(names):
+            for start in range(len(name) - size + 1):
+                gram = name[start:start + size]
+                postings = grams.get(gram)
+                if postings is None:
+                    grams[gram] = {position}
+                else:
+                    postings.add(position)
+        self._grams = grams
+        self._names = names
+
+    def _candidates(self, text: str) -> Set[int]:
+        """
+        Get the filenames that contain every trigram of a query.
+
+        Args:
+            text: Query of at least GRAM_SIZE characters
+
+        Returns:
+            Set of filename positions (empty if some trigram never occurs)
+        """
+        size = SongMatchIndex.GRAM_SIZE
+        postings: List[Set[int]] = []
+        for gram in {text[start:start + size] for start in range(len(text) - size + 1)}:
+            gram_postings = self._grams.get(gram)
+            if not gram_postings:
+                return set()
+            postings.append(gram_postings)
+
+        # Intersect starting from the rarest trigram so the candidate set shrinks fast
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for gram_postings in postings[1:]:
+            candidates &= gram_postings
+            if not candidates:
+                break
+        return candidates
+
+    def get_claimed(self, playlist_ids: Optional[AbstractSet[str]] = None) -> Dict[str, str]:
+        """
+        Get the tagged files that belong to a track of a playlist.
+        A file tagged with an ID the playlist does not contain (a relinked track,
+        or the single instead of the album version) is not claimed, so it can
+        still be matched by name. The result for the last set given is cached
+        (a set that grows between calls, e.g. while streaming pages, is rechecked).
+
+        Args:
+            playlist_ids: Spotify track IDs of the playlist (None claims every tagged file)
+
+        Returns:
+            Dict mapping normalized filename to track ID, for the claimed files
+        """
+        if playlist_ids is None:
+            return self.tagged
+        if self._claimed is not None and self._claimed[0] is playlist_ids and self._claimed[1] == len(playlist_ids):
+            return self._claimed[2]
+        claimed = {name: track_id for name, track_id in self.tagged.items() if track_id in playlist_ids}
+        self._claimed = (playlist_ids, len(playlist_ids), claimed)
+        return claimed
+
+    def contains_substring(self, text: str, excluded: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Check whether any filename contains a string.
+        Same result as any(text in name for name in self if name not in excluded).
+
+        Args:
+            text: Normalized (lowercase) string to look for
+            excluded: Filenames to ignore (e.g. files claimed by another track's ID tag)
+
+        Returns:
+            True if some filename contains text
+        """
+        excluded = excluded or {}
+
+        if len(text) < SongMatchIndex.GRAM_SIZE:
+            if excluded:
+                return any(text in name for name in self if name not in excluded)
+            # Too short for the trigram index; remember the answer of the linear scan
+            found = self._short_queries.get(text)
+            if found is None:
+                found = any(text in name for name in self)
+                self._short_queries[text] = found
+            return found
+
+        if self._grams is None:
+            self._build()
+
+        names = self._names
+        return any(
+            text in names[position] and names[position] not in excluded
+            for position in self._candidates(text)
+        )
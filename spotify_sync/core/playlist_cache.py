@@ -0,0 +1,133 @@
+"""
+Local cache of playlist snapshots.
+Stores each playlist's snapshot_id and track list so unchanged playlists
+can be served without paging through the Spotify API.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+from spotify_sync.core.settings_manager import settings
+from spotify_sync.core.track import Track
+
+
+class PlaylistCache:
+    """Persists playlist snapshots as one JSON file per playlist."""
+
+    def __init__(self, cache_folder: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_folder: Base cache folder (defaults to the configured cache folder)
+        """
+        base_folder = cache_folder or settings.get_cache_folder()
+        self.folder = os.path.join(base_folder, 'playlists')
+
+    @staticmethod
+    def normalize_id(playlist_id: str) -> str:
+        """
+        Extract the bare playlist ID from an ID, URL or URI.
+
+        Args:
+            playlist_id: Spotify playlist ID, URL or URI
+
+        Returns:
+            Bare playlist ID
+        """
+        if "playlist/" in playlist_id:
+            return playlist_id.split("playlist/")[-1].split("?")[0]
+        if playlist_id.startswith("spotify:playlist:"):
+            return playlist_id.split(":")[-1]
+        return playlist_id
+
+    def _get_filepath(self, playlist_id: str) -> str:
+        """Get the cache file path for a playlist."""
+        return os.path.join(self.folder, f"{self.normalize_id(playlist_id)}.json")
+
+    def load(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Load the cached snapshot for a playlist.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+
+        Returns:
+            Dict with 'snapshot_id', 'name', 'tracks', 'total' and 'synced' keys, or None if not cached
+        """
+        filepath = self._get_filepath(playlist_id)
+        if not os.path.exists(filepath):
+            return None
+
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except Exception:
+            return None
+
+        if not isinstance(entry, dict) or not entry.get('snapshot_id'):
+            return None
+        try:
+            entry['tracks'] = [Track.from_dict(track) for track in entry.get('tracks', [])]
+        except (KeyError, TypeError):
+            return None
+        return entry
+
+    def save(
+        self,
+        playlist_id: str,
+        snapshot_id: str,
+        name: Optional[str],
+        tracks: List[Track],
+        synced: bool = False,
+        total: Optional[int] = None
+    ) -> None:
+        """
+        Store a playlist snapshot.
+        The file is written atomically so an interrupted run never leaves a corrupt cache.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            snapshot_id: Spotify snapshot ID for this version of the playlist
+            name: Playlist name
+            tracks: Track list for this snapshot
+            synced: Whether every track of this snapshot is downloaded
+            total: Number of playlist items in this snapshot (including items without a track)
+        """
+        if not snapshot_id:
+            return
+
+        os.makedirs(self.folder, exist_ok=True)
+        filepath = self._get_filepath(playlist_id)
+        temp_filepath = f"{filepath}.tmp"
+
+        entry = {
+            'snapshot_id': snapshot_id,
+            'name': name,
+            'synced': synced,
+            'total': total,
+            'tracks': [track.to_dict() for track in tracks]
+        }
+
+        try:
+            with open(temp_filepath, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_filepath, filepath)
+        except Exception as e:
+            print(f"Warning: Could not write playlist cache {filepath}: {e}")
+
+    def mark_synced(self, playlist_id: str, synced: bool = True) -> None:
+        """
+        Update the 'synced' flag of a cached snapshot.
+
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            synced: Whether every track of the cached snapshot is downloaded
+        """
+        entry = self.load(playlist_id)
+        if entry is None or entry.get('synced') == synced:
+            return
+        self.save(
+            playlist_id, entry['snapshot_id'], entry.get('name'), entry.get('tracks', []),
+            synced=synced, total=entry.get('total')
+        )
@@ -0,0 +1,147 @@
+"""
+Process-wide rate limiting for Spotify API calls.
+Token bucket with Retry-After handling and adaptive backoff, shared by the
+sync and async clients so parallel fetches stay within the API quota.
+"""
+
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+from spotify_sync.core.settings_manager import settings
+
+
+class RateLimiter:
+    """Thread-safe token bucket that slows down when the API throttles us."""
+
+    # Never drop below this fraction of the configured rate when backing off
+    MIN_RATE_FRACTION = 0.1
+    # Fraction of the configured rate regained after each successful request
+    RECOVERY_STEP = 0.05
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Requests per second allowed when not throttled
+            burst: Maximum number of requests that can be sent back to back
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Counters
+        self.requests = 0
+        self.throttles = 0
+        self.wait_time = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take a token and return how long the caller must wait before sending.
+
+        Returns:
+            Delay in seconds (0 if the request can be sent immediately)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            delay = max(delay, self._blocked_until - now)
+
+            self.requests += 1
+            self.wait_time += delay
+            return delay
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a 429 response: pause all callers and halve the request rate.
+        Requests that were in flight together get their 429s in the same throttle
+        window, so the rate is halved only once per window.
+
+        Args:
+            retry_after: Seconds from the Retry-After header (defaults to one second)
+        """
+        with self._lock:
+            now = time.monotonic()
+            pause = retry_after if retry_after and retry_after > 0 else 1.0
+            if now >= self._blocked_until:
+                self.rate = max(self.max_rate * RateLimiter.MIN_RATE_FRACTION, self.rate / 2)
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self._tokens = min(self._tokens, 0.0)
+            self.throttles += 1
+
+    def on_success(self) -> None:
+        """Record a successful request, slowly restoring the rate after a throttle."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RateLimiter.RECOVERY_STEP)
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header value given in seconds.
+
+        Args:
+            value: Raw header value
+
+        Returns:
+            Seconds to wait, or None if missing or invalid
+        """
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get limiter counters.
+
+        Returns:
+            Dict with 'requests', 'throttles', 'wait_time' and current 'rate'
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'throttles': self.throttles,
+                'wait_time': round(self.wait_time, 2),
+                'rate': round(self.rate, 2)
+            }
+
+
+# Global limiter shared by every Spotify client in this process
+spotify_rate_limiter = RateLimiter(
+    settings.get('advanced', 'spotify_requests_per_second') or 10,
+    settings.get('advanced', 'spotify_burst') or 10
+)
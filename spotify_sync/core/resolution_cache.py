@@ -0,0 +1,167 @@
+"""
+Persistent cache of Spotify track to YouTube video resolutions.
+Remembers which YouTube URL each Spotify track was matched to (and how much
+the match can be trusted), plus tracks no match was found for, so re-syncs
+and retries download straight from the known video instead of searching again.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import NamedTuple, Optional
+from spotify_sync.core.settings_manager import settings
+
+
+class Resolution(NamedTuple):
+    """A cached resolution; youtube_url is None when no match was found."""
+    youtube_url: Optional[str]
+    resolved_at: float
+    confidence: float
+
+
+class ResolutionCache:
+    """SQLite-backed map of Spotify track ID to resolved YouTube URL."""
+
+    # Match confidence by how the URL was found
+    CONFIDENCE_MANUAL = 1.0       # Pasted or confirmed by the user
+    CONFIDENCE_SEARCH = 0.8       # spotdl search with result filtering
+    CONFIDENCE_UNFILTERED = 0.5   # spotdl search with --dont-filter-results
+
+    # How long a failed search is trusted before the track is searched again
+    DEFAULT_RETRY_DAYS = 7
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            db_path: Path of the SQLite file (defaults to resolutions.db in the cache folder)
+        """
+        self.db_path = db_path or os.path.join(settings.get_cache_folder(), 'resolutions.db')
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS resolutions (
+                track_id TEXT PRIMARY KEY,
+                youtube_url TEXT,
+                resolved_at REAL NOT NULL,
+                confidence REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    @classmethod
+    def get_instance(cls) -> Optional['ResolutionCache']:
+        """
+        Get the process-wide cache stored in the configured cache folder.
+
+        Returns:
+            Shared ResolutionCache instance, or None if advanced.resolution_cache
+            is disabled or the database cannot be opened
+        """
+        if settings.get('advanced', 'resolution_cache') is False:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                try:
+                    cls._instance = cls()
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Warning: Resolution cache unavailable: {e}")
+                    return None
+            return cls._instance
+
+    def _execute(self, sql: str, parameters: tuple) -> None:
+        """Run a write statement; the cache is best effort, so database errors are only reported."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(sql, parameters)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not update resolution cache: {e}")
+
+    def get(self, track_id: Optional[str]) -> Optional[Resolution]:
+        """
+        Look up the resolution of a track.
+        Failed searches older than advanced.resolution_retry_days are ignored.
+
+        Args:
+            track_id: Spotify track ID
+
+        Returns:
+            Cached Resolution, or None if the track has to be searched
+        """
+        if not track_id:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT youtube_url, resolved_at, confidence FROM resolutions WHERE track_id = ?', (track_id,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+
+        resolution = Resolution(*row)
+        if resolution.youtube_url is None:
+            retry_days = settings.get('advanced', 'resolution_retry_days')
+            if retry_days is None:
+                retry_days = ResolutionCache.DEFAULT_RETRY_DAYS
+            if time.time() - resolution.resolved_at > retry_days * 86400:
+                return None
+        return resolution
+
+    def record(self, track_id: Optional[str], youtube_url: str, confidence: float) -> None:
+        """
+        Remember the YouTube URL a track resolved to.
+        An existing resolution with a higher confidence is kept.
+
+        Args:
+            track_id: Spotify track ID
+            youtube_url: Resolved YouTube URL
+            confidence: Match confidence (one of the CONFIDENCE_* constants)
+        """
+        if not track_id or not youtube_url:
+            return
+        self._execute('''
+            INSERT INTO resolutions (track_id, youtube_url, resolved_at, confidence) VALUES (?, ?, ?, ?)
+            ON CONFLICT(track_id) DO UPDATE SET
+                youtube_url = excluded.youtube_url,
+                resolved_at = excluded.resolved_at,
+                confidence = CASE WHEN resolutions.youtube_url = excluded.youtube_url
+                    THEN MAX(resolutions.confidence, excluded.confidence)
+                    ELSE excluded.confidence END
+            WHERE resolutions.youtube_url IS NULL
+                OR resolutions.youtube_url = excluded.youtube_url
+                OR resolutions.confidence <= excluded.confidence
+        ''', (track_id, youtube_url, time.time(), confidence))
+
+    def record_not_found(self, track_id: Optional[str]) -> None:
+        """
+        Remember that no match was found for a track, so it is not searched
+        again until advanced.resolution_retry_days have passed.
+
+        Args:
+            track_id: Spotify track ID
+        """
+        if not track_id:
+            return
+        self._execute(
+            'INSERT OR REPLACE INTO resolutions (track_id, youtube_url, resolved_at, confidence) VALUES (?, NULL, ?, 0)',
+            (track_id, time.time())
+        )
+
+    def invalidate(self, track_id: Optional[str]) -> None:
+        """
+        Forget the resolution of a track (e.g. its video could not be downloaded).
+
+        Args:
+            track_id: Spotify track ID
+        """
+        if not track_id:
+            return
+        self._execute('DELETE FROM resolutions WHERE track_id = ?', (track_id,))
@@ -0,0 +1,164 @@
+"""
+Retry policy for downloads.
+Failures are classified as transient (network trouble, throttling, a child
+process that hung and was killed) or permanent (no match, unavailable video).
+Transient failures are retried with exponential backoff and jitter, up to
+advanced.max_retries times; permanent ones fail straight away.
+"""
+
+import time
+import random
+import threading
+from typing import Callable, Dict, Optional, TypeVar
+from spotify_sync.core.settings_manager import settings
+
+T = TypeVar('T')
+
+
+class TransientError(Exception):
+    """A download failure that may succeed if tried again."""
+
+
+class DownloadTimeoutError(TransientError):
+    """A download ran past its time limit and its process tree was killed."""
+
+
+class DownloadCancelledError(Exception):
+    """A download was stopped because the run is shutting down (e.g. Ctrl+C)."""
+
+
+class RetryPolicy:
+    """Thread-safe retry loop with exponential backoff, full jitter and counters."""
+
+    # Error output that marks a failure as permanent (checked before TRANSIENT_PATTERNS)
+    PERMANENT_PATTERNS = (
+        'video unavailable', 'private video', 'has been removed', 'copyright',
+        'not available in your country', 'confirm your age', 'members-only',
+        'unsupported url', 'no results found', 'http error 404', 'http error 410'
+    )
+    # Error output that marks a failure as worth retrying
+    TRANSIENT_PATTERNS = (
+        'timed out', 'timeout', 'temporary failure', 'connection', 'network',
+        'reset by peer', 'too many requests', 'http error 429', 'http error 5',
+        'unable to download webpage', 'incompleteread', 'remote end closed',
+        'try again'
+    )
+
+    def __init__(self, max_retries: int, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            base_delay: Backoff before the first retry, doubled for each further retry
+            max_delay: Upper bound of the backoff
+        """
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+
+        # Counters
+        self.attempts = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.gave_up = 0
+
+    @staticmethod
+    def is_transient(message: Optional[str]) -> bool:
+        """
+        Classify a failure by its error output.
+
+        Args:
+            message: Error output or exception text
+
+        Returns:
+            True if the failure is worth retrying
+        """
+        text = (message or '').lower()
+        if any(pattern in text for pattern in RetryPolicy.PERMANENT_PATTERNS):
+            return False
+        return any(pattern in text for pattern in RetryPolicy.TRANSIENT_PATTERNS)
+
+    def get_delay(self, retry: int) -> float:
+        """
+        Get the backoff before a retry ("full jitter": uniform up to the exponential bound).
+
+        Args:
+            retry: Number of the retry (1 for the first)
+
+        Returns:
+            Seconds to wait
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    def call(self, operation: Callable[[], T], description: str = "download") -> T:
+        """
+        Run an operation, retrying it while it raises TransientError.
+        Other exceptions and return values are passed through unchanged.
+
+        Args:
+            operation: Function to run
+            description: What the operation does (for log messages)
+
+        Returns:
+            Result of the first attempt that does not raise TransientError
+
+        Raises:
+            TransientError: If the last allowed attempt failed transiently
+        """
+        retry = 0
+        while True:
+            with self._lock:
+                self.attempts += 1
+            try:
+                return operation()
+            except TransientError as e:
+                with self._lock:
+                    if isinstance(e, DownloadTimeoutError):
+                        self.timeouts += 1
+                    if retry >= self.max_retries:
+                        self.gave_up += 1
+                        raise
+                    self.retries += 1
+                retry += 1
+                delay = self.get_delay(retry)
+                print(f"⚠ {description} failed ({e}), retry {retry}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get retry counters.
+
+        Returns:
+            Dict with 'attempts', 'retries', 'timeouts' and 'gave_up' counts
+        """
+        with self._lock:
+            return {
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'timeouts': self.timeouts,
+                'gave_up': self.gave_up
+            }
+
+
+def get_download_timeout(jobs: int = 1) -> Optional[float]:
+    """
+    Get the hard time limit of a download run.
+
+    Args:
+        jobs: Number of songs the run downloads
+
+    Returns:
+        Seconds (advanced.download_timeout_seconds per song), or None if disabled
+    """
+    timeout = settings.get('advanced', 'download_timeout_seconds')
+    if not timeout:
+        return None
+    return float(timeout) * max(1, jobs)
+
+
+# Global policy shared by every download in this process
+download_retry_policy = RetryPolicy(
+    settings.get('advanced', 'max_retries') if settings.get('advanced', 'max_retries') is not None else 3
+)
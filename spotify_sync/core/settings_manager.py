@@ -80,19 +80,22 @@ class SettingsManager:
             "paths": {
                 "downloads_folder": "downloaded_songs",
                 "playlists_file": "playlists.txt",
-                "csv_folder": "playlist_songs"
+                "csv_folder": "playlist_songs",
+                "cache_folder": ".spotify_sync_cache"
             },
             "download": {
                 "quality": "192",
                 "format": "mp3",
                 "include_metadata": True,
                 "include_cover_art": True,
-                "organize_by_playlist": True
+                "organize_by_playlist": True,
+                "shared_store": False
             },
             "watcher": {
                 "default_interval_minutes": 10,
                 "min_interval_minutes": 1,
-                "max_interval_minutes": 1440
+                "max_interval_minutes": 1440,
+                "folder_events": "auto"
             },
             "ui": {
                 "enable_colors": True,
@@ -104,7 +107,21 @@ class SettingsManager:
                 "auto_filter_results": True,
                 "max_retries": 3,
                 "timeout_seconds": 30,
-                "parallel_downloads": False
+                "download_timeout_seconds": 600,
+                "parallel_downloads": False,
+                "spotdl_batch_size": 10,
+                "download_backend": "subprocess",
+                "resolution_cache": True,
+                "resolution_retry_days": 7,
+                "download_queue": True,
+                "download_pipeline": False,
+                "spotify_page_workers": 4,
+                "async_max_connections": 20,
+                "spotify_requests_per_second": 10,
+                "spotify_burst": 10,
+                "http_cache": True,
+                "tail_fetch": True,
+                "library_index": True
             }
         }
     
@@ -137,6 +154,7 @@ class SettingsManager:
             'SPOTIFY_REDIRECT_URI': ('spotify', 'redirect_uri'),
             'SPOTIFY_DOWNLOADS_FOLDER': ('paths', 'downloads_folder'),
             'SPOTIFY_PLAYLISTS_FILE': ('paths', 'playlists_file'),
+            'SPOTIFY_CACHE_FOLDER': ('paths', 'cache_folder'),
             'SPOTIFY_CHECK_INTERVAL': ('watcher', 'default_interval_minutes'),
         }
         
@@ -230,6 +248,10 @@ class SettingsManager:
         """Get CSV folder path."""
         return self.get('paths', 'csv_folder') or 'playlist_songs'
     
+    def get_cache_folder(self) -> str:
+        """Get folder for local caches (playlist snapshots, indexes)."""
+        return self.get('paths', 'cache_folder') or '.spotify_sync_cache'
+    
     def get_check_interval(self) -> int:
         """Get watcher check interval in minutes."""
         interval = self.get('watcher', 'default_interval_minutes') or 10
@@ -262,6 +284,10 @@ class Config:
     def get_playlist_folder() -> str:
         return settings.get_csv_folder()
     
+    @staticmethod
+    def get_cache_folder() -> str:
+        return settings.get_cache_folder()
+    
     @staticmethod
     def get_check_interval() -> int:
         return settings.get_check_interval()
@@ -271,6 +297,9 @@ class Config:
     CSV_STATUS_MISSING = "missing"
     CSV_STATUS_UNABLE_TO_FIND = "unable to be found"
     
+    # Spotify API constants
+    SPOTIFY_PLAYLIST_PAGE_SIZE = 100  # Maximum page size of the playlist items endpoint
+    
     # Other constants
     DEFAULT_CHECK_INTERVAL_MINUTES = 10
     MIN_CHECK_INTERVAL_MINUTES = 1
@@ -4,15 +4,45 @@ Handles authentication and playlist/track retrieval.
 """
 
 import os
-from typing import List, Dict, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
+import requests
 import spotipy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from spotipy.oauth2 import SpotifyClientCredentials
+from spotipy.cache_handler import CacheFileHandler
 from dotenv import load_dotenv
+from spotify_sync.core.playlist_cache import PlaylistCache
+from spotify_sync.core.track import Track
+from spotify_sync.core.http_cache import ResponseCache, CachingHTTPAdapter
+from spotify_sync.core.rate_limiter import spotify_rate_limiter, RateLimiter
+from spotify_sync.core.settings_manager import settings, Config
 
 
 class SpotifyClient:
     """Wrapper for Spotify API operations."""
 
+    # Field filters so the API only returns the keys used by _parse_track.
+    # Only the first page carries 'total', so later pages stay byte-identical
+    # (and revalidate as 304) when tracks are appended to the playlist.
+    TRACK_FIELDS = 'track(name,id,artists(name),external_urls(spotify),album(name,release_date,images(url)))'
+    PAGE_FIELDS = f'items({TRACK_FIELDS})'
+    PLAYLIST_FIELDS = f'name,snapshot_id,tracks({PAGE_FIELDS},total)'
+
+    # Number of times a throttled (429) request is retried after waiting
+    MAX_THROTTLE_RETRIES = 5
+
+    # Process-wide HTTP session and client, reused across commands run from the launcher
+    _session = None
+    _http_adapter = None
+    _response_cache = None
+    _instance = None
+    _instance_credentials = None
+    _lock = threading.RLock()
+
     def __init__(self):
         """Initialize Spotify client with credentials from .env"""
         load_dotenv()
@@ -26,67 +56,570 @@ class SpotifyClient:
                 "Please create a .env file with SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET."
             )
         
+        session = SpotifyClient.get_session()
         self.client = spotipy.Spotify(
             auth_manager=SpotifyClientCredentials(
                 client_id=client_id,
-                client_secret=client_secret
-            )
+                client_secret=client_secret,
+                requests_session=session,
+                cache_handler=CacheFileHandler(cache_path=SpotifyClient.get_token_cache_path(client_id))
+            ),
+            requests_session=session
         )
+        self.playlist_cache = PlaylistCache()
 
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
+    @classmethod
+    def get_instance(cls) -> 'SpotifyClient':
         """
-        Fetch all tracks from a Spotify playlist.
+        Get the process-wide client, creating it on first use.
+        A new client is created if the credentials in the environment changed.
+        
+        Returns:
+            Shared SpotifyClient instance
+        """
+        load_dotenv()
+        credentials = (os.getenv('SPOTIFY_CLIENT_ID'), os.getenv('SPOTIFY_CLIENT_SECRET'))
+        
+        with cls._lock:
+            if cls._instance is None or cls._instance_credentials != credentials:
+                cls._instance = cls()
+                cls._instance_credentials = credentials
+            return cls._instance
+
+    @staticmethod
+    def get_token_cache_path(client_id: str) -> str:
+        """
+        Get the on-disk access token cache path for a client ID.
+        Tokens are reused across runs until they expire.
         
         Args:
-            playlist_id: Spotify playlist ID or URL
+            client_id: Spotify API client ID
             
         Returns:
-            List of track dictionaries with name, artists, id, url, album, cover_art
+            Path to the token cache file
         """
-        results = self.client.playlist_items(playlist_id)
-        tracks = []
+        cache_folder = settings.get_cache_folder()
+        os.makedirs(cache_folder, exist_ok=True)
+        return os.path.join(cache_folder, f"spotify_token_{client_id[:8]}.json")
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Get the process-wide keep-alive HTTP session used by spotipy.
+        Connection errors and 5xx responses are retried by urllib3, but 429s are
+        left to _call so the shared rate limiter sees every Retry-After.
         
-        while results:
-            for item in results['items']:
-                track = item['track']
-                
-                # Get album info
-                album_data = track.get('album', {})
-                album_name = album_data.get('name', 'Unknown')
-                album_year = album_data.get('release_date', '')[:4] if album_data.get('release_date') else ''
+        Returns:
+            Shared requests session
+        """
+        with cls._lock:
+            if cls._session is None:
+                retry = Retry(
+                    total=3,
+                    read=False,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+                    backoff_factor=0.3,
+                    raise_on_status=False,
+                    # urllib3 would otherwise retry any 429 carrying Retry-After itself
+                    respect_retry_after_header=False
+                )
+                # Keep enough pooled connections open for concurrent page fetches
+                pool_size = max(10, settings.get('advanced', 'spotify_page_workers') or 1)
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=pool_size,
+                    max_retries=retry
+                ))
                 
-                # Get cover art (highest resolution)
-                cover_art_url = None
-                images = album_data.get('images', [])
-                if images:
-                    cover_art_url = images[0]['url']  # First image is largest
+                # Revalidate playlist responses with If-None-Match instead of re-downloading them
+                if settings.get('advanced', 'http_cache') is not False:
+                    cls._response_cache = ResponseCache()
+                    cls._http_adapter = CachingHTTPAdapter(
+                        cls._response_cache,
+                        pool_connections=4,
+                        pool_maxsize=pool_size,
+                        max_retries=retry
+                    )
+                    session.mount('https://api.spotify.com/', cls._http_adapter)
                 
-                tracks.append({
-                    'name': track['name'],
-                    'artists': [artist['name'] for artist in track['artists']],
-                    'id': track['id'],
-                    'url': track['external_urls']['spotify'],
-                    'album': album_name,
-                    'album_year': album_year,
-                    'cover_art_url': cover_art_url
-                })
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def last_response_info(cls) -> Dict:
+        """
+        Get HTTP cache info about the last API response received on this thread.
+        
+        Returns:
+            Dict with 'url', 'etag' and 'revalidated' keys
+        """
+        if cls._http_adapter is None:
+            return {'url': None, 'etag': None, 'revalidated': False}
+        return cls._http_adapter.last_response_info()
+
+    def _call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a spotipy method through the process-wide rate limiter.
+        Throttled requests wait for Retry-After and are retried.
+        
+        Args:
+            func: Bound spotipy method
+            *args, **kwargs: Arguments for the method
+            
+        Returns:
+            The method's result
+        """
+        for attempt in range(SpotifyClient.MAX_THROTTLE_RETRIES + 1):
+            spotify_rate_limiter.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except spotipy.SpotifyException as e:
+                if e.http_status != 429 or attempt == SpotifyClient.MAX_THROTTLE_RETRIES:
+                    raise
+                headers = e.headers or {}
+                spotify_rate_limiter.on_throttle(RateLimiter.parse_retry_after(headers.get('Retry-After')))
+                continue
+            spotify_rate_limiter.on_success()
+            return result
+
+    @staticmethod
+    def _parse_track(item: Dict) -> Optional[Track]:
+        """
+        Convert a playlist item from the API into a Track.
+        
+        Args:
+            item: Playlist item as returned by the playlist items endpoint
+            
+        Returns:
+            Track, or None for items without a track (e.g. removed local files)
+        """
+        track = item.get('track')
+        if not track:
+            return None
+        
+        # Get album info
+        album_data = track.get('album', {})
+        album_name = album_data.get('name', 'Unknown')
+        album_year = album_data.get('release_date', '')[:4] if album_data.get('release_date') else ''
+        
+        # Get cover art (highest resolution)
+        cover_art_url = None
+        images = album_data.get('images', [])
+        if images:
+            cover_art_url = images[0]['url']  # First image is largest
+        
+        return Track(
+            track['name'],
+            [artist['name'] for artist in track['artists']],
+            track['id'],
+            track['external_urls']['spotify'],
+            album_name,
+            album_year,
+            cover_art_url
+        )
+
+    @staticmethod
+    def _parse_page(page: Dict) -> List[Track]:
+        """Convert one page of playlist items into Tracks."""
+        tracks = []
+        for item in page['items']:
+            track = SpotifyClient._parse_track(item)
+            if track:
+                tracks.append(track)
+        return tracks
+
+    def _parse_response_page(self, page: Dict) -> List[Track]:
+        """
+        Convert a page just fetched on this thread into Tracks.
+        If the HTTP cache revalidated the response (304), the tracks parsed from
+        the identical earlier response are reused instead of parsing again.
+        """
+        info = SpotifyClient.last_response_info()
+        if info['revalidated']:
+            cached_tracks = SpotifyClient._response_cache.get_parsed(info['url'], info['etag'])
+            if cached_tracks is not None:
+                return list(cached_tracks)
+        
+        tracks = self._parse_page(page)
+        if SpotifyClient._response_cache and info['url']:
+            SpotifyClient._response_cache.remember_parsed(info['url'], info['etag'], tuple(tracks))
+        return tracks
+
+    def _fetch_page_tracks(self, playlist_id: str, offset: int) -> List[Track]:
+        """Fetch one field-filtered page of playlist items and return its tracks."""
+        page = self._call(
+            self.client.playlist_items,
+            playlist_id,
+            fields=SpotifyClient.PAGE_FIELDS,
+            limit=Config.SPOTIFY_PLAYLIST_PAGE_SIZE,
+            offset=offset
+        )
+        return self._parse_response_page(page)
+
+    def _fetch_remaining_tracks(self, playlist_id: str, start: int, total: int, max_workers: int) -> List[Track]:
+        """
+        Fetch every page from an offset to the end and return their tracks in playlist order.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            start: Offset of the first item to fetch
+            total: Total number of items in the playlist
+            max_workers: Number of pages fetched in parallel (1 fetches sequentially)
+            
+        Returns:
+            List of Tracks from the fetched pages
+        """
+        offsets = range(start, total, Config.SPOTIFY_PLAYLIST_PAGE_SIZE)
+        tracks = []
+        
+        if max_workers > 1 and len(offsets) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() yields pages in offset order regardless of completion order
+                for page_tracks in executor.map(lambda offset: self._fetch_page_tracks(playlist_id, offset), offsets):
+                    tracks.extend(page_tracks)
+            return tracks
+        
+        for offset in offsets:
+            tracks.extend(self._fetch_page_tracks(playlist_id, offset))
+        return tracks
+
+    def _iter_remaining_pages(self, playlist_id: str, start: int, total: int, max_workers: int) -> Iterator[List[Track]]:
+        """
+        Yield the tracks of every page from an offset to the end, in playlist order.
+        Up to max_workers pages are fetched ahead in background threads while the
+        caller processes the current page, so at most that many pages are buffered.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            start: Offset of the first item to fetch
+            total: Total number of items in the playlist
+            max_workers: Number of pages fetched ahead
+            
+        Yields:
+            List of Tracks for each page
+        """
+        offsets = iter(range(start, total, Config.SPOTIFY_PLAYLIST_PAGE_SIZE))
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        pending = deque()
+        
+        def submit_next() -> None:
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append(executor.submit(self._fetch_page_tracks, playlist_id, offset))
+        
+        try:
+            for _ in range(max(1, max_workers)):
+                submit_next()
+            while pending:
+                page_tracks = pending.popleft().result()
+                submit_next()
+                yield page_tracks
+        finally:
+            # Consumer stopped early or a page failed: drop pages not yet started
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def get_playlist(self, playlist_id: str, max_workers: Optional[int] = None) -> Tuple[Optional[Dict], List[Track]]:
+        """
+        Fetch playlist metadata and all of its tracks.
+        Metadata and the first page of tracks come from a single field-filtered
+        request; remaining pages are fetched concurrently and reassembled in order.
+        If that request is answered with 304 Not Modified, the cached track list
+        is returned without fetching any further pages.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            max_workers: Number of pages fetched in parallel (defaults to
+                advanced.spotify_page_workers; 1 fetches pages sequentially)
+            
+        Returns:
+            Tuple of (playlist_info, tracks). playlist_info has 'name' and 'snapshot_id' keys.
+        """
+        if max_workers is None:
+            max_workers = settings.get('advanced', 'spotify_page_workers') or 1
+        
+        playlist_info = self._call(self.client.playlist, playlist_id, fields=SpotifyClient.PLAYLIST_FIELDS)
+        if not playlist_info:
+            return None, []
+        
+        first_page = playlist_info.pop('tracks', None) or {'items': [], 'total': 0}
+        playlist_info['total'] = first_page.get('total') or 0
+        
+        if SpotifyClient.last_response_info()['revalidated']:
+            cached = self.playlist_cache.load(playlist_id)
+            if cached and cached['snapshot_id'] == playlist_info.get('snapshot_id'):
+                return playlist_info, cached.get('tracks', [])
+        
+        tracks = self._parse_response_page(first_page)
+        tracks.extend(self._fetch_remaining_tracks(
+            playlist_id, len(first_page['items']), playlist_info['total'], max_workers
+        ))
+        return playlist_info, tracks
+
+    def stream_playlist(
+        self,
+        playlist_id: str,
+        max_workers: Optional[int] = None
+    ) -> Tuple[Optional[Dict], Iterator[List[Track]]]:
+        """
+        Fetch playlist metadata and stream its tracks page by page.
+        Only the metadata request (which also carries the first page) is made up
+        front; later pages are fetched in the background as the returned iterator
+        is consumed, so callers can start working on early pages immediately.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            max_workers: Number of pages fetched ahead (defaults to
+                advanced.spotify_page_workers)
             
-            results = self.client.next(results) if results['next'] else None
+        Returns:
+            Tuple of (playlist_info, pages). playlist_info has 'name', 'snapshot_id'
+            and 'total' keys; pages yields a list of Tracks per page.
+        """
+        if max_workers is None:
+            max_workers = settings.get('advanced', 'spotify_page_workers') or 1
+        
+        playlist_info = self._call(self.client.playlist, playlist_id, fields=SpotifyClient.PLAYLIST_FIELDS)
+        if not playlist_info:
+            return None, iter([])
         
+        first_page = playlist_info.pop('tracks', None) or {'items': [], 'total': 0}
+        playlist_info['total'] = first_page.get('total') or 0
+        
+        if SpotifyClient.last_response_info()['revalidated']:
+            cached = self.playlist_cache.load(playlist_id)
+            if cached and cached['snapshot_id'] == playlist_info.get('snapshot_id'):
+                return playlist_info, iter([cached.get('tracks', [])])
+        
+        first_tracks = self._parse_response_page(first_page)
+        
+        def pages() -> Iterator[List[Track]]:
+            yield first_tracks
+            yield from self._iter_remaining_pages(
+                playlist_id, len(first_page['items']), playlist_info['total'], max_workers
+            )
+        
+        return playlist_info, pages()
+
+    def get_playlist_tail(
+        self,
+        playlist_id: str,
+        cached_tracks: List[Track],
+        cached_total: int,
+        total: int,
+        max_workers: Optional[int] = None
+    ) -> Optional[List[Track]]:
+        """
+        Fetch only the tracks appended since a cached version of the playlist.
+        The page starting at the last cached item is fetched first; the cached
+        prefix is trusted only if that boundary item is still the same track.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            cached_tracks: Track list of the cached version
+            cached_total: Number of playlist items in the cached version
+            total: Current number of playlist items
+            max_workers: Number of pages fetched in parallel (defaults to
+                advanced.spotify_page_workers; 1 fetches pages sequentially)
+            
+        Returns:
+            Full current track list, or None if the cached prefix is no longer valid
+        """
+        if not cached_tracks or not cached_total or total <= cached_total:
+            return None
+        
+        if max_workers is None:
+            max_workers = settings.get('advanced', 'spotify_page_workers') or 1
+        
+        boundary_offset = cached_total - 1
+        page = self._call(
+            self.client.playlist_items,
+            playlist_id,
+            fields=SpotifyClient.PAGE_FIELDS,
+            limit=Config.SPOTIFY_PLAYLIST_PAGE_SIZE,
+            offset=boundary_offset
+        )
+        items = page.get('items') or []
+        boundary = self._parse_track(items[0]) if items else None
+        last_cached = cached_tracks[-1]
+        if not boundary or boundary.id != last_cached.id or boundary.name != last_cached.name:
+            return None
+        
+        tracks = list(cached_tracks)
+        tracks.extend(self._parse_page({'items': items[1:]}))
+        tracks.extend(self._fetch_remaining_tracks(
+            playlist_id, boundary_offset + len(items), total, max_workers
+        ))
+        return tracks
+
+    def get_playlist_tracks(self, playlist_id: str, max_workers: Optional[int] = None) -> List[Track]:
+        """
+        Fetch all tracks from a Spotify playlist.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            max_workers: Number of pages fetched in parallel (defaults to
+                advanced.spotify_page_workers; 1 fetches pages sequentially)
+            
+        Returns:
+            List of Tracks with name, artists, id, url, album, cover_art
+        """
+        _, tracks = self.get_playlist(playlist_id, max_workers)
         return tracks
 
+    def iter_playlist_tracks(self, playlist_id: str, max_workers: Optional[int] = None) -> Iterator[Track]:
+        """
+        Generator variant of get_playlist_tracks that yields tracks as pages arrive.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            max_workers: Number of pages fetched ahead (defaults to
+                advanced.spotify_page_workers)
+            
+        Yields:
+            Tracks in playlist order
+        """
+        _, pages = self.stream_playlist(playlist_id, max_workers)
+        for page in pages:
+            yield from page
+
     def get_playlist_info(self, playlist_id: str) -> Optional[Dict]:
         """
-        Get playlist name and metadata.
+        Get playlist name and metadata (see get_playlist_snapshot; no tracks are fetched).
         
         Args:
             playlist_id: Spotify playlist ID or URL
             
         Returns:
-            Playlist info dict with 'name' key, or None if not found
+            Playlist info dict with 'name', 'snapshot_id' and 'total' keys, or None if not found
+        """
+        return self.get_playlist_snapshot(playlist_id)
+
+    def get_playlist_snapshot(self, playlist_id: str) -> Optional[Dict]:
+        """
+        Get the playlist name, snapshot ID and size without fetching any tracks.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            
+        Returns:
+            Dict with 'name', 'snapshot_id' and 'total' (item count) keys, or None if not found
         """
         try:
-            playlist_info = self.client.playlist(playlist_id)
-            return playlist_info if playlist_info and 'name' in playlist_info else None
+            snapshot = self._call(self.client.playlist, playlist_id, fields='name,snapshot_id,tracks(total)')
         except Exception:
             return None
+        if not snapshot or 'snapshot_id' not in snapshot:
+            return None
+        snapshot['total'] = (snapshot.pop('tracks', None) or {}).get('total')
+        return snapshot
+
+    def get_playlist_tracks_cached(self, playlist_id: str) -> Tuple[List[Track], Optional[Dict], bool]:
+        """
+        Fetch playlist tracks, reusing the local cache when possible.
+        Only a single small request is made for playlists that have not changed
+        since the last run. Playlists that only grew at the end have just their
+        new tail fetched (see get_playlist_tail); anything else is fetched in
+        full. The cache is updated in both cases.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            
+        Returns:
+            Tuple of (tracks, playlist_info, unchanged). playlist_info has 'name' and
+            'snapshot_id' keys (plus 'synced' when unchanged), or is None if unavailable.
+        """
+        snapshot = self.get_playlist_snapshot(playlist_id)
+        cached = self.playlist_cache.load(playlist_id) if snapshot else None
+        if cached and cached['snapshot_id'] == snapshot['snapshot_id']:
+            snapshot['synced'] = cached.get('synced', False)
+            return cached.get('tracks', []), snapshot, True
+        
+        tracks = self._fetch_cached_tail(playlist_id, snapshot, cached)
+        if tracks is not None:
+            return tracks, snapshot, False
+        
+        playlist_info, tracks = self.get_playlist(playlist_id)
+        if playlist_info and playlist_info.get('snapshot_id'):
+            self.playlist_cache.save(
+                playlist_id, playlist_info['snapshot_id'], playlist_info.get('name'), tracks,
+                total=playlist_info.get('total')
+            )
+        return tracks, playlist_info, False
+
+    def stream_playlist_tracks_cached(self, playlist_id: str) -> Tuple[Iterator[List[Track]], Optional[Dict], bool]:
+        """
+        Streaming variant of get_playlist_tracks_cached.
+        Unchanged playlists and playlists that only grew at the end are served
+        as a single page; anything else is streamed with stream_playlist and
+        written to the cache once the last page has been consumed.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            
+        Returns:
+            Tuple of (pages, playlist_info, unchanged). pages yields a list of
+            Tracks per page; playlist_info is as for get_playlist_tracks_cached.
+        """
+        snapshot = self.get_playlist_snapshot(playlist_id)
+        cached = self.playlist_cache.load(playlist_id) if snapshot else None
+        if cached and cached['snapshot_id'] == snapshot['snapshot_id']:
+            snapshot['synced'] = cached.get('synced', False)
+            return iter([cached.get('tracks', [])]), snapshot, True
+        
+        tracks = self._fetch_cached_tail(playlist_id, snapshot, cached)
+        if tracks is not None:
+            return iter([tracks]), snapshot, False
+        
+        playlist_info, pages = self.stream_playlist(playlist_id)
+        if not playlist_info or not playlist_info.get('snapshot_id'):
+            return pages, playlist_info, False
+        
+        def caching_pages() -> Iterator[List[Track]]:
+            tracks = []
+            for page in pages:
+                tracks.extend(page)
+                yield page
+            self.playlist_cache.save(
+                playlist_id, playlist_info['snapshot_id'], playlist_info.get('name'), tracks,
+                total=playlist_info.get('total')
+            )
+        
+        return caching_pages(), playlist_info, False
+
+    def _fetch_cached_tail(
+        self,
+        playlist_id: str,
+        snapshot: Optional[Dict],
+        cached: Optional[Dict]
+    ) -> Optional[List[Track]]:
+        """
+        Extend a cached track list with the tail appended since, and update the cache.
+        
+        Args:
+            playlist_id: Spotify playlist ID or URL
+            snapshot: Current snapshot from get_playlist_snapshot
+            cached: Cached entry from the playlist cache
+            
+        Returns:
+            Full current track list, or None if the tail cannot be used
+        """
+        if not cached or not snapshot or not snapshot.get('total'):
+            return None
+        if settings.get('advanced', 'tail_fetch') is False:
+            return None
+        
+        tracks = self.get_playlist_tail(
+            playlist_id,
+            cached.get('tracks', []),
+            cached.get('total') or 0,
+            snapshot['total']
+        )
+        if tracks is not None:
+            self.playlist_cache.save(
+                playlist_id, snapshot['snapshot_id'], snapshot.get('name'), tracks, total=snapshot['total']
+            )
+        return tracks
@@ -0,0 +1,172 @@
+"""
+Compact, immutable track record used throughout the sync pipeline.
+Only the Spotify fields are stored; matching keys are derived on access,
+and per-run status (e.g. unable to find) lives in a separate TrackStatusTable.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+from spotify_sync.utils.utils import FilenameSanitizer
+
+
+class Track:
+    """Spotify track metadata with derived filename matching keys."""
+
+    __slots__ = ('name', 'artists', 'id', 'url', 'album', 'album_year', 'cover_art_url')
+
+    def __init__(
+        self,
+        name: str,
+        artists: Iterable[str],
+        id: Optional[str],
+        url: str,
+        album: str = 'Unknown',
+        album_year: str = '',
+        cover_art_url: Optional[str] = None
+    ):
+        """
+        Create a track.
+
+        Args:
+            name: Song title
+            artists: Artist names, primary artist first
+            id: Spotify track ID (None for local files)
+            url: Spotify track URL
+            album: Album name
+            album_year: Album release year
+            cover_art_url: URL of the largest album cover image
+        """
+        set_field = object.__setattr__
+        set_field(self, 'name', name)
+        set_field(self, 'artists', tuple(artists))
+        set_field(self, 'id', id)
+        set_field(self, 'url', url)
+        set_field(self, 'album', album)
+        set_field(self, 'album_year', album_year)
+        set_field(self, 'cover_art_url', cover_art_url)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Track is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("Track is immutable")
+
+    def _fields(self) -> Tuple:
+        return (self.name, self.artists, self.id, self.url, self.album, self.album_year, self.cover_art_url)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Track) and self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash(self._fields())
+
+    def __repr__(self) -> str:
+        return f"Track({self.artist_string} - {self.name}, id={self.id})"
+
+    def __reduce__(self):
+        # Slotted immutable objects need explicit pickling support (used by process pools)
+        return (Track, self._fields())
+
+    # Matching keys (see FileManager.is_song_downloaded and CSVManager), derived on
+    # access rather than stored, so large playlists do not carry four extra strings per track
+
+    @property
+    def primary_artist(self) -> str:
+        """First artist, or 'Unknown'."""
+        return self.artists[0] if self.artists else 'Unknown'
+
+    @property
+    def filename_key(self) -> str:
+        """Normalized "Artist - Title" file name (first artist, sanitized title)."""
+        return f"{self.primary_artist} - {FilenameSanitizer.sanitize(self.name)}".lower()
+
+    @property
+    def all_artists_key(self) -> str:
+        """Normalized "Artist, Artist - Title" name with all artists."""
+        return f"{', '.join(self.artists)} - {self.name}".lower()
+
+    @property
+    def title_key(self) -> str:
+        """Normalized song title."""
+        return self.name.lower()
+
+    @property
+    def csv_key(self) -> str:
+        """Normalized "Artist - Title" key of the playlist CSV (title not sanitized)."""
+        return f"{self.primary_artist} - {self.name}".lower()
+
+    @property
+    def key(self) -> str:
+        """Stable identifier: Spotify ID, or the filename key for tracks without one."""
+        return self.id or self.filename_key
+
+    @property
+    def artist_string(self) -> str:
+        """All artists joined with commas, or 'Unknown'."""
+        return ', '.join(self.artists) if self.artists else 'Unknown'
+
+    def to_dict(self) -> Dict:
+        """
+        Convert to a JSON-serializable dictionary.
+
+        Returns:
+            Dict with name, artists, id, url, album, album_year, cover_art_url
+        """
+        return {
+            'name': self.name,
+            'artists': list(self.artists),
+            'id': self.id,
+            'url': self.url,
+            'album': self.album,
+            'album_year': self.album_year,
+            'cover_art_url': self.cover_art_url
+        }
+
+    @staticmethod
+    def from_dict(data: Dict) -> 'Track':
+        """
+        Create a track from a dictionary produced by to_dict.
+
+        Args:
+            data: Track dictionary
+
+        Returns:
+            Track instance
+        """
+        return Track(
+            data['name'],
+            data.get('artists') or [],
+            data.get('id'),
+            data.get('url', ''),
+            data.get('album', 'Unknown'),
+            data.get('album_year', ''),
+            data.get('cover_art_url')
+        )
+
+
+class TrackStatus:
+    """Status values recorded for tracks during a run."""
+    UNABLE_TO_FIND = "unable_to_find"
+    MANUALLY_SKIPPED = "manually_skipped"
+    DOWNLOADED = "downloaded"
+
+
+class TrackStatusTable:
+    """Mutable side table of per-track statuses, keyed by Track.key."""
+
+    def __init__(self):
+        self._statuses = {}
+
+    def set(self, track: Track, status: str) -> None:
+        """Record a status for a track."""
+        self._statuses[track.key] = status
+
+    def get(self, track: Track) -> Optional[str]:
+        """Get the recorded status of a track, if any."""
+        return self._statuses.get(track.key)
+
+    def is_unable_to_find(self, track: Track) -> bool:
+        """Check whether a track was marked as unable to find."""
+        return self._statuses.get(track.key) == TrackStatus.UNABLE_TO_FIND
+
+    def __len__(self) -> int:
+        return len(self._statuses)
@@ -0,0 +1,189 @@
+"""
+Shared, content-addressed store of downloaded tracks.
+Each track is stored once as <store>/<spotify_id>.mp3 and playlist folders get
+hardlinks to it (symlinks or copies where hardlinks are not possible), so a
+track in several playlists is downloaded and stored only once.
+"""
+
+import os
+import shutil
+from typing import Dict, Optional
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_tags import TrackIdTag
+from spotify_sync.utils.utils import FilenameSanitizer
+
+
+class TrackStore:
+    """Stores one audio file per Spotify track ID and links it into playlist folders."""
+
+    # Hidden, so folder listings and the library index skip it
+    FOLDER_NAME = '.store'
+
+    def __init__(self, download_folder: str):
+        """
+        Initialize the store for a download folder.
+
+        Args:
+            download_folder: Base download folder (the store lives in its .store subfolder)
+        """
+        self.folder = os.path.join(download_folder, TrackStore.FOLDER_NAME)
+
+    @staticmethod
+    def get_link_filename(track: Track) -> str:
+        """
+        Get the filename a track is linked under in a playlist folder.
+        Matches the "Artist, Artist - Title.mp3" naming used for downloads.
+
+        Args:
+            track: Track to name
+
+        Returns:
+            File name without directory
+        """
+        return f"{track.artist_string} - {FilenameSanitizer.sanitize(track.name)}.mp3"
+
+    def get_path(self, track_id: str) -> str:
+        """Get the store path for a track ID."""
+        return os.path.join(self.folder, f"{track_id}.mp3")
+
+    def has(self, track_id: Optional[str]) -> bool:
+        """Check whether a track is in the store."""
+        return bool(track_id) and os.path.isfile(self.get_path(track_id))
+
+    @staticmethod
+    def link_file(source: str, destination: str) -> str:
+        """
+        Create destination as a hardlink to source, falling back to a symlink, then a copy.
+
+        Args:
+            source: Existing file
+            destination: Path to create (replaced atomically if it exists)
+
+        Returns:
+            'hardlink', 'symlink' or 'copy'
+        """
+        temp_destination = f"{destination}.link.tmp"
+        if os.path.lexists(temp_destination):
+            os.remove(temp_destination)
+
+        try:
+            os.link(source, temp_destination)
+            method = 'hardlink'
+        except OSError:
+            try:
+                os.symlink(os.path.abspath(source), temp_destination)
+                method = 'symlink'
+            except (OSError, NotImplementedError):
+                shutil.copy2(source, temp_destination)
+                method = 'copy'
+
+        # Replace atomically so an existing file is never left missing
+        os.replace(temp_destination, destination)
+        return method
+
+    def link_track(self, track: Track, playlist_folder: str) -> Optional[str]:
+        """
+        Populate a playlist folder with a stored track.
+
+        Args:
+            track: Track to link
+            playlist_folder: Playlist folder to link into
+
+        Returns:
+            Path of the linked file, or None if the track is not in the store
+        """
+        if not self.has(track.id):
+            return None
+        destination = os.path.join(playlist_folder, TrackStore.get_link_filename(track))
+        try:
+            TrackStore.link_file(self.get_path(track.id), destination)
+        except OSError as e:
+            print(f"⚠ Could not link {track.name} from track store: {e}")
+            return None
+        return destination
+
+    @staticmethod
+    def _is_same_file(first: str, second: str) -> bool:
+        try:
+            return os.path.samefile(first, second)
+        except OSError:
+            return False
+
+    def adopt(self, filepath: str, track_id: Optional[str]) -> str:
+        """
+        Move a freshly downloaded file into the store and link it back in place.
+        If the track is already stored, the file is replaced by a link to the stored copy.
+
+        Args:
+            filepath: Downloaded file inside a playlist folder
+            track_id: Spotify track ID of the file
+
+        Returns:
+            'stored', 'linked' (duplicate replaced by a link) or 'skipped'
+        """
+        if not track_id or os.path.islink(filepath):
+            return 'skipped'
+
+        store_path = self.get_path(track_id)
+        if self._is_same_file(filepath, store_path):
+            return 'skipped'
+
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            if os.path.isfile(store_path):
+                TrackStore.link_file(store_path, filepath)
+                return 'linked'
+
+            temp_store_path = f"{store_path}.tmp"
+            if os.path.lexists(temp_store_path):
+                os.remove(temp_store_path)
+            try:
+                # A hardlink makes the playlist file and the stored file one and the same
+                os.link(filepath, temp_store_path)
+                os.replace(temp_store_path, store_path)
+            except OSError:
+                shutil.copy2(filepath, temp_store_path)
+                os.replace(temp_store_path, store_path)
+                TrackStore.link_file(store_path, filepath)
+            return 'stored'
+        except OSError as e:
+            print(f"⚠ Could not add {os.path.basename(filepath)} to track store: {e}")
+            return 'skipped'
+
+    def dedupe(self, download_folder: str) -> Dict[str, int]:
+        """
+        Convert an existing library in place: every MP3 tagged with a Spotify
+        track ID in the playlist folders is moved into the store, and copies of
+        the same track are replaced by links to the stored file.
+
+        Args:
+            download_folder: Base download folder containing playlist folders
+
+        Returns:
+            Dict with 'files_scanned', 'stored', 'linked', 'untagged' and 'bytes_saved'
+        """
+        stats = {'files_scanned': 0, 'stored': 0, 'linked': 0, 'untagged': 0, 'bytes_saved': 0}
+
+        for playlist_entry in sorted(os.scandir(download_folder), key=lambda entry: entry.name):
+            if playlist_entry.name.startswith('.') or not playlist_entry.is_dir(follow_symlinks=False):
+                continue
+
+            for entry in sorted(os.scandir(playlist_entry.path), key=lambda entry: entry.name):
+                if not entry.name.lower().endswith('.mp3') or not entry.is_file(follow_symlinks=False):
+                    continue
+                stats['files_scanned'] += 1
+
+                track_id = TrackIdTag.read(entry.path)
+                if not track_id:
+                    stats['untagged'] += 1
+                    continue
+
+                size = entry.stat(follow_symlinks=False).st_size
+                result = self.adopt(entry.path, track_id)
+                if result == 'stored':
+                    stats['stored'] += 1
+                elif result == 'linked':
+                    stats['linked'] += 1
+                    stats['bytes_saved'] += size
+
+        return stats
@@ -0,0 +1,181 @@
+"""
+ID3 tags on downloaded files.
+Downloaded MP3s get a TXXX:SPOTIFY_TRACK_ID frame so they can be matched to
+playlist tracks by ID instead of by filename. Reading only parses ID3 frame
+headers and skips frame bodies (e.g. cover art) it does not need. TrackTagger
+writes all Spotify metadata in a single save.
+"""
+
+import struct
+from typing import Optional
+from spotify_sync.core.track import Track
+
+
+class TrackIdTag:
+    """Reads and writes the Spotify track ID stored in an ID3 TXXX frame."""
+
+    FRAME_DESC = 'SPOTIFY_TRACK_ID'
+
+    _ID3_HEADER = struct.Struct('>3sBBB4s')
+    _FRAME_HEADER = struct.Struct('>4s4sH')
+
+    # ID3v2 tag header flags
+    _FLAG_UNSYNCHRONISATION = 0x80
+    _FLAG_EXTENDED_HEADER = 0x40
+
+    _ENCODINGS = {0: 'latin-1', 1: 'utf-16', 2: 'utf-16-be', 3: 'utf-8'}
+
+    @staticmethod
+    def _syncsafe(data: bytes) -> int:
+        """Decode a 4-byte syncsafe integer (7 bits per byte)."""
+        return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+    @staticmethod
+    def _parse_txxx(body: bytes) -> Optional[tuple]:
+        """
+        Split a TXXX frame body into description and value.
+
+        Returns:
+            Tuple of (description, value), or None if the body is malformed
+        """
+        if not body:
+            return None
+        encoding = TrackIdTag._ENCODINGS.get(body[0])
+        if encoding is None:
+            return None
+
+        text = body[1:]
+        if body[0] in (1, 2):
+            # UTF-16: the terminator is two zero bytes on a character boundary
+            split = 0
+            while split + 1 < len(text) and text[split:split + 2] != b'\0\0':
+                split += 2
+            description, value = text[:split], text[split + 2:]
+        else:
+            description, _, value = text.partition(b'\0')
+
+        try:
+            return (
+                description.decode(encoding).lstrip('\ufeff'),
+                value.decode(encoding).lstrip('\ufeff').rstrip('\0')
+            )
+        except UnicodeDecodeError:
+            return None
+
+    @staticmethod
+    def read(filepath: str) -> Optional[str]:
+        """
+        Read the Spotify track ID of a file without loading the whole tag.
+
+        Args:
+            filepath: Path to an MP3 file
+
+        Returns:
+            Spotify track ID, or None if the file has no ID tag (or no readable ID3v2.3/2.4 tag)
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.read(TrackIdTag._ID3_HEADER.size)
+                if len(header) < TrackIdTag._ID3_HEADER.size:
+                    return None
+                magic, version, _, flags, size = TrackIdTag._ID3_HEADER.unpack(header)
+                if magic != b'ID3' or version not in (3, 4):
+                    return None
+                if flags & TrackIdTag._FLAG_UNSYNCHRONISATION and version == 3:
+                    return None
+
+                end = TrackIdTag._ID3_HEADER.size + TrackIdTag._syncsafe(size)
+                if flags & TrackIdTag._FLAG_EXTENDED_HEADER:
+                    extended_size = f.read(4)
+                    if len(extended_size) < 4:
+                        return None
+                    if version == 4:
+                        f.seek(TrackIdTag._syncsafe(extended_size) - 4, 1)
+                    else:
+                        f.seek(struct.unpack('>I', extended_size)[0], 1)
+
+                while f.tell() + TrackIdTag._FRAME_HEADER.size <= end:
+                    frame_header = f.read(TrackIdTag._FRAME_HEADER.size)
+                    frame_id, frame_size, _ = TrackIdTag._FRAME_HEADER.unpack(frame_header)
+                    if frame_id[0] == 0:
+                        return None  # Reached padding
+                    frame_size = TrackIdTag._syncsafe(frame_size) if version == 4 else struct.unpack('>I', frame_size)[0]
+                    if frame_id != b'TXXX':
+                        f.seek(frame_size, 1)
+                        continue
+
+                    parsed = TrackIdTag._parse_txxx(f.read(frame_size))
+                    if parsed and parsed[0] == TrackIdTag.FRAME_DESC and parsed[1]:
+                        return parsed[1]
+        except (OSError, struct.error):
+            return None
+        return None
+
+    @staticmethod
+    def write(filepath: str, track_id: str) -> bool:
+        """
+        Store a Spotify track ID in a file's ID3 tag.
+
+        Args:
+            filepath: Path to an MP3 file
+            track_id: Spotify track ID
+
+        Returns:
+            True if the tag was written
+        """
+        try:
+            from mutagen.id3 import ID3, ID3NoHeaderError
+            from mutagen.id3._frames import TXXX
+            try:
+                id3 = ID3(filepath)
+            except ID3NoHeaderError:
+                id3 = ID3()
+            id3.delall(f'TXXX:{TrackIdTag.FRAME_DESC}')
+            id3.add(TXXX(encoding=3, desc=TrackIdTag.FRAME_DESC, text=[track_id]))
+            id3.save(filepath, v2_version=3)
+            return True
+        except Exception as e:
+            print(f"⚠ Could not write track ID tag: {str(e)}")
+            return False
+
+
+class TrackTagger:
+    """Writes a track's Spotify metadata, cover art and ID tag to an MP3 in one pass."""
+
+    @staticmethod
+    def write(filepath: str, track: Track, cover_data: Optional[bytes] = None) -> bool:
+        """
+        Apply Spotify metadata to a file, loading and saving its ID3 tag once.
+        Frames not set here (e.g. lyrics added by spotdl) are kept.
+
+        Args:
+            filepath: Path to an MP3 file
+            track: Track whose metadata to write
+            cover_data: JPEG cover image to embed (existing cover art is kept if None)
+
+        Returns:
+            True if the tag was written
+        """
+        try:
+            from mutagen.id3 import ID3, ID3NoHeaderError
+            from mutagen.id3._frames import APIC, TALB, TDRC, TIT2, TPE1, TXXX
+            try:
+                id3 = ID3(filepath)
+            except ID3NoHeaderError:
+                id3 = ID3()
+
+            id3.setall('TIT2', [TIT2(encoding=3, text=[track.name or 'Unknown'])])
+            id3.setall('TPE1', [TPE1(encoding=3, text=[track.artist_string])])
+            id3.setall('TALB', [TALB(encoding=3, text=[track.album])])
+            if track.album_year:
+                id3.setall('TDRC', [TDRC(encoding=3, text=[track.album_year])])
+            if cover_data:
+                id3.setall('APIC', [APIC(encoding=3, mime='image/jpeg', type=3, desc='', data=cover_data)])
+            if track.id:
+                id3.setall(f'TXXX:{TrackIdTag.FRAME_DESC}', [TXXX(encoding=3, desc=TrackIdTag.FRAME_DESC, text=[track.id])])
+
+            id3.save(filepath, v2_version=3)
+            return True
+        except Exception as e:
+            print(f"⚠ Could not write tags to {filepath}: {str(e)}")
+            return False
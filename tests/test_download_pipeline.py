@@ -0,0 +1,206 @@
+"""DownloadPipeline stage hand-off, failure handling, early stop and metrics."""
+
+import os
+import threading
+import pytest
+from spotify_sync.core import download_pipeline
+from spotify_sync.core.download_pipeline import DownloadPipeline, PipelineMetrics
+from spotify_sync.core.settings_manager import settings
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_store import TrackStore
+
+
+def make_track(n):
+    return Track(f'Song {n}', ['Artist'], f'id{n}', f'https://open.spotify.com/track/id{n}', 'Album', '2020')
+
+
+class FakeResolutionCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, track_id):
+        self.invalidated.append(track_id)
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    """Replace searching, downloading and download cancellation with in-memory fakes."""
+    state = {
+        'urls': {},
+        'downloads': [],
+        'download_ok': True,
+        'cancelled': 0,
+        'resumed': 0,
+        'cache': FakeResolutionCache(),
+    }
+
+    def get_youtube_url(track, dont_filter=False):
+        return state['urls'].get(track.id, f'https://youtu.be/{track.id}')
+
+    def download_with_retries(download, job_folder, description):
+        state['downloads'].append(description)
+        if state['download_ok']:
+            with open(os.path.join(job_folder, 'source.webm'), 'wb') as f:
+                f.write(b'audio')
+        return state['download_ok']
+
+    def cancel():
+        state['cancelled'] += 1
+
+    def resume():
+        state['resumed'] += 1
+
+    monkeypatch.setattr(download_pipeline.SpotdlDownloader, 'get_youtube_url', staticmethod(get_youtube_url))
+    monkeypatch.setattr(download_pipeline.SpotdlDownloader, 'download_with_retries', staticmethod(download_with_retries))
+    monkeypatch.setattr(download_pipeline.ResolutionCache, 'get_instance', staticmethod(lambda: state['cache']))
+    monkeypatch.setattr(download_pipeline, 'cancel_downloads', cancel)
+    monkeypatch.setattr(download_pipeline, 'resume_downloads', resume)
+    return state
+
+
+def fake_tag(item):
+    """Stand-in for transcoding: rename the download to its final name."""
+    target = os.path.join(item.job_folder, f"{item.track.artist_string} - {item.track.name}.mp3")
+    os.replace(item.filepath, target)
+    item.filepath = target
+
+
+def fake_verify(item):
+    """Stand-in for verification: move the file into its playlist folder."""
+    final_filepath = os.path.join(item.folder, os.path.basename(item.filepath))
+    os.replace(item.filepath, final_filepath)
+    item.filepath = final_filepath
+
+
+def make_pipeline(download_folder, store=None, tag=fake_tag, verify=fake_verify):
+    pipeline = DownloadPipeline(download_folder, store=store)
+    pipeline.stages = [
+        ('resolve', 2, pipeline._resolve),
+        ('download', 2, pipeline._download),
+        ('tag', 2, tag),
+        ('verify', 1, verify),
+    ]
+    return pipeline
+
+
+@pytest.fixture
+def folder(tmp_path):
+    path = tmp_path / 'Playlist'
+    path.mkdir()
+    return path
+
+
+def test_songs_go_through_every_stage(tmp_path, folder, fakes):
+    tracks = [make_track(n) for n in range(20)]
+    started = []
+
+    with make_pipeline(str(tmp_path)) as pipeline:
+        results = list(pipeline.run(((track, str(folder)) for track in tracks), on_download=lambda t, f: started.append(t)))
+        work_folder = pipeline.work_folder
+
+    assert sorted(result.track.id for result in results) == sorted(track.id for track in tracks)
+    assert all(result.downloaded and not result.error for result in results)
+    assert sorted(track.id for track in started) == sorted(track.id for track in tracks)
+    assert sorted(os.listdir(folder)) == sorted(f'Artist - Song {n}.mp3' for n in range(20))
+    assert not os.path.exists(work_folder)
+    assert fakes['cancelled'] == 0
+
+
+def test_unresolved_song_stops_at_resolve(tmp_path, folder, fakes):
+    fakes['urls']['id1'] = None
+
+    with make_pipeline(str(tmp_path)) as pipeline:
+        results = {result.track.id: result for result in pipeline.run([(make_track(1), str(folder)), (make_track(2), str(folder))])}
+
+    assert results['id1'].error == 'no match found'
+    assert not results['id1'].downloaded
+    assert results['id2'].downloaded
+    assert fakes['downloads'] == ['Download of Song 2']
+    # Only a rejected download drops the cached resolution
+    assert fakes['cache'].invalidated == []
+
+
+def test_failed_download_drops_the_resolution(tmp_path, folder, fakes):
+    fakes['download_ok'] = False
+
+    with make_pipeline(str(tmp_path)) as pipeline:
+        results = list(pipeline.run([(make_track(1), str(folder))]))
+
+    assert results[0].error == 'download failed'
+    assert fakes['cache'].invalidated == ['id1']
+    assert os.listdir(folder) == []
+
+
+def test_stage_exception_keeps_the_resolution(tmp_path, folder, fakes):
+    def broken_tag(item):
+        raise RuntimeError('ffmpeg crashed')
+
+    with make_pipeline(str(tmp_path), tag=broken_tag) as pipeline:
+        results = list(pipeline.run([(make_track(1), str(folder))]))
+        # The failed song's work files are cleaned up right away
+        assert os.listdir(pipeline.work_folder) == []
+
+    assert results[0].error == 'ffmpeg crashed'
+    assert fakes['cache'].invalidated == []
+    assert os.listdir(folder) == []
+
+
+def test_stored_song_is_linked_without_downloading(tmp_path, folder, fakes):
+    track = make_track(1)
+    store = TrackStore(str(tmp_path))
+    stored = tmp_path / 'stored.mp3'
+    stored.write_bytes(b'audio')
+    store.adopt(str(stored), track.id)
+    started = []
+
+    with make_pipeline(str(tmp_path), store=store) as pipeline:
+        results = list(pipeline.run([(track, str(folder))], on_download=lambda t, f: started.append(t)))
+
+    assert results[0].linked and results[0].downloaded
+    assert started == []
+    assert fakes['downloads'] == []
+    assert os.path.samefile(folder / TrackStore.get_link_filename(track), store.get_path(track.id))
+
+
+def test_stopping_early_cancels_downloads(tmp_path, folder, fakes):
+    with make_pipeline(str(tmp_path)) as pipeline:
+        results = pipeline.run((make_track(n), str(folder)) for n in range(50))
+        first = next(results)
+        results.close()
+        # Every stage thread has stopped once close() returns
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')]
+
+    assert first.downloaded
+    assert fakes['cancelled'] == 1
+    assert fakes['resumed'] == 1
+
+
+def test_is_enabled_requires_ffmpeg(monkeypatch, capsys):
+    monkeypatch.setitem(settings._settings['advanced'], 'download_pipeline', True)
+    monkeypatch.setattr(DownloadPipeline, '_warned_no_ffmpeg', False)
+    monkeypatch.setattr(download_pipeline.shutil, 'which', lambda name: None)
+    assert not DownloadPipeline.is_enabled()
+    assert not DownloadPipeline.is_enabled()
+    assert capsys.readouterr().out.count('needs ffmpeg') == 1
+
+    monkeypatch.setattr(download_pipeline.shutil, 'which', lambda name: '/usr/bin/ffmpeg')
+    assert DownloadPipeline.is_enabled()
+    monkeypatch.setitem(settings._settings['advanced'], 'download_pipeline', False)
+    assert not DownloadPipeline.is_enabled()
+
+
+def test_metrics():
+    metrics = PipelineMetrics()
+    assert metrics.get_bottleneck() is None
+
+    metrics.add('resolve', 4, songs=2, busy=1.0, starved=3.0)
+    metrics.add('download', 2, songs=2, failed=1, busy=3.0, blocked=1.0)
+    metrics.add('download', 3, songs=1)
+
+    stats = metrics.get_stats()
+    assert list(stats) == ['resolve', 'download']
+    assert stats['resolve']['utilization'] == 0.25
+    assert stats['download'] == {
+        'workers': 3, 'songs': 3, 'failed': 1, 'busy': 3.0, 'starved': 0.0, 'blocked': 1.0, 'utilization': 0.75
+    }
+    assert metrics.get_bottleneck() == 'download'
@@ -0,0 +1,101 @@
+"""DownloadPlan deduplication across playlists and distribution of shared tracks."""
+
+import os
+import pytest
+from spotify_sync.core.download_plan import DownloadPlan, PlannedDownload
+from spotify_sync.core.settings_manager import settings, Config
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_store import TrackStore
+
+
+def make_track(n, artist='Artist'):
+    return Track(f'Song {n}', [artist], f'id{n}', f'https://open.spotify.com/track/id{n}', 'Album', '2020')
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """Run in an empty folder with folders listed directly (no shared library index)."""
+    monkeypatch.setitem(settings._settings['advanced'], 'library_index', False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_add_deduplicates_tracks():
+    plan = DownloadPlan()
+    first, second = make_track(1), make_track(2)
+    plan.add(first, 'A')
+    plan.add(second, 'A')
+    plan.add(first, 'B')
+    plan.add(first, 'B')
+
+    assert len(plan) == 2
+    assert plan.occurrences == 3
+    assert plan.saved == 1
+    assert [planned.track for planned in plan.downloads] == [first, second]
+    assert plan.downloads[0].folders == ['A', 'B']
+
+
+def test_build_skips_downloaded_and_unfindable_tracks(library):
+    shared, downloaded, unfindable = make_track(1), make_track(2), make_track(3)
+    os.makedirs(library / 'One')
+    (library / 'One' / 'Artist - Song 2.mp3').write_bytes(b'audio')
+    with open(library / 'Two.csv', 'w', encoding='utf-8') as f:
+        f.write(f"Artist,Song Title,Status\nArtist,Song 3,{Config.CSV_STATUS_UNABLE_TO_FIND}\n")
+
+    plan = DownloadPlan.build([
+        ('id_one', [shared, downloaded], {'name': 'One'}),
+        ('id_two', [downloaded, shared, unfindable], {'name': 'Two'}),
+    ], str(library))
+
+    assert [planned.track for planned in plan.downloads] == [shared, downloaded]
+    assert plan.downloads[0].folders == [str(library / 'One'), str(library / 'Two')]
+    assert plan.downloads[1].folders == [str(library / 'Two')]
+    assert plan.saved == 1
+    assert os.path.isdir(library / 'Two')
+
+
+def test_find_downloaded_file_by_name(library):
+    os.makedirs(library / 'One')
+    (library / 'One' / 'Artist - Song 1.mp3').write_bytes(b'audio')
+
+    found = DownloadPlan.find_downloaded_file(str(library / 'One'), make_track(1))
+    assert found == str(library / 'One' / 'Artist - Song 1.mp3')
+    assert DownloadPlan.find_downloaded_file(str(library / 'One'), make_track(2)) is None
+
+
+def test_distribute_links_the_downloaded_file(library):
+    track = make_track(1)
+    for folder in ('One', 'Two', 'Three'):
+        os.makedirs(library / folder)
+    (library / 'One' / 'Artist - Song 1.mp3').write_bytes(b'audio')
+    planned = PlannedDownload(track)
+    planned.folders.extend(str(library / folder) for folder in ('One', 'Two', 'Three'))
+
+    assert DownloadPlan.distribute(planned) == 2
+    for folder in ('Two', 'Three'):
+        assert (library / folder / 'Artist - Song 1.mp3').read_bytes() == b'audio'
+
+
+def test_distribute_from_the_store(library):
+    track = make_track(1)
+    store = TrackStore(str(library))
+    for folder in ('One', 'Two'):
+        os.makedirs(library / folder)
+    downloaded = library / 'One' / 'download.mp3'
+    downloaded.write_bytes(b'audio')
+    store.adopt(str(downloaded), track.id)
+    planned = PlannedDownload(track)
+    planned.folders.extend([str(library / 'One'), str(library / 'Two')])
+
+    assert DownloadPlan.distribute(planned, store) == 1
+    assert os.path.samefile(library / 'Two' / TrackStore.get_link_filename(track), store.get_path(track.id))
+
+
+def test_distribute_without_other_folders_or_source(library):
+    planned = PlannedDownload(make_track(1))
+    planned.folders.append(str(library / 'One'))
+    assert DownloadPlan.distribute(planned) == 0
+
+    os.makedirs(library / 'One')
+    planned.folders.append(str(library / 'Two'))
+    assert DownloadPlan.distribute(planned) == 0
@@ -0,0 +1,120 @@
+"""DownloadQueue job lifecycle: enqueue, start, finish, recovery and claiming."""
+
+import os
+import pytest
+from spotify_sync.core.download_queue import DownloadQueue
+from spotify_sync.core.track import Track
+
+# A PID no live process has (above the Linux maximum)
+DEAD_PID = 2 ** 22 + 1
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return DownloadQueue(str(tmp_path / 'queue.db'))
+
+
+def make_track(number):
+    return Track(f"Song {number}", [f"Artist {number}"], f"id{number}", f"https://open.spotify.com/track/id{number}")
+
+
+def job_row(queue, job_id):
+    return queue._conn.execute(
+        'SELECT state, attempts, owner_pid, work_folder FROM jobs WHERE id = ?', (job_id,)
+    ).fetchone()
+
+
+def abandon(queue):
+    """Pretend the process that owns every job has died."""
+    queue._conn.execute('UPDATE jobs SET owner_pid = ?', (DEAD_PID,))
+    queue._conn.commit()
+
+
+def test_enqueue_is_idempotent_per_track_and_folder(queue, tmp_path):
+    folder = str(tmp_path / 'playlist')
+    first = queue.enqueue(make_track(1), folder)
+    assert queue.enqueue(make_track(1), folder) == first
+    assert queue.enqueue(make_track(1), str(tmp_path / 'other')) != first
+    assert job_row(queue, first)[:3] == (DownloadQueue.PENDING, 0, os.getpid())
+
+
+def test_start_and_finish(queue, tmp_path):
+    job_id = queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    queue.start([job_id], str(tmp_path / 'work'))
+    assert job_row(queue, job_id) == (DownloadQueue.IN_PROGRESS, 1, os.getpid(), str(tmp_path / 'work'))
+
+    queue.finish(job_id, True)
+    assert job_row(queue, job_id) == (DownloadQueue.DONE, 1, None, None)
+
+    # Missing again: back to pending with a fresh attempt count
+    queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    assert job_row(queue, job_id)[:2] == (DownloadQueue.PENDING, 0)
+
+
+def test_enqueue_leaves_jobs_in_progress_alone(queue, tmp_path):
+    job_id = queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    queue.start([job_id])
+    queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    assert job_row(queue, job_id)[0] == DownloadQueue.IN_PROGRESS
+
+
+def test_recover_resets_abandoned_jobs_and_removes_their_work_folder(queue, tmp_path):
+    playlist = tmp_path / 'playlist'
+    playlist.mkdir()
+    partial = playlist / 'someone elses download.part'
+    partial.write_bytes(b'')
+    work_folder = tmp_path / 'work'
+    work_folder.mkdir()
+    (work_folder / 'song.part').write_bytes(b'')
+
+    job_id = queue.enqueue(make_track(1), str(playlist))
+    queue.start([job_id], str(work_folder))
+    assert queue.recover() == 0  # Owner (this process) is alive
+
+    abandon(queue)
+    assert queue.recover() == 1
+    assert job_row(queue, job_id) == (DownloadQueue.PENDING, 1, None, None)
+    assert not work_folder.exists()
+    # Playlist folders may hold partial files of live processes
+    assert partial.exists()
+
+
+def test_claim_pending_skips_jobs_of_live_processes(queue, tmp_path):
+    queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    assert queue.claim_pending(str(tmp_path)) == []
+
+    abandon(queue)
+    claimed = queue.claim_pending(str(tmp_path))
+    assert [job.track for job in claimed] == [make_track(1)]
+    assert claimed[0].folder == os.path.abspath(str(tmp_path / 'playlist'))
+    # Now owned by this process, so not claimed twice
+    assert queue.claim_pending(str(tmp_path)) == []
+
+
+def test_claim_pending_only_takes_jobs_of_the_base_folder(queue, tmp_path):
+    queue.enqueue(make_track(1), str(tmp_path / 'a' / 'playlist'))
+    abandon(queue)
+    assert queue.claim_pending(str(tmp_path / 'b')) == []
+    assert len(queue.claim_pending(str(tmp_path / 'a'))) == 1
+
+
+def test_claim_pending_gives_up_after_max_attempts(queue, tmp_path):
+    job_id = queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    for _ in range(DownloadQueue.MAX_ATTEMPTS):
+        queue.start([job_id])
+        abandon(queue)
+        queue.recover()
+
+    assert queue.claim_pending(str(tmp_path)) == []
+    assert job_row(queue, job_id)[0] == DownloadQueue.FAILED
+
+
+def test_requeued_abandoned_job_keeps_its_attempts(queue, tmp_path):
+    job_id = queue.enqueue(make_track(1), str(tmp_path / 'playlist'))
+    queue.start([job_id])
+    abandon(queue)
+    queue.recover()
+
+    # A later run finding the track still missing takes the job over
+    assert queue.enqueue(make_track(1), str(tmp_path / 'playlist')) == job_id
+    assert job_row(queue, job_id)[:3] == (DownloadQueue.PENDING, 1, os.getpid())
@@ -0,0 +1,134 @@
+"""LibraryIndex listings, mtime-based freshness and lazily read track IDs."""
+
+import os
+import pytest
+from spotify_sync.core import library_index
+from spotify_sync.core.library_index import LibraryIndex
+
+OLD_MTIME_NS = 1_000_000_000_000_000_000
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LibraryIndex(str(tmp_path / 'library.db'))
+
+
+@pytest.fixture
+def folder(tmp_path):
+    path = tmp_path / 'music'
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def tag_reads(monkeypatch):
+    """Serve ID tags from a dict and record which files were read."""
+    tags = {}
+    reads = []
+
+    def read(filepath):
+        name = os.path.basename(filepath)
+        reads.append(name)
+        return tags.get(name)
+
+    monkeypatch.setattr(library_index.TrackIdTag, 'read', staticmethod(read))
+    return tags, reads
+
+
+def age_folder(folder):
+    """Backdate a folder's mtime so its listing counts as settled."""
+    os.utime(folder, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def test_lists_files_without_hidden_entries(index, folder):
+    (folder / 'a.mp3').write_bytes(b'a')
+    (folder / '.hidden').write_bytes(b'h')
+    assert index.list_files(str(folder)) == ['a.mp3']
+    assert index.list_files(str(folder / 'missing')) == []
+
+
+def test_settled_folder_is_not_rescanned(index, folder):
+    (folder / 'a.mp3').write_bytes(b'a')
+    age_folder(folder)
+    assert index.list_files(str(folder)) == ['a.mp3']
+
+    # Adding a file without moving the folder mtime is invisible to the index
+    (folder / 'b.mp3').write_bytes(b'b')
+    age_folder(folder)
+    assert index.list_files(str(folder)) == ['a.mp3']
+
+    index.invalidate(str(folder))
+    assert sorted(index.list_files(str(folder))) == ['a.mp3', 'b.mp3']
+
+
+def test_changed_folder_is_rescanned(index, folder):
+    (folder / 'a.mp3').write_bytes(b'a')
+    age_folder(folder)
+    index.list_files(str(folder))
+
+    (folder / 'a.mp3').unlink()
+    (folder / 'b.mp3').write_bytes(b'b')
+    assert index.list_files(str(folder)) == ['b.mp3']
+
+
+def test_recently_scanned_folder_is_not_trusted(index, folder):
+    (folder / 'a.mp3').write_bytes(b'a')
+    index.list_files(str(folder))
+
+    # Same mtime, but the scan happened within the mtime granularity
+    mtime_ns = os.stat(folder).st_mtime_ns
+    (folder / 'b.mp3').write_bytes(b'b')
+    os.utime(folder, ns=(mtime_ns, mtime_ns))
+    assert sorted(index.list_files(str(folder))) == ['a.mp3', 'b.mp3']
+
+
+def test_track_ids_are_read_once(index, folder, tag_reads):
+    tags, reads = tag_reads
+    tags.update({'a.mp3': 'id_a'})
+    (folder / 'a.mp3').write_bytes(b'a')
+    (folder / 'b.mp3').write_bytes(b'b')
+    (folder / 'cover.jpg').write_bytes(b'c')
+
+    assert index.get_track_ids(str(folder)) == {'a.mp3': 'id_a'}
+    assert sorted(reads) == ['a.mp3', 'b.mp3']
+
+    reads.clear()
+    assert index.get_track_ids(str(folder)) == {'a.mp3': 'id_a'}
+    assert reads == []
+
+
+def test_replaced_file_is_read_again(index, folder, tag_reads):
+    tags, reads = tag_reads
+    tags['a.mp3'] = 'id_old'
+    (folder / 'a.mp3').write_bytes(b'a')
+    index.get_track_ids(str(folder))
+
+    tags['a.mp3'] = 'id_new'
+    (folder / 'a.mp3').write_bytes(b'replaced')
+    reads.clear()
+    index.invalidate(str(folder))
+    assert index.get_track_ids(str(folder)) == {'a.mp3': 'id_new'}
+    assert reads == ['a.mp3']
+
+
+def test_recorded_track_id_skips_reading(index, folder, tag_reads):
+    _, reads = tag_reads
+    filepath = folder / 'a.mp3'
+    filepath.write_bytes(b'a')
+    index.list_files(str(folder))
+
+    index.record_track_id(str(filepath), 'id_a')
+    assert index.get_track_ids(str(folder), refresh=False) == {'a.mp3': 'id_a'}
+    assert reads == []
+    index.record_track_id(str(folder / 'missing.mp3'), 'id_b')
+    assert index.get_track_ids(str(folder), refresh=False) == {'a.mp3': 'id_a'}
+
+
+def test_listing_persists_across_instances(tmp_path, folder):
+    (folder / 'a.mp3').write_bytes(b'a')
+    age_folder(folder)
+    LibraryIndex(str(tmp_path / 'library.db')).list_files(str(folder))
+
+    (folder / 'b.mp3').write_bytes(b'b')
+    age_folder(folder)
+    assert LibraryIndex(str(tmp_path / 'library.db')).list_files(str(folder)) == ['a.mp3']
@@ -0,0 +1,57 @@
+"""SongMatchIndex must answer substring queries exactly like a linear scan."""
+
+import random
+from spotify_sync.core.match_index import SongMatchIndex
+
+WORDS = ['love', 'night', 'heart', 'fire', 'dream', 'blue', 'ab', 'x', 'dé jà', 'rain']
+
+
+def linear_contains(names, text, excluded=None):
+    excluded = excluded or {}
+    return any(text in name for name in names if name not in excluded)
+
+
+def make_names(rng, count):
+    return [
+        f"artist {rng.randint(0, 50)} - {' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))}"
+        for _ in range(count)
+    ]
+
+
+def test_substring_queries_match_linear_scan():
+    rng = random.Random(7)
+    names = make_names(rng, 300)
+    index = SongMatchIndex(names)
+    queries = make_names(rng, 100) + WORDS + ['', 'a', 'ni', 'ght', 'not there', 'artist 1', 'fire fire']
+    for text in queries:
+        assert index.contains_substring(text) == linear_contains(names, text), text
+
+
+def test_substring_queries_with_excluded_names_match_linear_scan():
+    rng = random.Random(11)
+    names = make_names(rng, 200)
+    index = SongMatchIndex(names)
+    excluded = {name: 'some-id' for name in rng.sample(names, 50)}
+    for text in WORDS + ['artist 2', 'he', 'love night']:
+        assert index.contains_substring(text, excluded) == linear_contains(names, text, excluded), text
+
+
+def test_behaves_like_a_set_of_names():
+    index = SongMatchIndex(['a - one', 'b - two'], {'a - one': 'id1'})
+    assert index == {'a - one', 'b - two'}
+    assert 'b - two' in index
+    assert index.track_ids == {'id1'}
+
+
+def test_get_claimed_only_claims_files_of_playlist_tracks():
+    index = SongMatchIndex(['a - one', 'b - two'], {'a - one': 'id1', 'b - two': 'id2'})
+    assert index.get_claimed() == {'a - one': 'id1', 'b - two': 'id2'}
+    assert index.get_claimed(frozenset({'id2', 'id3'})) == {'b - two': 'id2'}
+
+
+def test_get_claimed_follows_a_growing_id_set():
+    index = SongMatchIndex(['a - one', 'b - two'], {'a - one': 'id1', 'b - two': 'id2'})
+    playlist_ids = {'id1'}
+    assert index.get_claimed(playlist_ids) == {'a - one': 'id1'}
+    playlist_ids.update({'id2'})
+    assert index.get_claimed(playlist_ids) == {'a - one': 'id1', 'b - two': 'id2'}
@@ -0,0 +1,147 @@
+"""PlaylistCache round trips and the boundary check of SpotifyClient.get_playlist_tail."""
+
+import pytest
+from spotify_sync.core.playlist_cache import PlaylistCache
+from spotify_sync.core.spotify_api import SpotifyClient
+from spotify_sync.core.track import Track
+
+
+def make_track(n):
+    return Track(f'Song {n}', ['Artist'], f'id{n}', f'https://open.spotify.com/track/id{n}', 'Album', '2020')
+
+
+def make_item(track):
+    return {'track': {
+        'name': track.name,
+        'artists': [{'name': artist} for artist in track.artists],
+        'id': track.id,
+        'external_urls': {'spotify': track.url},
+        'album': {'name': track.album, 'release_date': f'{track.album_year}-01-01', 'images': []},
+    }}
+
+
+class FakeApi:
+    """Serves playlist items from a list, like spotipy's playlist_items."""
+
+    def __init__(self, items):
+        self.items = items
+        self.offsets = []
+
+    def playlist_items(self, playlist_id, fields=None, limit=100, offset=0):
+        self.offsets.append(offset)
+        return {'items': self.items[offset:offset + limit]}
+
+
+def make_client(items):
+    """Build a SpotifyClient without credentials whose requests hit a FakeApi."""
+    client = object.__new__(SpotifyClient)
+    client.client = FakeApi(items)
+    client._call = lambda func, *args, **kwargs: func(*args, **kwargs)
+    client.remaining_requests = []
+
+    def fetch_remaining(playlist_id, start, total, max_workers):
+        client.remaining_requests.append((start, total))
+        return [SpotifyClient._parse_track(item) for item in client.client.items[start:total]]
+
+    client._fetch_remaining_tracks = fetch_remaining
+    return client
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PlaylistCache(str(tmp_path))
+
+
+def test_normalize_id():
+    assert PlaylistCache.normalize_id('https://open.spotify.com/playlist/abc?si=1') == 'abc'
+    assert PlaylistCache.normalize_id('spotify:playlist:abc') == 'abc'
+    assert PlaylistCache.normalize_id('abc') == 'abc'
+
+
+def test_save_and_load(cache):
+    tracks = [make_track(1), make_track(2)]
+    cache.save('https://open.spotify.com/playlist/abc', 'snap1', 'Mix', tracks, total=3)
+
+    entry = cache.load('abc')
+    assert entry['snapshot_id'] == 'snap1'
+    assert entry['name'] == 'Mix'
+    assert entry['total'] == 3
+    assert entry['synced'] is False
+    assert entry['tracks'] == tracks
+    assert cache.load('missing') is None
+
+
+def test_save_without_snapshot_is_ignored(cache):
+    cache.save('abc', None, 'Mix', [make_track(1)])
+    assert cache.load('abc') is None
+
+
+def test_corrupt_file_is_a_miss(cache):
+    cache.save('abc', 'snap1', 'Mix', [make_track(1)])
+    with open(cache._get_filepath('abc'), 'w', encoding='utf-8') as f:
+        f.write('{not json')
+    assert cache.load('abc') is None
+
+
+def test_mark_synced(cache):
+    cache.mark_synced('abc')
+    assert cache.load('abc') is None
+
+    cache.save('abc', 'snap1', 'Mix', [make_track(1)], total=1)
+    cache.mark_synced('abc')
+    entry = cache.load('abc')
+    assert entry['synced'] is True
+    assert entry['snapshot_id'] == 'snap1'
+    assert entry['total'] == 1
+
+    cache.mark_synced('abc', False)
+    assert cache.load('abc')['synced'] is False
+
+
+def test_tail_appends_new_tracks_after_the_boundary():
+    tracks = [make_track(n) for n in range(5)]
+    client = make_client([make_item(track) for track in tracks])
+
+    result = client.get_playlist_tail('abc', tracks[:3], 3, 5, max_workers=1)
+    assert result == tracks
+    # The first request starts at the last cached item
+    assert client.client.offsets == [2]
+
+
+def test_tail_fetches_pages_past_the_boundary_page():
+    tracks = [make_track(n) for n in range(250)]
+    client = make_client([make_item(track) for track in tracks])
+
+    result = client.get_playlist_tail('abc', tracks[:120], 120, 250, max_workers=1)
+    assert result == tracks
+    assert client.client.offsets == [119]
+    assert client.remaining_requests == [(219, 250)]
+
+
+def test_tail_rejects_a_changed_boundary():
+    tracks = [make_track(n) for n in range(5)]
+    items = [make_item(track) for track in tracks]
+    items[2] = make_item(make_track(99))
+    client = make_client(items)
+
+    assert client.get_playlist_tail('abc', tracks[:3], 3, 5, max_workers=1) is None
+    assert client.remaining_requests == []
+
+
+def test_tail_rejects_a_removed_boundary_item():
+    tracks = [make_track(n) for n in range(5)]
+    items = [make_item(track) for track in tracks]
+    items[2] = {'track': None}
+    client = make_client(items)
+
+    assert client.get_playlist_tail('abc', tracks[:3], 3, 5, max_workers=1) is None
+
+
+def test_tail_needs_a_longer_playlist():
+    tracks = [make_track(n) for n in range(3)]
+    client = make_client([make_item(track) for track in tracks])
+
+    assert client.get_playlist_tail('abc', tracks, 3, 3, max_workers=1) is None
+    assert client.get_playlist_tail('abc', tracks, 3, 2, max_workers=1) is None
+    assert client.get_playlist_tail('abc', [], 0, 3, max_workers=1) is None
+    assert client.client.offsets == []
@@ -0,0 +1,83 @@
+"""RateLimiter token bucket, throttling and recovery."""
+
+import threading
+import pytest
+from spotify_sync.core import rate_limiter
+from spotify_sync.core.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake)
+    return fake
+
+
+def test_burst_then_paced(clock):
+    limiter = RateLimiter(rate=10, burst=3)
+    assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.reserve() == pytest.approx(0.1)
+    assert limiter.reserve() == pytest.approx(0.2)
+
+    clock.now += 10
+    assert limiter.reserve() == 0.0
+
+
+def test_throttle_pauses_and_halves_once_per_window(clock):
+    limiter = RateLimiter(rate=10, burst=10)
+    # Several requests in flight get 429 for the same window
+    for _ in range(5):
+        limiter.on_throttle(2.0)
+    assert limiter.rate == 5.0
+    assert limiter.reserve() == pytest.approx(2.0)
+    assert limiter.get_stats()['throttles'] == 5
+
+    # A 429 after the window has passed backs off again
+    clock.now += 3
+    limiter.on_throttle(2.0)
+    assert limiter.rate == 2.5
+
+
+def test_rate_never_drops_below_minimum(clock):
+    limiter = RateLimiter(rate=10, burst=10)
+    for _ in range(10):
+        limiter.on_throttle(1.0)
+        clock.now += 2
+    assert limiter.rate == 10 * RateLimiter.MIN_RATE_FRACTION
+
+
+def test_success_recovers_rate_up_to_maximum(clock):
+    limiter = RateLimiter(rate=10, burst=10)
+    limiter.on_throttle()
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 10.0
+
+
+def test_concurrent_success_and_throttle_keep_rate_in_bounds(clock):
+    limiter = RateLimiter(rate=10, burst=10)
+
+    def worker():
+        for _ in range(1000):
+            limiter.on_success()
+            limiter.on_throttle()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 1.0 <= limiter.rate <= 10.0
+
+
+@pytest.mark.parametrize('value, expected', [('3', 3.0), ('0.5', 0.5), (None, None), ('soon', None)])
+def test_parse_retry_after(value, expected):
+    assert RateLimiter.parse_retry_after(value) == expected
@@ -0,0 +1,62 @@
+"""ResolutionCache lookups, confidence handling and expiry of failed searches."""
+
+import time
+import pytest
+from spotify_sync.core import resolution_cache
+from spotify_sync.core.resolution_cache import ResolutionCache
+from spotify_sync.core.settings_manager import settings
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResolutionCache(str(tmp_path / 'resolutions.db'))
+
+
+def test_record_and_get(cache):
+    assert cache.get('id1') is None
+    cache.record('id1', 'https://youtu.be/a', ResolutionCache.CONFIDENCE_SEARCH)
+    resolution = cache.get('id1')
+    assert resolution.youtube_url == 'https://youtu.be/a'
+    assert resolution.confidence == ResolutionCache.CONFIDENCE_SEARCH
+    assert cache.get(None) is None
+
+
+def test_less_confident_match_does_not_replace_better_one(cache):
+    cache.record('id1', 'https://youtu.be/manual', ResolutionCache.CONFIDENCE_MANUAL)
+    cache.record('id1', 'https://youtu.be/search', ResolutionCache.CONFIDENCE_UNFILTERED)
+    assert cache.get('id1').youtube_url == 'https://youtu.be/manual'
+
+    cache.record('id1', 'https://youtu.be/other', ResolutionCache.CONFIDENCE_MANUAL)
+    assert cache.get('id1').youtube_url == 'https://youtu.be/other'
+
+
+def test_match_replaces_not_found(cache):
+    cache.record_not_found('id1')
+    cache.record('id1', 'https://youtu.be/a', ResolutionCache.CONFIDENCE_UNFILTERED)
+    assert cache.get('id1').youtube_url == 'https://youtu.be/a'
+
+
+def test_not_found_expires_after_retry_days(cache, monkeypatch):
+    monkeypatch.setitem(settings._settings['advanced'], 'resolution_retry_days', 2)
+    cache.record_not_found('id1')
+    resolution = cache.get('id1')
+    assert resolution is not None and resolution.youtube_url is None
+
+    now = time.time()
+    monkeypatch.setattr(resolution_cache.time, 'time', lambda: now + 1 * 86400)
+    assert cache.get('id1') is not None
+    monkeypatch.setattr(resolution_cache.time, 'time', lambda: now + 3 * 86400)
+    assert cache.get('id1') is None
+
+
+def test_found_urls_do_not_expire(cache, monkeypatch):
+    cache.record('id1', 'https://youtu.be/a', ResolutionCache.CONFIDENCE_SEARCH)
+    now = time.time()
+    monkeypatch.setattr(resolution_cache.time, 'time', lambda: now + 365 * 86400)
+    assert cache.get('id1').youtube_url == 'https://youtu.be/a'
+
+
+def test_invalidate(cache):
+    cache.record('id1', 'https://youtu.be/a', ResolutionCache.CONFIDENCE_SEARCH)
+    cache.invalidate('id1')
+    assert cache.get('id1') is None
@@ -0,0 +1,74 @@
+"""RetryPolicy failure classification and retry loop."""
+
+import pytest
+from spotify_sync.core import retry_policy
+from spotify_sync.core.retry_policy import RetryPolicy, TransientError, DownloadTimeoutError
+
+
+@pytest.mark.parametrize('message', [
+    'ERROR: Unable to download webpage: <urlopen error timed out>',
+    'HTTP Error 429: Too Many Requests',
+    'HTTP Error 503: Service Unavailable',
+    'Connection reset by peer',
+    'Temporary failure in name resolution'
+])
+def test_transient_failures(message):
+    assert RetryPolicy.is_transient(message)
+
+
+@pytest.mark.parametrize('message', [
+    'ERROR: Video unavailable',
+    'ERROR: Private video. Sign in if you\'ve been granted access',
+    'LookupError: No results found for song: Artist - Title',
+    'HTTP Error 404: Not Found',
+    # Permanent patterns win over transient ones
+    'Video unavailable (connection was fine)',
+    '',
+    None
+])
+def test_permanent_failures(message):
+    assert not RetryPolicy.is_transient(message)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(retry_policy.time, 'sleep', lambda seconds: None)
+
+
+def test_retries_transient_errors_until_success():
+    policy = RetryPolicy(max_retries=3)
+    outcomes = [TransientError('timed out'), DownloadTimeoutError('killed'), 'done']
+
+    def operation():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert policy.call(operation) == 'done'
+    assert policy.get_stats() == {'attempts': 3, 'retries': 2, 'timeouts': 1, 'gave_up': 0}
+
+
+def test_gives_up_after_max_retries():
+    policy = RetryPolicy(max_retries=2)
+
+    def operation():
+        raise TransientError('timed out')
+
+    with pytest.raises(TransientError):
+        policy.call(operation)
+    assert policy.get_stats() == {'attempts': 3, 'retries': 2, 'timeouts': 0, 'gave_up': 1}
+
+
+def test_other_errors_and_results_pass_through():
+    policy = RetryPolicy(max_retries=3)
+    with pytest.raises(ValueError):
+        policy.call(lambda: (_ for _ in ()).throw(ValueError('permanent')))
+    assert policy.call(lambda: False) is False
+    assert policy.get_stats()['retries'] == 0
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(max_retries=10, base_delay=1.0, max_delay=5.0)
+    for retry in range(1, 11):
+        assert 0 <= policy.get_delay(retry) <= min(5.0, 2 ** (retry - 1))
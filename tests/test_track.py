@@ -0,0 +1,58 @@
+"""Track record: derived matching keys, immutability and round trips."""
+
+import pickle
+import pytest
+from spotify_sync.core.track import Track, TrackStatus, TrackStatusTable
+
+
+def make_track(**overrides):
+    fields = dict(
+        name='What? Is: This', artists=['Main Artist', 'Guest'], id='id1',
+        url='https://open.spotify.com/track/id1', album='Album', album_year='2020'
+    )
+    fields.update(overrides)
+    return Track(**fields)
+
+
+def test_matching_keys():
+    track = make_track()
+    assert track.filename_key == 'main artist - what is- this'
+    assert track.all_artists_key == 'main artist, guest - what? is: this'
+    assert track.title_key == 'what? is: this'
+    assert track.csv_key == 'main artist - what? is: this'
+    assert track.artist_string == 'Main Artist, Guest'
+
+
+def test_tracks_without_artists_or_id():
+    track = make_track(artists=[], id=None)
+    assert track.filename_key == 'unknown - what is- this'
+    assert track.artist_string == 'Unknown'
+    assert track.key == track.filename_key
+
+
+def test_stores_only_spotify_fields():
+    track = make_track()
+    assert not hasattr(track, '__dict__')
+    assert Track.__slots__ == ('name', 'artists', 'id', 'url', 'album', 'album_year', 'cover_art_url')
+
+
+def test_immutable():
+    track = make_track()
+    with pytest.raises(AttributeError):
+        track.name = 'Other'
+    with pytest.raises(AttributeError):
+        del track.id
+
+
+def test_round_trips():
+    track = make_track(cover_art_url='https://i.scdn.co/image/x')
+    assert Track.from_dict(track.to_dict()) == track
+    assert pickle.loads(pickle.dumps(track)) == track
+    assert hash(Track.from_dict(track.to_dict())) == hash(track)
+
+
+def test_status_table():
+    statuses = TrackStatusTable()
+    statuses.set(make_track(), TrackStatus.UNABLE_TO_FIND)
+    assert statuses.is_unable_to_find(make_track())
+    assert statuses.get(make_track(id='id2')) is None
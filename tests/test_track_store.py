@@ -0,0 +1,100 @@
+"""TrackStore adoption, linking into playlist folders and library dedupe."""
+
+import os
+import pytest
+from spotify_sync.core import track_store
+from spotify_sync.core.track import Track
+from spotify_sync.core.track_store import TrackStore
+
+
+def make_track(track_id='id1', name='Song: One'):
+    return Track(name, ['Artist', 'Guest'], track_id, f'https://open.spotify.com/track/{track_id}', 'Album', '2020')
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TrackStore(str(tmp_path))
+
+
+@pytest.fixture
+def playlist(tmp_path):
+    path = tmp_path / 'Playlist'
+    path.mkdir()
+    return path
+
+
+def test_link_filename_matches_download_naming():
+    assert TrackStore.get_link_filename(make_track()) == 'Artist, Guest - Song- One.mp3'
+
+
+def test_adopt_stores_the_download_once(store, playlist):
+    filepath = playlist / 'a.mp3'
+    filepath.write_bytes(b'audio')
+
+    assert store.adopt(str(filepath), 'id1') == 'stored'
+    assert store.has('id1')
+    assert os.path.samefile(filepath, store.get_path('id1'))
+    assert store.adopt(str(filepath), 'id1') == 'skipped'
+    assert store.adopt(str(filepath), None) == 'skipped'
+
+
+def test_adopt_replaces_a_duplicate_with_a_link(store, tmp_path, playlist):
+    first = playlist / 'a.mp3'
+    first.write_bytes(b'audio')
+    store.adopt(str(first), 'id1')
+
+    other = tmp_path / 'Other'
+    other.mkdir()
+    second = other / 'a.mp3'
+    second.write_bytes(b'audio again')
+    assert store.adopt(str(second), 'id1') == 'linked'
+    assert os.path.samefile(second, store.get_path('id1'))
+    assert second.read_bytes() == b'audio'
+
+
+def test_link_track(store, playlist):
+    track = make_track()
+    assert store.link_track(track, str(playlist)) is None
+
+    source = playlist / 'download.mp3'
+    source.write_bytes(b'audio')
+    store.adopt(str(source), track.id)
+
+    other = playlist.parent / 'Other'
+    other.mkdir()
+    linked = store.link_track(track, str(other))
+    assert linked == str(other / TrackStore.get_link_filename(track))
+    assert os.path.samefile(linked, store.get_path(track.id))
+    assert store.link_track(make_track(track_id=None), str(other)) is None
+
+
+def test_link_file_falls_back_to_copy(tmp_path, monkeypatch):
+    def unsupported(*args, **kwargs):
+        raise OSError('not supported')
+
+    monkeypatch.setattr(track_store.os, 'link', unsupported)
+    monkeypatch.setattr(track_store.os, 'symlink', unsupported)
+    source = tmp_path / 'source.mp3'
+    source.write_bytes(b'audio')
+    destination = tmp_path / 'destination.mp3'
+    destination.write_bytes(b'old')
+
+    assert TrackStore.link_file(str(source), str(destination)) == 'copy'
+    assert destination.read_bytes() == b'audio'
+    assert not os.path.lexists(f"{destination}.link.tmp")
+
+
+def test_dedupe(store, tmp_path, monkeypatch):
+    tags = {'a.mp3': 'id1', 'b.mp3': 'id1', 'c.mp3': 'id2'}
+    monkeypatch.setattr(
+        track_store.TrackIdTag, 'read', staticmethod(lambda filepath: tags.get(os.path.basename(filepath)))
+    )
+    for folder, name in (('One', 'a.mp3'), ('One', 'c.mp3'), ('Two', 'b.mp3'), ('Two', 'untagged.mp3')):
+        os.makedirs(tmp_path / folder, exist_ok=True)
+        (tmp_path / folder / name).write_bytes(b'12345')
+
+    stats = store.dedupe(str(tmp_path))
+    assert stats == {'files_scanned': 4, 'stored': 2, 'linked': 1, 'untagged': 1, 'bytes_saved': 5}
+    assert os.path.samefile(tmp_path / 'One' / 'a.mp3', tmp_path / 'Two' / 'b.mp3')
+    # The store itself is hidden and not scanned as a playlist
+    assert store.dedupe(str(tmp_path))['files_scanned'] == 4
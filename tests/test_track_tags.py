@@ -0,0 +1,78 @@
+"""TrackIdTag.read must find the ID frame in ID3v2.3 and ID3v2.4 tags without mutagen."""
+
+import struct
+from spotify_sync.core.track_tags import TrackIdTag
+
+
+def syncsafe(value):
+    return bytes([(value >> 21) & 0x7f, (value >> 14) & 0x7f, (value >> 7) & 0x7f, value & 0x7f])
+
+
+def frame(version, frame_id, body):
+    size = syncsafe(len(body)) if version == 4 else struct.pack('>I', len(body))
+    return frame_id + size + b'\0\0' + body
+
+
+def txxx(description, value, encoding=3):
+    if encoding == 1:
+        text = description.encode('utf-16') + b'\0\0' + value.encode('utf-16')
+    else:
+        text = description.encode('utf-8') + b'\0' + value.encode('utf-8')
+    return bytes([encoding]) + text
+
+
+def write_tag(path, version, frames, padding=64, extended_header=False):
+    body = b''.join(frames) + b'\0' * padding
+    flags = 0
+    if extended_header:
+        flags |= 0x40
+        # v2.4 counts the size field itself, v2.3 does not
+        extended = syncsafe(6) + b'\x01\x00' if version == 4 else struct.pack('>I', 6) + b'\0' * 6
+        body = extended + body
+    header = b'ID3' + bytes([version, 0, flags]) + syncsafe(len(body))
+    path.write_bytes(header + body + b'\xff\xfb' + b'\0' * 32)
+    return str(path)
+
+
+def test_reads_id_from_v23_tag(tmp_path):
+    frames = [
+        frame(3, b'TIT2', b'\x03Song'),
+        frame(3, b'APIC', b'\x00image/jpeg\x00\x03\x00' + b'\xff' * 500),
+        frame(3, b'TXXX', txxx('SPOTIFY_TRACK_ID', 'abc123'))
+    ]
+    assert TrackIdTag.read(write_tag(tmp_path / 'v23.mp3', 3, frames)) == 'abc123'
+
+
+def test_reads_id_from_v24_tag(tmp_path):
+    # Large enough that a syncsafe size differs from a plain one
+    frames = [
+        frame(4, b'APIC', b'\x00image/jpeg\x00\x03\x00' + b'\xff' * 300),
+        frame(4, b'TXXX', txxx('SPOTIFY_TRACK_ID', 'xyz789'))
+    ]
+    assert TrackIdTag.read(write_tag(tmp_path / 'v24.mp3', 4, frames)) == 'xyz789'
+
+
+def test_reads_utf16_frame_and_skips_other_txxx(tmp_path):
+    frames = [
+        frame(3, b'TXXX', txxx('OTHER', 'nope', encoding=1)),
+        frame(3, b'TXXX', txxx('SPOTIFY_TRACK_ID', 'utf16id', encoding=1))
+    ]
+    assert TrackIdTag.read(write_tag(tmp_path / 'utf16.mp3', 3, frames)) == 'utf16id'
+
+
+def test_skips_extended_header(tmp_path):
+    for version in (3, 4):
+        frames = [frame(version, b'TXXX', txxx('SPOTIFY_TRACK_ID', f'ext{version}'))]
+        path = write_tag(tmp_path / f'ext{version}.mp3', version, frames, extended_header=True)
+        assert TrackIdTag.read(path) == f'ext{version}'
+
+
+def test_missing_id_and_untagged_files(tmp_path):
+    no_id = write_tag(tmp_path / 'no_id.mp3', 4, [frame(4, b'TIT2', b'\x03Song')])
+    assert TrackIdTag.read(no_id) is None
+
+    untagged = tmp_path / 'untagged.mp3'
+    untagged.write_bytes(b'\xff\xfb' + b'\0' * 64)
+    assert TrackIdTag.read(str(untagged)) is None
+
+    assert TrackIdTag.read(str(tmp_path / 'missing.mp3')) is None